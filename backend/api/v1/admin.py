@@ -4,9 +4,20 @@ Rutas básicas para administración local únicamente
 Filosofía Mejora Continua: Simplicidad y efectividad
 """
 
-from fastapi import APIRouter
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from typing import Dict, Any, Optional
 from datetime import datetime
+import asyncio
+import threading
+
+from backend.core import require_admin, loop_monitor
+from backend.core.notifications import outbox_dispatcher
+from backend.utils.profiler import profiler
+from backend.utils.memory import memory_profiler
+from backend.web.sampling import (
+    stack_sampler, profile_response, SamplerBusy, FORMATS as PROFILE_FORMATS, MAX_SECONDS as PROFILE_MAX_SECONDS
+)
 
 router = APIRouter()
 
@@ -34,4 +45,197 @@ async def admin_health_check() -> Dict[str, str]:
         "status": "ok",
         "admin": "operational",
         "timestamp": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+    }
+
+# ===== PROFILER =====
+
+PROFILER_SORT_KEYS = ("total_ms", "self_ms", "calls", "errors", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+
+@router.get("/profiler")
+async def get_profiler_stats(
+    sort: str = Query("total_ms", description="Campo de orden"),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    ⏱️ Estadísticas agregadas por función (llamadas, total/self, cuantiles)
+    """
+    if sort not in PROFILER_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(PROFILER_SORT_KEYS)}")
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        "profiler": profiler.snapshot(sort, limit)
+    }
+
+@router.delete("/profiler")
+async def reset_profiler_stats(_: Any = Depends(require_admin)) -> Dict[str, str]:
+    """
+    🧹 Reinicia las estadísticas del profiler
+    """
+    profiler.reset()
+    return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
+
+@router.post("/profiler/toggle")
+async def toggle_profiler(
+    enabled: Optional[bool] = Query(None),
+    sample_rate: Optional[float] = Query(None, ge=0.0, le=1.0),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    🎛️ Activa/desactiva el profiler o cambia la tasa de muestreo en caliente
+    """
+    profiler.configure(enabled=enabled, sample_rate=sample_rate)
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        "enabled": profiler.enabled,
+        "sample_rate": profiler.sample_rate
+    }
+
+@router.get("/profiler/sample")
+async def sample_stacks(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    format: str = Query("collapsed", description="collapsed | speedscope"),
+    idle: bool = Query(False, description="Incluir threads ociosos"),
+    _: Any = Depends(require_admin)
+) -> Response:
+    """
+    🔥 Profiling estadístico bajo demanda del event loop y los threads del executor
+    
+    El guard le da su propio timeout (PROFILE_MAX_SECONDS + margen): la
+    respuesta solo sale al terminar la sesión.
+    """
+    if format not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(PROFILE_FORMATS)}")
+    if stack_sampler.running:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    try:
+        profile = await asyncio.to_thread(
+            stack_sampler.sample, seconds, interval_ms / 1000, idle, threading.get_ident()
+        )
+    except SamplerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return profile_response(profile, format)
+
+# ===== EVENT LOOP =====
+
+@router.get("/event-loop")
+async def get_event_loop_stalls(
+    limit: int = Query(20, ge=1, le=50),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    🐢 Lag del event loop y últimos bloqueos con su pila y ruta
+    """
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        "event_loop": loop_monitor.stats(),
+        "stalls": loop_monitor.recent_stalls(limit)
+    }
+
+# ===== NOTIFICATIONS =====
+
+@router.get("/notifications")
+async def get_notification_outbox(_: Any = Depends(require_admin)) -> Dict[str, Any]:
+    """
+    📬 Estado del outbox de notificaciones y del dispatcher
+    """
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        "notifications": await outbox_dispatcher.stats()
+    }
+
+# ===== MEMORY =====
+
+@router.get("/memory")
+async def get_memory_status(_: Any = Depends(require_admin)) -> Dict[str, Any]:
+    """
+    🧠 Estado de tracemalloc, snapshots guardados y tamaño de las cachés
+    """
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        "memory": memory_profiler.status()
+    }
+
+@router.post("/memory/tracemalloc/start")
+async def start_tracemalloc(
+    frames: int = Query(1, ge=1, le=25, description="Frames por traza"),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    ▶️ Activa tracemalloc
+    """
+    memory_profiler.start(frames)
+    return {"status": "ok", "timestamp": datetime.utcnow().isoformat(), "tracing": memory_profiler.tracing}
+
+@router.post("/memory/tracemalloc/stop")
+async def stop_tracemalloc(_: Any = Depends(require_admin)) -> Dict[str, Any]:
+    """
+    ⏹️ Desactiva tracemalloc y descarta los snapshots
+    """
+    memory_profiler.stop()
+    return {"status": "ok", "timestamp": datetime.utcnow().isoformat(), "tracing": memory_profiler.tracing}
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(
+    name: str = Query(..., min_length=1, max_length=64),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    📸 Snapshot de tracemalloc con nombre
+    """
+    try:
+        snapshot = await asyncio.to_thread(memory_profiler.take_snapshot, name)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"status": "ok", "timestamp": datetime.utcnow().isoformat(), "snapshot": snapshot}
+
+@router.get("/memory/diff")
+async def diff_memory_snapshots(
+    base: str = Query(..., description="Snapshot de referencia"),
+    target: Optional[str] = Query(None, description="Snapshot a comparar (por defecto: ahora)"),
+    limit: int = Query(20, ge=1, le=200),
+    group_by: str = Query("lineno", description="lineno | filename | traceback"),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    📈 Top-N de crecimiento de memoria entre snapshots
+    """
+    try:
+        stats = await asyncio.to_thread(memory_profiler.diff, base, target, limit, group_by)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Snapshot not found: {e.args[0]}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok", "timestamp": datetime.utcnow().isoformat(), "base": base, "target": target, "stats": stats}
+
+@router.get("/memory/top")
+async def get_memory_top(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: str = Query("lineno", description="lineno | filename | traceback"),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    🔝 Top-N de memoria trazada actualmente
+    """
+    try:
+        stats = await asyncio.to_thread(memory_profiler.top, limit, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok", "timestamp": datetime.utcnow().isoformat(), "stats": stats}
+
+@router.get("/memory/objects")
+async def get_object_counts(
+    limit: int = Query(30, ge=1, le=500),
+    _: Any = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    🧮 Objetos vivos por tipo
+    """
+    counts = await asyncio.to_thread(memory_profiler.object_counts, limit)
+    return {"status": "ok", "timestamp": datetime.utcnow().isoformat(), "objects": counts}
@@ -4,21 +4,45 @@ Rutas para sistema de contacto
 Filosofía Mejora Continua: Comunicación efectiva y seguimiento
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Request, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Optional
 
 from backend.models import (
     ContactMessage, SuccessResponse, 
     ErrorResponse, RequestMetadata
 )
 from backend.services import get_contact_service
+from backend.services.dedupe import DuplicateMessageError
+from backend.services.contact_search import SEARCH_FIELDS, SEARCH_ORDERS
+from backend.services.export import EXPORT_FORMATS, MEDIA_TYPES, export_filename, export_headers
 from backend.core import get_request_metadata, require_admin
+from backend.core.notifications import outbox_dispatcher
 from backend.utils.logger import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
 
-@router.post("/send", response_model=SuccessResponse)
+DUPLICATE_DETAIL = "This message was already received. I'll get back to you soon."
+
+async def reject_recent_duplicate(request: Request) -> None:
+    """Rechaza un envío repetido antes de validar el body o tocar SQLite
+    
+    FastAPI resuelve las dependencias antes de validar el body, así que un
+    bot que repite el mismo payload no paga la validación ni el INSERT.
+    """
+    try:
+        payload = await request.json()
+    except ValueError:
+        return  # La validación del body dará el error
+    if not isinstance(payload, dict):
+        return
+    email, text = payload.get("email"), payload.get("message")
+    if isinstance(email, str) and isinstance(text, str) and get_contact_service().is_recent_duplicate(email, text):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_DETAIL)
+
+@router.post("/send", response_model=SuccessResponse, dependencies=[Depends(reject_recent_duplicate)])
 async def send_contact_message(
     request: Request,
     message: ContactMessage,
@@ -27,7 +51,8 @@ async def send_contact_message(
     """
     📤 Enviar mensaje de contacto
     
-    Recibe y almacena un mensaje de contacto del usuario.
+    Recibe y almacena un mensaje de contacto del usuario. Un mismo email +
+    mensaje repetido dentro de la ventana de deduplicación responde 409.
     """
     try:
         # Add request metadata to message
@@ -42,16 +67,17 @@ async def send_contact_message(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to save contact message"
             )
+        outbox_dispatcher.wake()  # La notificación sale en segundo plano, no en este request
         
         logger.info(
             f"Contact message received from: {message.email}",
-            extra={
+            extra_data={
                 "sender_email": message.email,
                 "sender_name": message.name,
                 "message_length": len(message.message),
-                "ip": metadata.ip_address,
-                "request_id": metadata.request_id
-            }
+                "ip": metadata.ip_address
+            },
+            request_id=metadata.request_id
         )
         
         return SuccessResponse(
@@ -65,15 +91,15 @@ async def send_contact_message(
             }
         )
         
+    except DuplicateMessageError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=DUPLICATE_DETAIL)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(
             f"Contact message error: {e}", 
-            extra={
-                "sender_email": message.email if message else "unknown",
-                "request_id": metadata.request_id
-            }
+            extra_data={"sender_email": message.email if message else "unknown"},
+            request_id=metadata.request_id
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -119,10 +145,8 @@ async def get_contact_messages(
         
         logger.info(
             f"Contact messages retrieved: {total_messages} messages",
-            extra={
-                "total_messages": total_messages,
-                "request_id": metadata.request_id
-            }
+            extra_data={"total_messages": total_messages},
+            request_id=metadata.request_id
         )
         
         return SuccessResponse(
@@ -144,7 +168,90 @@ async def get_contact_messages(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Get messages error: {e}", extra={"request_id": metadata.request_id})
+        logger.error(f"Get messages error: {e}", request_id=metadata.request_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Contact service error"
+        )
+
+@router.get("/export")
+async def export_contact_messages(
+    format: str = Query("csv", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    compress: bool = Query(False, alias="gzip", description="Descargar como fichero .gz"),
+    since: Optional[datetime] = Query(None, description="Desde (incluido)"),
+    until: Optional[datetime] = Query(None, description="Hasta (excluido)"),
+    _: str = Depends(require_admin),  # Require admin access
+    metadata: RequestMetadata = Depends(get_request_metadata)
+) -> StreamingResponse:
+    """
+    📤 Exportar mensajes de contacto (Admin)
+    
+    Todos los mensajes en CSV o NDJSON por streaming, leídos por bloques
+    (memoria constante sea cual sea el tamaño de la tabla). gzip=true
+    descarga un fichero comprimido.
+    Requiere permisos de administrador.
+    """
+    logger.info(
+        f"Contact export started ({format})",
+        extra_data={"format": format, "gzip": compress},
+        request_id=metadata.request_id
+    )
+    
+    return StreamingResponse(
+        get_contact_service().export(format, since, until, compress),
+        media_type=MEDIA_TYPES["gzip" if compress else format],
+        headers=export_headers(export_filename("contact_messages", format, compress, metadata.timestamp))
+    )
+
+@router.get("/search", response_model=SuccessResponse)
+async def search_contact_messages(
+    q: str = Query(..., min_length=1, max_length=200, description="Términos; 'term*' = prefijo"),
+    field: Optional[str] = Query(None, pattern=f"^({'|'.join(SEARCH_FIELDS)})$"),
+    prefix: bool = Query(False, description="Último término como prefijo (búsqueda al escribir)"),
+    order: str = Query("relevance", pattern=f"^({'|'.join(SEARCH_ORDERS)})$"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=64, description="next_cursor de la página anterior"),
+    _: str = Depends(require_admin),  # Require admin access
+    metadata: RequestMetadata = Depends(get_request_metadata)
+) -> SuccessResponse:
+    """
+    🔎 Buscar mensajes de contacto (Admin)
+    
+    Búsqueda full-text sobre nombre, email y mensaje (índice FTS5) con
+    ranking bm25 o por recientes, fragmentos resaltados con «» y
+    paginación keyset mediante next_cursor.
+    Requiere permisos de administrador.
+    """
+    try:
+        contact_service = get_contact_service()
+        result = await contact_service.search(q, field, prefix, order, limit, cursor)
+        
+        logger.info(
+            f"Contact search: {len(result['results'])} results",
+            extra_data={"order": order, "field": field, "results": len(result["results"])},
+            request_id=metadata.request_id
+        )
+        
+        return SuccessResponse(
+            status="success",
+            message="Contact search completed",
+            data={
+                "query": q,
+                "order": order,
+                "results": result["results"],
+                "next_cursor": result["next_cursor"]
+            }
+        )
+        
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Contact search error: {e}", request_id=metadata.request_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Contact service error"
@@ -158,14 +265,15 @@ async def get_contact_stats(
     """
     📊 Estadísticas de contacto (Admin)
     
-    Obtiene estadísticas del sistema de contacto.
+    Estadísticas de todo el histórico servidas desde los rollups que se
+    mantienen en cada inserción (coste constante).
     Requiere permisos de administrador.
     """
     try:
         contact_service = get_contact_service()
-        all_messages = await contact_service.get_messages(1000)  # Get more for stats
+        stats_data = await contact_service.get_stats(metadata.timestamp)
         
-        if not all_messages:
+        if not stats_data["total_messages"]:
             return SuccessResponse(
                 status="success",
                 message="No contact data available",
@@ -178,46 +286,9 @@ async def get_contact_stats(
                 }
             )
         
-        # Monthly distribution
-        monthly_counts = {}
-        for msg in all_messages:
-            month_key = msg.timestamp.strftime("%Y-%m")
-            monthly_counts[month_key] = monthly_counts.get(month_key, 0) + 1
-        
-        # Email domain analysis
-        domain_counts = {}
-        for msg in all_messages:
-            domain = msg.email.split("@")[-1].lower()
-            domain_counts[domain] = domain_counts.get(domain, 0) + 1
-        
-        # Sort domains by popularity
-        popular_domains = dict(sorted(domain_counts.items(), key=lambda x: x[1], reverse=True)[:10])
-        
-        # Message length analysis
-        message_lengths = [len(msg.message) for msg in all_messages]
-        avg_length = sum(message_lengths) / len(message_lengths)
-        
-        stats_data = {
-            "total_messages": len(all_messages),
-            "unique_senders": len(set(msg.email for msg in all_messages)),
-            "messages_by_month": dict(sorted(monthly_counts.items())),
-            "popular_domains": popular_domains,
-            "message_length_stats": {
-                "average": round(avg_length, 2),
-                "shortest": min(message_lengths),
-                "longest": max(message_lengths),
-                "median": sorted(message_lengths)[len(message_lengths) // 2]
-            },
-            "recent_activity": {
-                "last_24h": len([msg for msg in all_messages if (metadata.timestamp - msg.timestamp).days < 1]),
-                "last_7_days": len([msg for msg in all_messages if (metadata.timestamp - msg.timestamp).days <= 7]),
-                "last_30_days": len([msg for msg in all_messages if (metadata.timestamp - msg.timestamp).days <= 30])
-            }
-        }
-        
         logger.info(
-            f"Contact stats retrieved: {len(all_messages)} total messages",
-            extra={"request_id": metadata.request_id}
+            f"Contact stats retrieved: {stats_data['total_messages']} total messages",
+            request_id=metadata.request_id
         )
         
         return SuccessResponse(
@@ -229,7 +300,7 @@ async def get_contact_stats(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Contact stats error: {e}", extra={"request_id": metadata.request_id})
+        logger.error(f"Contact stats error: {e}", request_id=metadata.request_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Contact service error"
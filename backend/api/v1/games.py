@@ -4,20 +4,27 @@ Rutas para sistema de juegos y puntuaciones
 Filosofía Mejora Continua: Gamificación y engagement
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Any, List, Optional
 
 from backend.models import (
-    GameScore, GameLeaderboard, SuccessResponse, 
+    GameScore, GameLeaderboard, SuccessResponse, DEFAULT_GAME, GAME_ID_PATTERN,
     ErrorResponse, RequestMetadata
 )
 from backend.services import get_game_service
-from backend.core import get_request_metadata
+from backend.services.leaderboard import WINDOWS
+from backend.services.export import EXPORT_FORMATS, MEDIA_TYPES, export_filename, export_headers
+from backend.core import get_request_metadata, require_admin, require_permission
+from backend.web.live import SSE_HEADERS
 from backend.utils.logger import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+WINDOW_PATTERN = f"^({'|'.join(WINDOWS)})$"
+
 @router.post("/score", response_model=SuccessResponse)
 async def save_game_score(
     score: GameScore,
@@ -39,19 +46,21 @@ async def save_game_score(
             )
         
         logger.info(
-            f"Game score saved: {score.player_name} - {score.score}",
-            extra={
+            f"Game score saved: {score.game_id}/{score.player_name} - {score.score}",
+            extra_data={
+                "game_id": score.game_id,
                 "player": score.player_name,
                 "score": score.score,
-                "level": score.level,
-                "request_id": metadata.request_id
-            }
+                "level": score.level
+            },
+            request_id=metadata.request_id
         )
         
         return SuccessResponse(
             status="success",
             message="Score saved successfully",
             data={
+                "game_id": score.game_id,
                 "player_name": score.player_name,
                 "score": score.score,
                 "level": score.level,
@@ -62,33 +71,110 @@ async def save_game_score(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Save score error: {e}", extra={"request_id": metadata.request_id})
+        logger.error(f"Save score error: {e}", request_id=metadata.request_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Game service error"
         )
 
+@router.get("/", response_model=SuccessResponse)
+async def list_games() -> SuccessResponse:
+    """
+    🕹️ Juegos
+    
+    Juegos con partidas registradas, con jugadores y partidas de cada uno.
+    """
+    return SuccessResponse(
+        status="success",
+        message="Games retrieved successfully",
+        data={"games": await get_game_service().get_games()}
+    )
+
+@router.post("/scores/bulk", response_model=SuccessResponse)
+async def ingest_game_scores(
+    request: Request,
+    metadata: RequestMetadata = Depends(get_request_metadata),
+    _: Any = Depends(require_permission("games:ingest"))
+) -> SuccessResponse:
+    """
+    📥 Ingesta masiva de puntuaciones
+    
+    Body NDJSON (una puntuación por línea) o array JSON de GameScore. Se lee
+    en streaming, se valida fila a fila y se escribe en transacciones por
+    bloques. Responde con el resumen y los errores por fila.
+    
+    Límites propios (BULK_INGEST_MAX_BYTES / BULK_INGEST_TIMEOUT) en lugar de
+    los globales; un 413/504 puede dejar escritos los bloques ya confirmados.
+    """
+    summary = await get_game_service().ingest_scores(request.stream())
+    
+    logger.info(
+        f"Bulk scores ingested: {summary['inserted']} rows",
+        extra_data={"inserted": summary["inserted"], "rejected": summary["rejected"]},
+        request_id=metadata.request_id
+    )
+    
+    if summary["fatal_error"]:
+        message = "Batch stopped early"
+    elif summary["rejected"]:
+        message = "Batch ingested with errors"
+    else:
+        message = "Batch ingested successfully"
+    return SuccessResponse(status="success", message=message, data=summary)
+
+@router.get("/scores/export")
+async def export_game_scores(
+    format: str = Query("csv", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    compress: bool = Query(False, alias="gzip", description="Descargar como fichero .gz"),
+    game_id: Optional[str] = Query(None, pattern=GAME_ID_PATTERN, max_length=50, description="Todos si se omite"),
+    since: Optional[datetime] = Query(None, description="Desde (incluido)"),
+    until: Optional[datetime] = Query(None, description="Hasta (excluido)"),
+    metadata: RequestMetadata = Depends(get_request_metadata),
+    _: str = Depends(require_admin)
+) -> StreamingResponse:
+    """
+    📤 Exportar partidas (Admin)
+    
+    Todas las partidas en CSV o NDJSON por streaming, leídas por bloques
+    (memoria constante). gzip=true descarga un fichero comprimido.
+    """
+    logger.info(
+        f"Scores export started ({format})",
+        extra_data={"format": format, "gzip": compress, "game_id": game_id},
+        request_id=metadata.request_id
+    )
+    
+    return StreamingResponse(
+        get_game_service().export_scores(format, game_id, since, until, compress),
+        media_type=MEDIA_TYPES["gzip" if compress else format],
+        headers=export_headers(export_filename("game_scores", format, compress, metadata.timestamp))
+    )
+
 @router.get("/leaderboard", response_model=SuccessResponse)
 async def get_leaderboard(
     limit: int = 10,
+    offset: int = Query(0, ge=0),
+    window: str = Query("all", pattern=WINDOW_PATTERN, description="all | day | week (UTC)"),
+    game_id: str = Query(DEFAULT_GAME, pattern=GAME_ID_PATTERN, max_length=50),
     metadata: RequestMetadata = Depends(get_request_metadata)
 ) -> SuccessResponse:
     """
     🥇 Tabla de líderes
     
-    Obtiene las mejores puntuaciones del juego.
+    Mejor puntuación de cada jugador del juego (game_id), servida desde su
+    índice de ranking en memoria (O(log n + limit)). window=day|week usa las
+    tablas de la ventana en curso.
     """
     try:
         if limit > 100:
             limit = 100  # Prevent excessive data
         
         game_service = get_game_service()
-        scores = await game_service.get_leaderboard(limit)
+        scores = await game_service.get_leaderboard(limit, offset, window, game_id)
         
         # Calculate additional stats
-        total_players = len(set(score.player_name for score in scores))
         average_score = sum(score.score for score in scores) / len(scores) if scores else 0
-        highest_score = max(scores, key=lambda x: x.score) if scores else None
+        highest_score = (await game_service.get_leaderboard(1, 0, window, game_id))[0] if scores else None
         
         leaderboard_data = {
             "top_scores": [
@@ -97,13 +183,15 @@ async def get_leaderboard(
                     "score": score.score,
                     "level": score.level,
                     "timestamp": score.timestamp.isoformat(),
-                    "rank": idx + 1
+                    "rank": offset + idx + 1
                 }
                 for idx, score in enumerate(scores)
             ],
+            "game_id": game_id,
+            "window": window,
             "stats": {
                 "total_entries": len(scores),
-                "unique_players": total_players,
+                "unique_players": game_service.total_players(window, game_id),
                 "average_score": round(average_score, 2),
                 "highest_score": {
                     "player_name": highest_score.player_name,
@@ -116,7 +204,7 @@ async def get_leaderboard(
         
         logger.info(
             f"Leaderboard requested: {len(scores)} entries",
-            extra={"request_id": metadata.request_id}
+            request_id=metadata.request_id
         )
         
         return SuccessResponse(
@@ -126,42 +214,129 @@ async def get_leaderboard(
         )
         
     except Exception as e:
-        logger.error(f"Leaderboard error: {e}", extra={"request_id": metadata.request_id})
+        logger.error(f"Leaderboard error: {e}", request_id=metadata.request_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Game service error"
         )
 
+@router.get("/leaderboard/stream")
+async def stream_leaderboard(
+    window: str = Query("all", pattern=WINDOW_PATTERN),
+    game_id: str = Query(DEFAULT_GAME, pattern=GAME_ID_PATTERN, max_length=50)
+) -> StreamingResponse:
+    """
+    📡 Tabla de líderes en vivo (SSE)
+    
+    Evento 'snapshot' con el top-K y después eventos 'diff' solo cuando
+    cambia, a ritmo fijo: las ráfagas de puntuaciones se agrupan en un frame.
+    """
+    try:
+        feed = await get_game_service().feed(window, game_id)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown game")
+    return StreamingResponse(feed.stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/leaderboard/around", response_model=SuccessResponse)
+async def get_leaderboard_around(
+    rank: Optional[int] = Query(None, ge=1, description="Posición central"),
+    player_name: Optional[str] = Query(None, description="Centrar en este jugador"),
+    radius: int = Query(5, ge=0, le=50),
+    window: str = Query("all", pattern=WINDOW_PATTERN),
+    game_id: str = Query(DEFAULT_GAME, pattern=GAME_ID_PATTERN, max_length=50),
+    metadata: RequestMetadata = Depends(get_request_metadata)
+) -> SuccessResponse:
+    """
+    🎯 Vecinos en la tabla
+    
+    Jugadores alrededor de una posición (o de la posición de un jugador).
+    """
+    if (rank is None) == (player_name is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide exactly one of rank or player_name"
+        )
+    
+    game_service = get_game_service()
+    if player_name is not None:
+        player = await game_service.get_player_rank(player_name, window, game_id)
+        if player is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player has no scores")
+        rank = player["rank"]
+    
+    return SuccessResponse(
+        status="success",
+        message="Leaderboard neighbours retrieved successfully",
+        data={
+            "rank": rank,
+            "game_id": game_id,
+            "window": window,
+            "total_players": game_service.total_players(window, game_id),
+            "entries": await game_service.get_neighbours(rank, radius, window, game_id)
+        }
+    )
+
+@router.get("/rank/{player_name}", response_model=SuccessResponse)
+async def get_player_rank(
+    player_name: str,
+    window: str = Query("all", pattern=WINDOW_PATTERN),
+    game_id: str = Query(DEFAULT_GAME, pattern=GAME_ID_PATTERN, max_length=50),
+    metadata: RequestMetadata = Depends(get_request_metadata)
+) -> SuccessResponse:
+    """
+    🏅 Posición de un jugador
+    
+    Posición actual y mejor marca del jugador en la tabla (O(log n)).
+    """
+    game_service = get_game_service()
+    player = await game_service.get_player_rank(player_name, window, game_id)
+    if player is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Player has no scores")
+    
+    total_players = game_service.total_players(window, game_id)
+    return SuccessResponse(
+        status="success",
+        message="Player rank retrieved successfully",
+        data={
+            **player,
+            "game_id": game_id,
+            "window": window,
+            "total_players": total_players,
+            "percentile": round(100 * (total_players - player["rank"]) / total_players, 2)
+        }
+    )
+
 @router.get("/player/{player_name}/scores", response_model=SuccessResponse)
 async def get_player_scores(
     player_name: str,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor de la página anterior"),
+    game_id: str = Query(DEFAULT_GAME, pattern=GAME_ID_PATTERN, max_length=50),
     metadata: RequestMetadata = Depends(get_request_metadata)
 ) -> SuccessResponse:
     """
     📊 Puntuaciones de un jugador
     
-    Obtiene el historial de puntuaciones de un jugador específico.
+    Historial paginado (índice por jugador y fecha) y estadísticas desde el
+    agregado mantenido en cada inserción.
     """
     try:
-        if limit > 100:
-            limit = 100
+        before = None
+        if cursor:
+            timestamp, _, row_id = cursor.rpartition("|")
+            if not timestamp or not row_id.isdigit():
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+            before = (timestamp, int(row_id))
         
-        # TODO: Implement player-specific score retrieval
-        # For now, return filtered leaderboard
         game_service = get_game_service()
-        all_scores = await game_service.get_leaderboard(1000)  # Get more scores to filter
+        player_stats = await game_service.get_player_stats(player_name, game_id)
         
-        player_scores = [
-            score for score in all_scores 
-            if score.player_name.lower() == player_name.lower()
-        ][:limit]
-        
-        if not player_scores:
+        if not player_stats:
             return SuccessResponse(
                 status="success",
                 message="No scores found for player",
                 data={
+                    "game_id": game_id,
                     "player_name": player_name,
                     "scores": [],
                     "stats": {
@@ -169,38 +344,43 @@ async def get_player_scores(
                         "best_score": None,
                         "average_score": 0,
                         "highest_level": 0
-                    }
+                    },
+                    "next_cursor": None
                 }
             )
         
-        # Calculate player stats
-        best_score = max(player_scores, key=lambda x: x.score)
-        average_score = sum(score.score for score in player_scores) / len(player_scores)
-        highest_level = max(score.level for score in player_scores)
+        player_scores = await game_service.get_player_scores(player_name, limit, before, game_id)
+        next_cursor = (
+            f"{player_scores[-1]['timestamp']}|{player_scores[-1]['id']}"
+            if player_scores and len(player_scores) == limit else None
+        )
         
         player_data = {
-            "player_name": player_name,
+            "game_id": game_id,
+            "player_name": player_stats["player_name"],
             "scores": [
                 {
-                    "score": score.score,
-                    "level": score.level,
-                    "timestamp": score.timestamp.isoformat()
+                    "score": score["score"],
+                    "level": score["level"],
+                    "timestamp": score["timestamp"]
                 }
                 for score in player_scores
             ],
             "stats": {
-                "total_games": len(player_scores),
-                "best_score": best_score.score,
-                "average_score": round(average_score, 2),
-                "highest_level": highest_level,
-                "first_game": min(score.timestamp for score in player_scores).isoformat(),
-                "latest_game": max(score.timestamp for score in player_scores).isoformat()
-            }
+                "total_games": player_stats["games_played"],
+                "best_score": player_stats["best_score"],
+                "average_score": round(player_stats["score_sum"] / player_stats["games_played"], 2),
+                "highest_level": player_stats["max_level"],
+                "first_game": player_stats["first_game"],
+                "latest_game": player_stats["last_game"]
+            },
+            "next_cursor": next_cursor
         }
         
         logger.info(
             f"Player scores retrieved: {player_name} - {len(player_scores)} scores",
-            extra={"player": player_name, "request_id": metadata.request_id}
+            extra_data={"player": player_name},
+            request_id=metadata.request_id
         )
         
         return SuccessResponse(
@@ -209,10 +389,13 @@ async def get_player_scores(
             data=player_data
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             f"Player scores error: {e}", 
-            extra={"player": player_name, "request_id": metadata.request_id}
+            extra_data={"player": player_name},
+            request_id=metadata.request_id
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -221,22 +404,25 @@ async def get_player_scores(
 
 @router.get("/stats", response_model=SuccessResponse)
 async def get_game_stats(
+    game_id: str = Query(DEFAULT_GAME, pattern=GAME_ID_PATTERN, max_length=50),
     metadata: RequestMetadata = Depends(get_request_metadata)
 ) -> SuccessResponse:
     """
     📈 Estadísticas del juego
     
-    Obtiene estadísticas generales del sistema de juegos.
+    Estadísticas de todo el histórico, mantenidas en cada inserción
+    (sumas, histograma, sketch de cuantiles y contadores por jugador).
     """
     try:
         game_service = get_game_service()
-        all_scores = await game_service.get_leaderboard(1000)  # Get all scores for stats
+        stats_data = await game_service.get_stats(game_id)
         
-        if not all_scores:
+        if not stats_data["total_games"]:
             return SuccessResponse(
                 status="success",
                 message="No game data available",
                 data={
+                    "game_id": game_id,
                     "total_games": 0,
                     "unique_players": 0,
                     "average_score": 0,
@@ -246,75 +432,9 @@ async def get_game_stats(
                 }
             )
         
-        # Calculate comprehensive stats
-        unique_players = list(set(score.player_name for score in all_scores))
-        scores_only = [score.score for score in all_scores]
-        
-        # Score distribution (by ranges)
-        score_ranges = {
-            "0-99": 0,
-            "100-499": 0,
-            "500-999": 0,
-            "1000-4999": 0,
-            "5000+": 0
-        }
-        
-        for score_val in scores_only:
-            if score_val < 100:
-                score_ranges["0-99"] += 1
-            elif score_val < 500:
-                score_ranges["100-499"] += 1
-            elif score_val < 1000:
-                score_ranges["500-999"] += 1
-            elif score_val < 5000:
-                score_ranges["1000-4999"] += 1
-            else:
-                score_ranges["5000+"] += 1
-        
-        # Player game count distribution
-        player_game_counts = {}
-        for score in all_scores:
-            player_game_counts[score.player_name] = player_game_counts.get(score.player_name, 0) + 1
-        
-        game_count_distribution = {
-            "1 game": sum(1 for count in player_game_counts.values() if count == 1),
-            "2-5 games": sum(1 for count in player_game_counts.values() if 2 <= count <= 5),
-            "6-10 games": sum(1 for count in player_game_counts.values() if 6 <= count <= 10),
-            "11+ games": sum(1 for count in player_game_counts.values() if count > 10)
-        }
-        
-        highest_score = max(all_scores, key=lambda x: x.score)
-        
-        stats_data = {
-            "total_games": len(all_scores),
-            "unique_players": len(unique_players),
-            "average_score": round(sum(scores_only) / len(scores_only), 2),
-            "median_score": sorted(scores_only)[len(scores_only) // 2],
-            "highest_score": {
-                "player_name": highest_score.player_name,
-                "score": highest_score.score,
-                "level": highest_score.level,
-                "timestamp": highest_score.timestamp.isoformat()
-            },
-            "score_distribution": score_ranges,
-            "player_distribution": game_count_distribution,
-            "top_players": [
-                {
-                    "player_name": player,
-                    "total_games": count,
-                    "best_score": max(score.score for score in all_scores if score.player_name == player)
-                }
-                for player, count in sorted(
-                    player_game_counts.items(), 
-                    key=lambda x: x[1], 
-                    reverse=True
-                )[:5]
-            ]
-        }
-        
         logger.info(
-            f"Game stats retrieved: {len(all_scores)} total games",
-            extra={"request_id": metadata.request_id}
+            f"Game stats retrieved: {stats_data['total_games']} total games",
+            request_id=metadata.request_id
         )
         
         return SuccessResponse(
@@ -324,8 +444,8 @@ async def get_game_stats(
         )
         
     except Exception as e:
-        logger.error(f"Game stats error: {e}", extra={"request_id": metadata.request_id})
+        logger.error(f"Game stats error: {e}", request_id=metadata.request_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Game service error"
-        )
\ No newline at end of file
+        )
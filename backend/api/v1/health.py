@@ -12,10 +12,11 @@ from datetime import datetime
 from pathlib import Path
 
 from backend.models import HealthStatus, SuccessResponse, RequestMetadata
-from backend.services import get_health_service, get_database_service
-from backend.core import get_request_metadata
+from backend.services import get_health_service, get_database_service, get_contact_service
+from backend.core import get_request_metadata, loop_monitor
 from backend.config.settings import get_settings
 from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -298,6 +299,9 @@ async def get_system_metrics(
             "active_connections": "not_implemented"     # Would track from connection pool
         }
         
+        # Request guard metrics (rejections by size/timeout)
+        guard_metrics = metrics.snapshot("guards.")["counters"]
+        
         # Database metrics
         try:
             db_service = get_database_service()
@@ -321,7 +325,16 @@ async def get_system_metrics(
             "timestamp": current_time.isoformat(),
             "memory": memory_metrics,
             "performance": performance_metrics,
+            "guards": {
+                "max_request_size": settings.max_request_size,
+                "request_timeout_seconds": settings.request_timeout,
+                "requests": guard_metrics.get("guards.requests", 0),
+                "rejected_body_too_large": guard_metrics.get("guards.rejected.body_too_large", 0),
+                "rejected_timeout": guard_metrics.get("guards.rejected.timeout", 0)
+            },
             "database": db_metrics,
+            "contact_dedupe": get_contact_service().recent.stats(),
+            "event_loop": loop_monitor.stats(),
             "system": {
                 "cpu_count": psutil.cpu_count(),
                 "boot_time": datetime.fromtimestamp(psutil.boot_time()).isoformat(),
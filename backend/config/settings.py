@@ -6,7 +6,7 @@ Filosofía Mejora Continua: Type-safe, environment-aware config
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
 import os
 from pathlib import Path
@@ -74,6 +74,39 @@ class Settings(BaseSettings):
     max_request_size: int = Field(default=10 * 1024 * 1024, env="MAX_REQUEST_SIZE")  # 10MB
     request_timeout: int = Field(default=30, env="REQUEST_TIMEOUT")  # 30 seconds
     worker_processes: int = Field(default=1, env="WORKER_PROCESSES")
+    compression_enabled: bool = Field(default=True, env="COMPRESSION_ENABLED")
+    compression_min_size: int = Field(default=1024, env="COMPRESSION_MIN_SIZE")  # 1KB
+    compression_offload_size: int = Field(default=64 * 1024, env="COMPRESSION_OFFLOAD_SIZE")  # 64KB
+    profiler_enabled: bool = Field(default=True, env="PROFILER_ENABLED")
+    profiler_sample_rate: float = Field(default=1.0, env="PROFILER_SAMPLE_RATE")  # 0-1, decidido por llamada raíz
+    loop_monitor_enabled: bool = Field(default=True, env="LOOP_MONITOR_ENABLED")
+    loop_lag_interval: float = Field(default=0.1, env="LOOP_LAG_INTERVAL")  # 100ms entre latidos
+    loop_lag_threshold: float = Field(default=0.1, env="LOOP_LAG_THRESHOLD")  # 100ms de bloqueo = stall
+    leaderboard_feed_size: int = Field(default=10, env="LEADERBOARD_FEED_SIZE")  # top-K publicado
+    leaderboard_feed_interval: float = Field(default=1.0, env="LEADERBOARD_FEED_INTERVAL")  # 1 frame/s como máximo
+    leaderboard_sync_interval: float = Field(default=1.0, env="LEADERBOARD_SYNC_INTERVAL")  # retraso máximo respecto a otros workers
+    bulk_ingest_chunk_size: int = Field(default=5000, env="BULK_INGEST_CHUNK_SIZE")  # filas por transacción
+    bulk_ingest_max_rows: int = Field(default=200_000, env="BULK_INGEST_MAX_ROWS")
+    # Límites propios del guard para /scores/bulk: ~7k filas/s y ~50-150 bytes/fila -> 200k filas caben en ~30MB / ~30s
+    bulk_ingest_max_bytes: int = Field(default=32 * 1024 * 1024, env="BULK_INGEST_MAX_BYTES")  # 32MB
+    bulk_ingest_timeout: int = Field(default=120, env="BULK_INGEST_TIMEOUT")  # 4x el tiempo medido para max_rows
+    bulk_ingest_max_errors: int = Field(default=100, env="BULK_INGEST_MAX_ERRORS")  # errores detallados en la respuesta
+    export_batch_size: int = Field(default=1000, env="EXPORT_BATCH_SIZE")  # filas por lectura/chunk del export
+    contact_dedupe_window: int = Field(default=3600, env="CONTACT_DEDUPE_WINDOW")  # 1h: mismo email + mensaje = duplicado
+    contact_dedupe_max_entries: int = Field(default=50_000, env="CONTACT_DEDUPE_MAX_ENTRIES")  # huellas por generación
+    
+    # ===== NOTIFICATIONS =====
+    notify_webhook_url: Optional[str] = Field(default=None, env="NOTIFY_WEBHOOK_URL")  # POST {"notifications": [...]}
+    notify_smtp_host: Optional[str] = Field(default=None, env="NOTIFY_SMTP_HOST")
+    notify_smtp_port: int = Field(default=25, env="NOTIFY_SMTP_PORT")
+    notify_mail_from: str = Field(default="noreply@datacrypt-labs.local", env="NOTIFY_MAIL_FROM")
+    notify_mail_to: Optional[str] = Field(default=None, env="NOTIFY_MAIL_TO")
+    notify_batch_size: int = Field(default=20, env="NOTIFY_BATCH_SIZE")
+    notify_interval: float = Field(default=2.0, env="NOTIFY_INTERVAL")  # segundos entre ciclos del dispatcher
+    notify_max_retries: int = Field(default=3, env="NOTIFY_MAX_RETRIES")  # reintentos inmediatos (async_retry)
+    notify_retry_delay: float = Field(default=1.0, env="NOTIFY_RETRY_DELAY")
+    notify_max_attempts: int = Field(default=5, env="NOTIFY_MAX_ATTEMPTS")  # ciclos antes de 'failed'
+    notify_lease_seconds: float = Field(default=60.0, env="NOTIFY_LEASE_SECONDS")  # mínimo; se amplía al peor caso del lote
     
     # ===== RATE LIMITING =====
     rate_limit_enabled: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
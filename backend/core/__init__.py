@@ -19,8 +19,11 @@ from starlette.middleware.cors import CORSMiddleware
 
 from backend.config.settings import get_settings
 from backend.utils.logger import get_logger
+from backend.utils.memory import register_cache
 from backend.services import get_auth_service
 from backend.models import AdminUser, RequestMetadata
+from backend.core.guards import RequestGuardMiddleware, RequestBodyTooLargeError
+from backend.core.loop_monitor import LoopRouteMiddleware, LoopLagMonitor, loop_monitor
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -93,6 +96,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.calls = calls
         self.period = period
         self.clients = {}
+        register_cache("rate_limit.clients", lambda: self.clients)
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         client_ip = request.client.host if request.client else "unknown"
@@ -238,6 +242,8 @@ def cache_result(ttl_seconds: int = 300):
     cache = {}
     
     def decorator(func: Callable):
+        register_cache(f"cache_result.{func.__module__}.{func.__name__}", lambda: cache)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Create cache key
@@ -326,6 +332,7 @@ class ResponseCache:
 
 # Global cache instance
 response_cache = ResponseCache()
+register_cache("response_cache", lambda: response_cache.cache)
 
 # ===== EXCEPTION HANDLERS =====
 
@@ -362,6 +369,9 @@ async def generic_exception_handler(request: Request, exc: Exception):
 __all__ = [
     # Middleware
     "RequestTrackingMiddleware", "SecurityHeadersMiddleware", "RateLimitMiddleware",
+    "RequestGuardMiddleware", "RequestBodyTooLargeError", "LoopRouteMiddleware",
+    # Monitoring
+    "LoopLagMonitor", "loop_monitor",
     # Dependencies
     "get_current_user", "require_auth", "require_admin", "require_permission",
     "get_request_metadata",
@@ -0,0 +1,146 @@
+"""
+🛡️ DATACRYPT LABS - REQUEST GUARDS
+Middleware ASGI que aplica max_request_size y request_timeout
+Filosofía Mejora Continua: Rechazar temprano, nunca bloquear indefinidamente
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.utils.deadline import Deadline, set_deadline, reset_deadline
+from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+class RequestBodyTooLargeError(HTTPException):
+    """El body del request supera max_request_size"""
+
+    def __init__(self, limit: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body exceeds {limit} bytes"
+        )
+
+class RequestGuardMiddleware:
+    """Middleware ASGI puro de límite de body y deadline por request
+
+    - Rechaza por Content-Length antes de leer nada y cuenta los bytes del
+      body a medida que llegan, abortando en cuanto se pasa del límite.
+    - Ejecuta el handler dentro de un CancelScope con deadline; al expirar
+      se cancela el trabajo async y el Deadline del contexto interrumpe las
+      queries SQLite (también las lanzadas con asyncio.to_thread, que copia
+      el contexto). El trabajo en process pools no se interrumpe.
+    - El deadline cubre hasta que arranca la respuesta, así las respuestas
+      en streaming no se cortan.
+    - `routes` fija límites propios (max_body_size, timeout) por path exacto
+      para los endpoints que por diseño reciben más o tardan más.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, timeout: float,
+                 routes: Optional[Dict[str, Tuple[int, float]]] = None):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.timeout = timeout
+        self.routes = routes or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics.increment("guards.requests")
+        max_body_size, timeout = self.routes.get(scope["path"], (self.max_body_size, self.timeout))
+
+        content_length = self._content_length(scope)
+        if content_length is not None and content_length > max_body_size:
+            self._reject("body_too_large", scope, f"Content-Length {content_length}")
+            await self._send_error(send, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+            return
+
+        received = 0
+        response_started = False
+        deadline = Deadline(timeout)
+
+        async def guarded_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    self._reject("body_too_large", scope, f"streamed {received} bytes")
+                    raise RequestBodyTooLargeError(max_body_size)
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                deadline.lift()
+                cancel_scope.deadline = float("inf")
+            await send(message)
+
+        token = set_deadline(deadline)
+        try:
+            with anyio.CancelScope(deadline=anyio.current_time() + timeout) as cancel_scope:
+                try:
+                    await self.app(scope, guarded_receive, guarded_send)
+                except RequestBodyTooLargeError:
+                    if response_started:
+                        raise
+                    await self._send_error(send, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+                    return
+                except Exception:
+                    # Trabajo bloqueante interrumpido por el deadline (p.ej. SQLite)
+                    if response_started or not deadline.expired():
+                        raise
+                    cancel_scope.cancel()
+        finally:
+            reset_deadline(token)
+
+        if cancel_scope.cancel_called and not response_started:
+            self._reject("timeout", scope, f"exceeded {timeout}s")
+            await self._send_error(send, status.HTTP_504_GATEWAY_TIMEOUT, "Request timeout")
+
+    @staticmethod
+    def _content_length(scope: Scope) -> Optional[int]:
+        """Lee Content-Length de los headers crudos"""
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    def _reject(reason: str, scope: Scope, detail: str) -> None:
+        """Registra el rechazo en métricas y logs"""
+        metrics.increment(f"guards.rejected.{reason}")
+        logger.warning(f"Request rejected ({reason}): {scope.get('method')} {scope.get('path')} - {detail}")
+
+    @staticmethod
+    async def _send_error(send: Send, status_code: int, message: str) -> None:
+        """Envía una respuesta JSON de error con el formato estándar"""
+        body = json.dumps({
+            "status": "error",
+            "message": message,
+            "timestamp": datetime.utcnow().isoformat()
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+__all__ = ["RequestGuardMiddleware", "RequestBodyTooLargeError"]
@@ -0,0 +1,210 @@
+"""
+🐢 DATACRYPT LABS - EVENT LOOP LAG MONITOR
+Mide el retraso del event loop y captura quién lo está bloqueando
+Filosofía Mejora Continua: Ver el bloqueo, no solo la respuesta lenta
+
+- Heartbeat: un task duerme `interval` y mide cuánto tarda de más en
+  despertar; ese retraso es el lag del loop (percentiles sobre una ventana).
+- Watchdog: un thread comprueba el último latido; si el loop lleva más de
+  `threshold` sin latir, captura la pila del thread del loop *mientras* está
+  bloqueado (la llamada culpable: sqlite3, PBKDF2, psutil, pandas...).
+- Atribución: LoopRouteMiddleware anota qué request corre en cada task; el
+  watchdog consulta el task actual del loop y obtiene su ruta.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+from weakref import WeakKeyDictionary
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.config.settings import get_settings
+from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+LAG_WINDOW = 2048
+STALL_HISTORY = 50
+STACK_DEPTH = 30
+
+class LoopLagMonitor:
+    """Heartbeat en el loop + watchdog en un thread aparte"""
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: Deque[float] = deque(maxlen=LAG_WINDOW)
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=STALL_HISTORY)
+        self.max_lag = 0.0
+        self.beats = 0
+        self.routes: "WeakKeyDictionary[asyncio.Task, Scope]" = WeakKeyDictionary()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._last_beat = 0.0
+        self._capture: Optional[Dict[str, Any]] = None
+        self._capture_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Arranca heartbeat y watchdog (llamar desde el loop, en startup)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watchdog, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ===== LOOP SIDE =====
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started = self._last_beat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - started - self.interval)
+            self.lags.append(lag)
+            self.beats += 1
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self._record_stall(lag, started)
+
+    def _record_stall(self, lag: float, beat: float) -> None:
+        with self._capture_lock:
+            capture, self._capture = self._capture, None
+        if capture is None or capture["beat"] != beat:
+            capture = {"route": None, "task": None, "stack": []}  # Bloqueo más corto que el watchdog
+        stall = {
+            "timestamp": time.time(),
+            "lag_ms": round(lag * 1000, 2),
+            "route": capture["route"],
+            "task": capture["task"],
+            "stack": capture["stack"]
+        }
+        self.stalls.append(stall)
+        metrics.increment("loop.stalls")
+        culprit = stall["stack"][-1] if stall["stack"] else "unknown"
+        logger.warning(
+            f"Event loop blocked {stall['lag_ms']}ms in {stall['route'] or 'background'} at {culprit}",
+            extra_data={k: v for k, v in stall.items() if k != "stack"}
+        )
+
+    # ===== WATCHDOG THREAD =====
+
+    def _watchdog(self) -> None:
+        captured_beat = None
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._last_beat
+            if beat == captured_beat or time.perf_counter() - beat < self.interval + self.threshold:
+                continue
+            captured_beat = beat
+            capture = self._capture_loop(beat)
+            with self._capture_lock:
+                self._capture = capture
+
+    def _capture_loop(self, beat: float) -> Dict[str, Any]:
+        """Pila y ruta del código que ocupa ahora mismo el thread del loop"""
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = [
+            f"{entry.filename}:{entry.lineno} in {entry.name}"
+            for entry in traceback.extract_stack(frame, limit=STACK_DEPTH)
+        ] if frame is not None else []
+        task = asyncio.current_task(self._loop)
+        scope = self.routes.get(task) if task is not None else None
+        return {
+            "beat": beat,
+            "route": describe_scope(scope) if scope is not None else None,
+            "task": task.get_name() if task is not None else None,
+            "stack": stack
+        }
+
+    # ===== STATS =====
+
+    def stats(self) -> Dict[str, Any]:
+        """Percentiles de lag de la ventana reciente y contadores de bloqueos"""
+        ordered = sorted(self.lags)
+
+        def percentile(q: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "samples": len(ordered),
+            "lag_p50_ms": percentile(0.5),
+            "lag_p90_ms": percentile(0.9),
+            "lag_p99_ms": percentile(0.99),
+            "lag_max_ms": round(self.max_lag * 1000, 2),
+            "stalls": int(metrics.get("loop.stalls")),
+            "last_stall": self.stalls[-1]["timestamp"] if self.stalls else None
+        }
+
+    def recent_stalls(self, limit: int = STALL_HISTORY) -> List[Dict[str, Any]]:
+        return list(self.stalls)[-limit:][::-1]
+
+def describe_scope(scope: Scope) -> str:
+    """'GET /api/v1/games/leaderboard (get_leaderboard)'"""
+    route = f"{scope.get('method', '')} {scope.get('path', '')}".strip()
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        route += f" ({getattr(endpoint, '__name__', endpoint)})"
+    return route
+
+class LoopRouteMiddleware:
+    """Middleware ASGI puro: anota el request que ejecuta cada task
+
+    Debe ser el más interno (registrarse primero): BaseHTTPMiddleware lanza
+    la app interna en otro task y la anotación tiene que quedar en el task
+    que ejecuta el endpoint.
+    """
+
+    def __init__(self, app: ASGIApp, monitor: Optional[LoopLagMonitor] = None):
+        self.app = app
+        self.monitor = monitor or loop_monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        self.monitor.routes[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.routes.pop(task, None)
+
+# Instancia global del monitor
+loop_monitor = LoopLagMonitor(
+    interval=settings.loop_lag_interval,
+    threshold=settings.loop_lag_threshold
+)
+
+__all__ = ["LoopLagMonitor", "LoopRouteMiddleware", "loop_monitor", "describe_scope"]
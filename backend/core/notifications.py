@@ -0,0 +1,252 @@
+"""
+📬 DATACRYPT LABS - OUTBOX DISPATCHER
+Entrega en segundo plano de las notificaciones de notification_outbox
+Filosofía Mejora Continua: Latencia del aviso fuera del request del usuario
+
+- Un task por proceso: cada `interval` reclama hasta `batch_size` filas y
+  las entrega en lote: un POST al webhook con la lista y/o una sola sesión
+  SMTP con un correo por mensaje (Reply-To = remitente).
+- Reintentos inmediatos con async_retry (backoff exponencial) que solo
+  reenvían lo que aún no se entregó; si se agotan, la fila vuelve a
+  'pending' con next_attempt_at diferido siguiendo la misma progresión
+  (delay * 2^n), hasta max_attempts -> 'failed'.
+- Entrega al menos una vez: un fallo a mitad de lote puede repetir un
+  aviso ya enviado por el otro canal.
+- Sin canal configurado el dispatcher no arranca y las filas esperan en
+  'pending' hasta que lo haya.
+- El lease de las filas reclamadas nunca es menor que el peor caso del lote
+  (todos los intentos con sus timeouts y esperas): otro worker no puede
+  reclamarlas mientras este aún las entrega.
+"""
+
+import asyncio
+import json
+import smtplib
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from backend.config.settings import get_settings
+from backend.core import async_retry
+from backend.services import get_contact_service
+from backend.services.outbox import (
+    CLAIM_NOTIFICATIONS, MARK_DELIVERED, MARK_RETRY, OUTBOX_COUNTS, OUTBOX_STATUSES
+)
+from backend.utils.logger import get_logger
+from backend.utils.metrics import metrics
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+WEBHOOK_TIMEOUT = 10.0  # POST completo (conexión + envío + respuesta)
+SMTP_TIMEOUT = 10.0  # Por operación del socket
+SMTP_SESSION_BUDGET = 20.0  # Pasado esto no se empieza otro correo de la sesión
+# Peor caso de una sesión: el presupuesto + el último correo empezado (MAIL, RCPT, DATA, cuerpo, RSET) + QUIT
+SMTP_SESSION_LIMIT = SMTP_SESSION_BUDGET + 6 * SMTP_TIMEOUT
+LEASE_MARGIN = 30.0
+
+class OutboxDispatcher:
+    """Reclama lotes del outbox y los entrega por webhook y/o SMTP"""
+
+    def __init__(self, webhook_url: Optional[str] = None, smtp_host: Optional[str] = None,
+                 smtp_port: int = 25, mail_from: str = "", mail_to: Optional[str] = None,
+                 batch_size: int = 20, interval: float = 2.0, max_retries: int = 3,
+                 retry_delay: float = 1.0, max_attempts: int = 5, lease: float = 60.0):
+        self.webhook_url = webhook_url
+        self.smtp_host = smtp_host
+        self.smtp_port = smtp_port
+        self.mail_from = mail_from
+        self.mail_to = mail_to
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.lease = max(lease, self.max_batch_seconds + LEASE_MARGIN)
+        self.batches = 0
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.webhook_url or (self.smtp_host and self.mail_to))
+
+    @property
+    def max_batch_seconds(self) -> float:
+        """Peor caso de entregar un lote: todos los intentos de async_retry y sus esperas"""
+        attempt = (WEBHOOK_TIMEOUT if self.webhook_url else 0.0) + (
+            SMTP_SESSION_LIMIT if self.smtp_host and self.mail_to else 0.0
+        )
+        backoff = sum(self.retry_delay * 2 ** n for n in range(self.max_retries - 1))
+        return self.max_retries * attempt + backoff
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Arranca el bucle (llamar desde el loop, en startup)"""
+        if self.running or not self.configured:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        """Adelanta el siguiente ciclo (p.ej. justo después de encolar)"""
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.dispatch_once() == self.batch_size:
+                    pass  # Lote lleno: seguramente hay más pendientes
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox dispatcher error: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    # ===== DELIVERY =====
+
+    async def dispatch_once(self) -> int:
+        """Reclama y entrega un lote; devuelve cuántas filas reclamó"""
+        db = get_contact_service().db
+        now = datetime.utcnow()
+        async with db.get_connection() as conn:
+            rows = [dict(row) for row in conn.execute(CLAIM_NOTIFICATIONS, (
+                (now + timedelta(seconds=self.lease)).isoformat(), now.isoformat(),
+                now.isoformat(), self.batch_size
+            )).fetchall()]
+            conn.commit()
+        if not rows:
+            return 0
+
+        pending = sorted(rows, key=lambda row: row["id"])
+        delivered: List[int] = []
+        error: Optional[str] = None
+        try:
+            await async_retry(self.max_retries, self.retry_delay)(self._deliver)(pending, delivered)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            self.last_error = error
+
+        finished = datetime.utcnow()
+        async with db.get_connection() as conn:
+            for row_id in delivered:
+                conn.execute(MARK_DELIVERED, (finished.isoformat(), row_id))
+            for row in pending:
+                backoff = self.retry_delay * 2 ** (self.max_retries + row["attempts"])
+                conn.execute(MARK_RETRY, (
+                    self.max_attempts, (finished + timedelta(seconds=backoff)).isoformat(), error, row["id"]
+                ))
+            conn.commit()
+
+        self.batches += 1
+        metrics.increment("notifications.delivered", len(delivered))
+        if pending:
+            metrics.increment("notifications.deferred", len(pending))
+            logger.warning(
+                f"Outbox batch: {len(delivered)} delivered, {len(pending)} deferred",
+                extra_data={"error": error, "ids": [row["id"] for row in pending]}
+            )
+        return len(rows)
+
+    async def _deliver(self, pending: List[Dict[str, Any]], delivered: List[int]) -> None:
+        """Entrega lo pendiente; lo entregado sale de `pending` (un reintento no lo repite)"""
+        notifications = [{"id": row["id"], "kind": row["kind"], **json.loads(row["payload"])} for row in pending]
+        if self.webhook_url:
+            async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT) as client:
+                response = await asyncio.wait_for(
+                    client.post(self.webhook_url, json={"notifications": notifications}), WEBHOOK_TIMEOUT
+                )
+                response.raise_for_status()
+        if self.smtp_host and self.mail_to:
+            sent = await asyncio.to_thread(self._send_mail, notifications)
+            if len(sent) < len(notifications):
+                self._move(pending, delivered, sent)
+                raise RuntimeError(f"SMTP delivered {len(sent)}/{len(notifications)}")
+        self._move(pending, delivered, [row["id"] for row in pending])
+
+    @staticmethod
+    def _move(pending: List[Dict[str, Any]], delivered: List[int], ids: List[int]) -> None:
+        done = set(ids)
+        delivered.extend(row["id"] for row in pending if row["id"] in done)
+        pending[:] = [row for row in pending if row["id"] not in done]
+
+    def _send_mail(self, notifications: List[Dict[str, Any]]) -> List[int]:
+        """Una sesión SMTP para todo el lote; devuelve los ids enviados"""
+        sent: List[int] = []
+        started = time.monotonic()
+        with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=SMTP_TIMEOUT) as smtp:
+            for notification in notifications:
+                if time.monotonic() - started > SMTP_SESSION_BUDGET:
+                    break  # El resto se reintenta: la sesión no puede pasar de SMTP_SESSION_LIMIT
+                mail = EmailMessage()
+                mail["From"] = self.mail_from
+                mail["To"] = self.mail_to
+                mail["Reply-To"] = notification["email"]
+                mail["Subject"] = f"Nuevo mensaje de contacto: {notification['name']}"
+                mail.set_content(
+                    f"{notification['name']} <{notification['email']}>\n"
+                    f"{notification['timestamp']}\n\n{notification['message']}\n"
+                )
+                try:
+                    smtp.send_message(mail)
+                except smtplib.SMTPException as e:
+                    logger.warning(f"SMTP send failed for notification {notification['id']}: {e}")
+                    break
+                sent.append(notification["id"])
+        return sent
+
+    # ===== STATS =====
+
+    async def stats(self) -> Dict[str, Any]:
+        """Estado del dispatcher y filas del outbox por estado"""
+        rows = await get_contact_service().db.execute_query(OUTBOX_COUNTS)
+        counts = {status: 0 for status in OUTBOX_STATUSES}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return {
+            "running": self.running,
+            "configured": self.configured,
+            "channels": [name for name, enabled in (
+                ("webhook", bool(self.webhook_url)), ("smtp", bool(self.smtp_host and self.mail_to))
+            ) if enabled],
+            "outbox": counts,
+            "batches": self.batches,
+            "delivered": int(metrics.get("notifications.delivered")),
+            "deferred": int(metrics.get("notifications.deferred")),
+            "last_error": self.last_error
+        }
+
+outbox_dispatcher = OutboxDispatcher(
+    webhook_url=settings.notify_webhook_url,
+    smtp_host=settings.notify_smtp_host,
+    smtp_port=settings.notify_smtp_port,
+    mail_from=settings.notify_mail_from,
+    mail_to=settings.notify_mail_to,
+    batch_size=settings.notify_batch_size,
+    interval=settings.notify_interval,
+    max_retries=settings.notify_max_retries,
+    retry_delay=settings.notify_retry_delay,
+    max_attempts=settings.notify_max_attempts,
+    lease=settings.notify_lease_seconds
+)
+
+__all__ = ["OutboxDispatcher", "outbox_dispatcher"]
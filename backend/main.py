@@ -6,8 +6,8 @@ Filosofía Mejora Continua: Código limpio y mantenible
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, JSONResponse
+import asyncio
 import uvicorn
 from pathlib import Path
 
@@ -16,10 +16,14 @@ from backend.config.settings import get_settings
 from backend.utils.logger import get_logger
 from backend.core import (
     RequestTrackingMiddleware, SecurityHeadersMiddleware, 
-    RateLimitMiddleware, validation_exception_handler,
-    generic_exception_handler
+    RateLimitMiddleware, RequestGuardMiddleware, LoopRouteMiddleware, loop_monitor,
+    validation_exception_handler, generic_exception_handler
 )
+from backend.core.notifications import outbox_dispatcher
 from backend.api import api_router
+from backend.services import get_game_service
+from backend.web import CompressionMiddleware, PrecompressedStaticFiles, precompress_directory
+from backend.web.sampling import MAX_SECONDS as PROFILE_MAX_SECONDS
 
 # Configuración
 settings = get_settings()
@@ -38,6 +42,10 @@ app = FastAPI(
 
 # ===== MIDDLEWARE =====
 
+# Atribución de bloqueos del loop a la ruta (el más interno: corre en el task del endpoint)
+if settings.loop_monitor_enabled:
+    app.add_middleware(LoopRouteMiddleware, monitor=loop_monitor)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -52,6 +60,27 @@ app.add_middleware(RequestTrackingMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(RateLimitMiddleware, calls=100, period=60)
 
+# Compresión br/gzip negociada (JSON grandes, HTML, CSS, JS)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        offload_size=settings.compression_offload_size,
+    )
+
+# Guards de tamaño y timeout (el más externo: rechaza antes que el resto)
+app.add_middleware(
+    RequestGuardMiddleware,
+    max_body_size=settings.max_request_size,
+    timeout=settings.request_timeout,
+    routes={
+        # El resumen de la ingesta solo se envía al terminar: el deadline cubre todo el lote
+        "/api/v1/games/scores/bulk": (settings.bulk_ingest_max_bytes, settings.bulk_ingest_timeout),
+        # La muestra de pilas dura hasta PROFILE_MAX_SECONDS antes de responder
+        "/api/v1/admin/profiler/sample": (settings.max_request_size, PROFILE_MAX_SECONDS + 15),
+    },
+)
+
 # ===== EXCEPTION HANDLERS =====
 
 app.add_exception_handler(ValueError, validation_exception_handler)
@@ -67,7 +96,7 @@ app.include_router(api_router)
 # Servir archivos estáticos si existen
 static_dir = Path("static")
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 # ===== ROOT ENDPOINTS =====
 
@@ -182,10 +211,27 @@ async def startup_event():
     logger.info(f"Database: {settings.get_database_path()}")
     logger.info("Filosofía Mejora Continua: ✅ Activa")
     logger.info("Arquitectura: 📦 Modular")
+    
+    # Ranking y estadísticas de juegos desde SQLite (fuera del event loop)
+    await get_game_service().warm()
+    
+    # Watchdog de lag del event loop
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    
+    # Entrega de notificaciones del outbox (solo con webhook/SMTP configurado)
+    outbox_dispatcher.start()
+    
+    # Generar variantes .br/.gz de los estáticos fuera del event loop
+    if static_dir.exists():
+        result = await asyncio.to_thread(precompress_directory, static_dir)
+        logger.info(f"Static precompression: {result}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Eventos de cierre"""
+    await outbox_dispatcher.stop()
+    await loop_monitor.stop()
     logger.info("🛑 DataCrypt Labs - Sistema modular detenido")
 
 # ===== MAIN =====
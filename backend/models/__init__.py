@@ -215,8 +215,12 @@ class AdminTokenResponse(SuccessResponse):
 
 # ===== GAME MODELS =====
 
+DEFAULT_GAME = "default"
+GAME_ID_PATTERN = r'^[a-z0-9][a-z0-9_-]*$'
+
 class GameScore(BaseModel):
     """Puntuación del juego"""
+    game_id: str = Field(default=DEFAULT_GAME, min_length=1, max_length=50, pattern=GAME_ID_PATTERN)
     player_name: str = Field(..., min_length=1, max_length=50)
     score: int = Field(..., ge=0)
     level: int = Field(..., ge=1)
@@ -281,7 +285,7 @@ __all__ = [
     # Admin
     "AdminUser", "AdminLoginRequest", "AdminTokenResponse",
     # Game
-    "GameScore", "GameLeaderboard",
+    "GameScore", "GameLeaderboard", "DEFAULT_GAME", "GAME_ID_PATTERN",
     # Health
     "HealthStatus",
     # Metadata
@@ -10,16 +10,34 @@ import secrets
 import jwt
 import asyncio
 import json
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Union
 from pathlib import Path
 from contextlib import asynccontextmanager
 from functools import wraps
 
 from backend.config.settings import get_settings
 from backend.utils.logger import get_logger
+from backend.utils.profiler import profiled
+from backend.utils.deadline import install_sqlite_deadline
+from backend.utils.metrics import metrics
+from backend.services.leaderboard import Leaderboard, WindowedLeaderboards, week_start, WINDOWS
+from backend.services.game_stats import GameStats, QuantileSketch
+from backend.services.leaderboard_feed import LeaderboardFeed
+from backend.services.contact_search import (
+    CONTACT_FTS_SCHEMA, CONTACT_FTS_REBUILD, SEARCH_QUERY, build_match_query, encode_cursor, decode_cursor
+)
+from backend.services.dedupe import (
+    RecentFingerprints, DuplicateMessageError, fingerprint,
+    FINGERPRINT_SCHEMA, CLAIM_FINGERPRINT, PRUNE_FINGERPRINTS
+)
+from backend.services.export import export_rows
+from backend.services.outbox import OUTBOX_SCHEMA, ENQUEUE_NOTIFICATION, contact_notification
+from backend.services.score_ingest import IngestError, IngestReport, iter_rows, parse_score
 from backend.models import (
-    AdminUser, ContactMessage, GameScore, 
+    AdminUser, ContactMessage, GameScore, DEFAULT_GAME,
     PortfolioProject, CryptoPrice, HealthStatus,
     MLPredictionRequest, DataAnalysisRequest
 )
@@ -33,7 +51,7 @@ class DatabaseService:
     """Servicio de base de datos con gestión de conexiones"""
     
     def __init__(self):
-        self.db_path = settings.DATABASE_PATH
+        self.db_path = settings.get_database_path()
         self._ensure_database_exists()
     
     def _ensure_database_exists(self):
@@ -53,6 +71,7 @@ class DatabaseService:
         try:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row  # Enable dict-like access
+            install_sqlite_deadline(conn)  # Abort queries past the request deadline
             yield conn
         except Exception as e:
             if conn:
@@ -63,12 +82,14 @@ class DatabaseService:
             if conn:
                 conn.close()
     
+    @profiled()
     async def execute_query(self, query: str, params: tuple = ()) -> List[Dict]:
         """Ejecuta query y retorna resultados"""
         async with self.get_connection() as conn:
             cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
+    @profiled()
     async def execute_insert(self, query: str, params: tuple = ()) -> int:
         """Ejecuta insert y retorna lastrowid"""
         async with self.get_connection() as conn:
@@ -76,12 +97,25 @@ class DatabaseService:
             conn.commit()
             return cursor.lastrowid
     
+    @profiled()
     async def execute_update(self, query: str, params: tuple = ()) -> int:
         """Ejecuta update y retorna affected rows"""
         async with self.get_connection() as conn:
             cursor = conn.execute(query, params)
             conn.commit()
             return cursor.rowcount
+    
+    @profiled()
+    async def execute_transaction(self, statements: List[tuple]) -> int:
+        """Ejecuta varias sentencias (query, params) en una sola transacción; retorna el primer lastrowid"""
+        async with self.get_connection() as conn:
+            first_rowid = None
+            for query, params in statements:
+                cursor = conn.execute(query, params)
+                if first_rowid is None:
+                    first_rowid = cursor.lastrowid
+            conn.commit()
+            return first_rowid
 
 # ===== AUTHENTICATION SERVICE =====
 
@@ -132,6 +166,7 @@ class AuthService:
             logger.warning(f"Token validation failed: {e}")
             return None
     
+    @profiled()
     async def authenticate_user(self, username: str, password: str) -> Optional[AdminUser]:
         """Autentica usuario"""
         try:
@@ -179,35 +214,149 @@ class AuthService:
 
 # ===== CONTACT SERVICE =====
 
+CONTACT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contact_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    message TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    ip_address TEXT,
+    user_agent TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contact_messages_timestamp ON contact_messages(timestamp);
+CREATE TABLE IF NOT EXISTS contact_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    messages INTEGER NOT NULL,
+    unique_senders INTEGER NOT NULL,
+    length_sum INTEGER NOT NULL,
+    length_min INTEGER NOT NULL,
+    length_max INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contact_senders (email TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS contact_monthly (month TEXT PRIMARY KEY, messages INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS contact_hourly (hour TEXT PRIMARY KEY, messages INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS contact_domains (domain TEXT PRIMARY KEY, messages INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_contact_domains_messages ON contact_domains(messages);
+CREATE TABLE IF NOT EXISTS contact_lengths (bucket INTEGER PRIMARY KEY, messages INTEGER NOT NULL);
+"""
+
+# Rollups mantenidos en la transacción del INSERT. changes() en contact_totals
+# vale 1 solo si el INSERT OR IGNORE anterior dio de alta un remitente nuevo.
+CONTACT_ROLLUPS = (
+    "INSERT OR IGNORE INTO contact_senders (email) VALUES (?)",
+    """
+    INSERT INTO contact_totals (id, messages, unique_senders, length_sum, length_min, length_max)
+    VALUES (1, 1, changes(), ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        messages = messages + 1,
+        unique_senders = unique_senders + excluded.unique_senders,
+        length_sum = length_sum + excluded.length_sum,
+        length_min = MIN(length_min, excluded.length_min),
+        length_max = MAX(length_max, excluded.length_max)
+    """,
+    "INSERT INTO contact_monthly VALUES (?, 1) ON CONFLICT(month) DO UPDATE SET messages = messages + 1",
+    "INSERT INTO contact_hourly VALUES (?, 1) ON CONFLICT(hour) DO UPDATE SET messages = messages + 1",
+    "INSERT INTO contact_domains VALUES (?, 1) ON CONFLICT(domain) DO UPDATE SET messages = messages + 1",
+    "INSERT INTO contact_lengths VALUES (?, 1) ON CONFLICT(bucket) DO UPDATE SET messages = messages + 1"
+)
+
+CONTACT_ACTIVITY_WINDOWS = (("last_24h", 24), ("last_7_days", 7 * 24), ("last_30_days", 30 * 24))
+
 class ContactService:
     """Servicio de manejo de contactos"""
     
     def __init__(self):
         self.db = DatabaseService()
+        self.length_sketch = QuantileSketch()  # Solo para calcular cubos: los datos viven en contact_lengths
+        self.recent = RecentFingerprints(settings.contact_dedupe_window, settings.contact_dedupe_max_entries)
+        self._ensure_schema()
+    
+    def _ensure_schema(self):
+        """Crea las tablas de contacto y reconstruye los rollups si faltan"""
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.executescript(CONTACT_SCHEMA)
+            conn.executescript(CONTACT_FTS_SCHEMA)
+            conn.executescript(FINGERPRINT_SCHEMA)
+            conn.executescript(OUTBOX_SCHEMA)
+            conn.execute("BEGIN IMMEDIATE")  # Otro worker arrancando a la vez espera aquí
+            has_totals = conn.execute("SELECT 1 FROM contact_totals").fetchone()
+            has_messages = conn.execute("SELECT 1 FROM contact_messages LIMIT 1").fetchone()
+            if has_messages and not has_totals:
+                for row in conn.execute("SELECT email, message, timestamp FROM contact_messages").fetchall():
+                    for query, params in zip(CONTACT_ROLLUPS, self._rollup_params(*row)):
+                        conn.execute(query, params)
+                logger.info("contact rollups backfilled from contact_messages")
+            conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            has_index = conn.execute("SELECT 1 FROM contact_messages_fts_docsize LIMIT 1").fetchone()
+            if has_messages and not has_index:
+                conn.execute(CONTACT_FTS_REBUILD)
+                logger.info("contact_messages_fts rebuilt from contact_messages")
     
+    def _rollup_params(self, email: str, message: str, timestamp: str) -> List[tuple]:
+        """Parámetros de CONTACT_ROLLUPS para un mensaje"""
+        length = len(message)
+        return [
+            (email.lower(),),
+            (length, length, length),
+            (timestamp[:7],),
+            (timestamp[:13],),
+            (email.rpartition("@")[2].lower(),),
+            (self.length_sketch.key(length),)
+        ]
+    
+    @profiled()
     async def save_message(self, message: ContactMessage) -> bool:
-        """Guarda mensaje de contacto"""
+        """Guarda mensaje de contacto (con rollups y notificación en el outbox, en la misma transacción)
+        
+        Lanza DuplicateMessageError si el mismo email + mensaje ya se guardó
+        dentro de la ventana de deduplicación.
+        """
+        key = fingerprint(message.email, message.message)
         try:
             query = """
             INSERT INTO contact_messages (name, email, message, timestamp, ip_address, user_agent)
             VALUES (?, ?, ?, ?, ?, ?)
             """
-            await self.db.execute_insert(query, (
-                message.name,
-                message.email,
-                message.message,
-                message.timestamp.isoformat(),
-                message.ip_address,
-                message.user_agent
-            ))
-            
-            logger.info(f"Contact message saved from: {message.email}")
-            return True
+            timestamp = message.timestamp.isoformat()
+            now = datetime.utcnow()  # Hora del servidor: el timestamp del cliente no decide la ventana
+            cutoff = (now - timedelta(seconds=settings.contact_dedupe_window)).isoformat()
+            async with self.db.get_connection() as conn:
+                claimed = conn.execute(CLAIM_FINGERPRINT, (key, now.isoformat(), cutoff)).rowcount
+                if claimed:
+                    conn.execute(PRUNE_FINGERPRINTS, (cutoff,))
+                    message_id = conn.execute(query, (
+                        message.name,
+                        message.email,
+                        message.message,
+                        timestamp,
+                        message.ip_address,
+                        message.user_agent
+                    )).lastrowid
+                    conn.execute(ENQUEUE_NOTIFICATION, contact_notification(
+                        message_id, message.name, message.email, message.message, timestamp
+                    ))
+                    for rollup, params in zip(CONTACT_ROLLUPS, self._rollup_params(message.email, message.message, timestamp)):
+                        conn.execute(rollup, params)
+                conn.commit()
             
         except Exception as e:
             logger.error(f"Error saving contact message: {e}")
             return False
+        
+        self.recent.remember(key)
+        if not claimed:
+            metrics.increment("contact.dedupe.db_hits")
+            raise DuplicateMessageError(message.email)
+        logger.info(f"Contact message saved from: {message.email}")
+        return True
     
+    def is_recent_duplicate(self, email: str, message: str) -> bool:
+        """Comprobación en memoria (sin SQLite) de un envío repetido"""
+        return self.recent.check(fingerprint(email, message))
+    
+    @profiled()
     async def get_messages(self, limit: int = 50) -> List[ContactMessage]:
         """Obtiene mensajes de contacto"""
         try:
@@ -233,59 +382,555 @@ class ContactService:
         except Exception as e:
             logger.error(f"Error getting contact messages: {e}")
             return []
+    
+    @profiled()
+    async def search(self, text: str, field: Optional[str] = None, prefix: bool = False,
+                     order: str = "relevance", limit: int = 20,
+                     cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Búsqueda full-text (FTS5) con ranking bm25 o por recientes y paginación keyset"""
+        match = build_match_query(text, field, prefix)
+        if match is None:
+            return {"results": [], "next_cursor": None}
+        query = SEARCH_QUERY
+        params: tuple = (match,)
+        if cursor:
+            score, row_id = decode_cursor(order, cursor)
+            if order == "recent":
+                query += " AND contact_messages_fts.rowid < ?"
+                params += (row_id,)
+            else:
+                query += " AND (contact_messages_fts.rank, contact_messages_fts.rowid) > (?, ?)"
+                params += (score, row_id)
+        if order == "recent":
+            query += " ORDER BY contact_messages_fts.rowid DESC LIMIT ?"
+        else:
+            query += " ORDER BY contact_messages_fts.rank, contact_messages_fts.rowid LIMIT ?"
+        results = await self.db.execute_query(query, params + (limit,))
+        last = results[-1] if len(results) == limit else None
+        return {
+            "results": results,
+            "next_cursor": encode_cursor(order, last["score"], last["id"]) if last else None
+        }
+    
+    async def export(self, fmt: str = "csv", since: Optional[datetime] = None,
+                     until: Optional[datetime] = None, compress: bool = False) -> AsyncIterator[bytes]:
+        """Export de contact_messages por streaming (memoria constante)"""
+        filters = []
+        if since is not None:
+            filters.append(("timestamp >= ?", since.isoformat()))
+        if until is not None:
+            filters.append(("timestamp < ?", until.isoformat()))
+        async for chunk in export_rows(self.db.db_path, "contact_messages", fmt, filters,
+                                       settings.export_batch_size, compress):
+            yield chunk
+    
+    @profiled()
+    async def get_stats(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Estadísticas desde los rollups: lecturas acotadas sea cual sea el histórico"""
+        now = now or datetime.utcnow()
+        totals = await self.db.execute_query("SELECT * FROM contact_totals")
+        if not totals:
+            return {"total_messages": 0}
+        totals = totals[0]
+        
+        monthly = await self.db.execute_query("SELECT month, messages FROM contact_monthly ORDER BY month")
+        domains = await self.db.execute_query(
+            "SELECT domain, messages FROM contact_domains ORDER BY messages DESC, domain LIMIT 10"
+        )
+        lengths = await self.db.execute_query("SELECT bucket, messages FROM contact_lengths")
+        sketch = QuantileSketch.from_buckets({row["bucket"]: row["messages"] for row in lengths})
+        
+        # Ventanas por horas: como mucho 30*24 filas por clave primaria
+        activity = {}
+        for name, hours in CONTACT_ACTIVITY_WINDOWS:
+            since = (now - timedelta(hours=hours - 1)).isoformat()[:13]
+            rows = await self.db.execute_query(
+                "SELECT COALESCE(SUM(messages), 0) AS messages FROM contact_hourly WHERE hour >= ?", (since,)
+            )
+            activity[name] = rows[0]["messages"]
+        
+        return {
+            "total_messages": totals["messages"],
+            "unique_senders": totals["unique_senders"],
+            "messages_by_month": {row["month"]: row["messages"] for row in monthly},
+            "popular_domains": {row["domain"]: row["messages"] for row in domains},
+            "message_length_stats": {
+                "average": round(totals["length_sum"] / totals["messages"], 2),
+                "shortest": totals["length_min"],
+                "longest": totals["length_max"],
+                "median": round(sketch.quantile(0.5))
+            },
+            "recent_activity": activity
+        }
 
 # ===== GAME SERVICE =====
 
+GAME_SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT NOT NULL DEFAULT 'default',
+    player_name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_game_scores_game_player_ts
+    ON game_scores(game_id, player_name COLLATE NOCASE, timestamp);
+CREATE INDEX IF NOT EXISTS idx_game_scores_game_ts ON game_scores(game_id, timestamp);
+CREATE TABLE IF NOT EXISTS game_players (
+    game_id TEXT NOT NULL,
+    player_name TEXT NOT NULL COLLATE NOCASE,
+    games_played INTEGER NOT NULL,
+    best_score INTEGER NOT NULL,
+    best_level INTEGER NOT NULL,
+    best_timestamp TEXT NOT NULL,
+    score_sum INTEGER NOT NULL,
+    max_level INTEGER NOT NULL,
+    first_game TEXT NOT NULL,
+    last_game TEXT NOT NULL,
+    PRIMARY KEY (game_id, player_name)
+);
+"""
+
+# Bases de datos de un solo juego: game_id en game_scores (las filas quedan en
+# 'default'), índices compuestos en lugar de los antiguos y game_players
+# (agregado derivado) se reconstruye con la nueva clave primaria
+GAME_MIGRATION = (
+    "ALTER TABLE game_scores ADD COLUMN game_id TEXT NOT NULL DEFAULT 'default'",
+    "DROP INDEX IF EXISTS idx_game_scores_player_ts",
+    "DROP INDEX IF EXISTS idx_game_scores_timestamp",
+    "DROP TABLE IF EXISTS game_players"
+)
+
+INSERT_SCORE = """
+INSERT INTO game_scores (game_id, player_name, score, level, timestamp)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+# Partidas posteriores a la marca de agua (p.ej. guardadas por otro worker), en orden
+SCORES_AFTER = """
+SELECT id, game_id, player_name, score, level, timestamp FROM game_scores
+WHERE id > ? ORDER BY id
+"""
+
+# Agregado por juego y jugador mantenido en la misma transacción que el INSERT
+# (en el SET, las columnas sin prefijo son los valores previos de la fila)
+UPSERT_PLAYER = """
+INSERT INTO game_players (
+    game_id, player_name, games_played, best_score, best_level, best_timestamp,
+    score_sum, max_level, first_game, last_game
+) VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(game_id, player_name) DO UPDATE SET
+    games_played = games_played + 1,
+    best_level = CASE WHEN excluded.best_score > best_score
+        OR (excluded.best_score = best_score AND excluded.best_timestamp < best_timestamp)
+        THEN excluded.best_level ELSE best_level END,
+    best_timestamp = CASE WHEN excluded.best_score > best_score
+        OR (excluded.best_score = best_score AND excluded.best_timestamp < best_timestamp)
+        THEN excluded.best_timestamp ELSE best_timestamp END,
+    best_score = MAX(best_score, excluded.best_score),
+    score_sum = score_sum + excluded.score_sum,
+    max_level = MAX(max_level, excluded.max_level),
+    first_game = MIN(first_game, excluded.first_game),
+    last_game = MAX(last_game, excluded.last_game)
+"""
+
+# Reconstrucción del agregado desde game_scores (bases de datos anteriores)
+BACKFILL_PLAYERS = """
+INSERT INTO game_players
+SELECT game_id, player_name, games_played, score, level, timestamp, score_sum, max_level, first_game, last_game
+FROM (
+    SELECT game_id, player_name, score, level, timestamp,
+        ROW_NUMBER() OVER (
+            PARTITION BY game_id, player_name COLLATE NOCASE ORDER BY score DESC, timestamp ASC
+        ) AS position,
+        COUNT(*) OVER player AS games_played,
+        SUM(score) OVER player AS score_sum,
+        MAX(level) OVER player AS max_level,
+        MIN(timestamp) OVER player AS first_game,
+        MAX(timestamp) OVER player AS last_game
+    FROM game_scores
+    WINDOW player AS (PARTITION BY game_id, player_name COLLATE NOCASE)
+)
+WHERE position = 1
+"""
+
+def _upsert_params(game_id: str, player_name: str, score: int, level: int, timestamp: str) -> tuple:
+    return (game_id, player_name, score, level, timestamp, score, level, timestamp, timestamp)
+
+class GameIndexes:
+    """Índices en memoria de un juego: ranking, ventanas, estadísticas y feeds"""
+    
+    def __init__(self, game_id: str, refresh: Optional[Callable[[], Awaitable[None]]] = None):
+        self.game_id = game_id
+        self.leaderboard = Leaderboard()
+        self.windows = WindowedLeaderboards()
+        self.stats = GameStats()
+        self.feeds = {
+            window: LeaderboardFeed(
+                lambda window=window: self.board(window), window,
+                size=settings.leaderboard_feed_size,
+                interval=settings.leaderboard_feed_interval,
+                refresh=refresh
+            )
+            for window in WINDOWS
+        }
+    
+    def board(self, window: str = "all") -> Leaderboard:
+        """Tabla de la ventana: 'all' (histórico), 'day' o 'week' (UTC)"""
+        if window == "all":
+            return self.leaderboard
+        return self.windows.board(window)
+    
+    def submit_many(self, rows: List[tuple]) -> None:
+        """Varias partidas (player_name, score, level, timestamp) del juego"""
+        for player_name, score, level, timestamp in rows:
+            self.leaderboard.submit(player_name, score, level, timestamp)
+            self.windows.submit(player_name, score, level, timestamp)
+        self.stats.record_many((player_name, score) for player_name, score, _, _ in rows)
+
 class GameService:
-    """Servicio de juegos y puntuaciones"""
+    """Servicio de juegos y puntuaciones (índices en memoria por juego)
+    
+    Los índices son de este proceso. Con varios workers cada uno sigue a los
+    demás por game_scores.id: `_high_water` es el mayor id ya aplicado; las
+    lecturas aplican lo nuevo como mucho cada LEADERBOARD_SYNC_INTERVAL y las
+    escrituras lo aplican dentro de su propia transacción (con el lock de
+    escritura tomado nadie inserta en medio: ningún id se aplica dos veces).
+    """
     
     def __init__(self):
         self.db = DatabaseService()
+        self.games: Dict[str, GameIndexes] = {}
+        self._warmed = False
+        self._warm_lock = asyncio.Lock()
+        self._high_water = 0
+        self._index_lock = threading.Lock()  # Índices + marca de agua (se escriben desde threads)
+        self._synced_at = 0.0
+        self._ensure_schema()
     
+    def _ensure_schema(self):
+        """Crea las tablas de juegos si no existen (y migra las de un solo juego)"""
+        with sqlite3.connect(self.db.db_path) as conn:
+            # Sentencia a sentencia (executescript haría COMMIT y soltaría el lock)
+            conn.execute("BEGIN IMMEDIATE")  # Otro worker arrancando a la vez espera aquí
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(game_scores)")}
+            if columns and "game_id" not in columns:
+                for statement in GAME_MIGRATION:
+                    conn.execute(statement)
+                logger.info("game_scores migrated to multi-game schema")
+            conn.commit()
+            conn.executescript(GAME_SCHEMA)
+            conn.execute("BEGIN IMMEDIATE")  # Otro worker arrancando a la vez espera aquí
+            has_players = conn.execute("SELECT 1 FROM game_players LIMIT 1").fetchone()
+            has_scores = conn.execute("SELECT 1 FROM game_scores LIMIT 1").fetchone()
+            if has_scores and not has_players:
+                conn.execute(BACKFILL_PLAYERS)
+                logger.info("game_players backfilled from game_scores")
+    
+    def game(self, game_id: str = DEFAULT_GAME) -> GameIndexes:
+        """Índices del juego (se crean al ver su primera partida)"""
+        indexes = self.games.get(game_id)
+        if indexes is None:
+            indexes = self.games.setdefault(game_id, GameIndexes(game_id, self.sync))
+        return indexes
+    
+    def _lookup(self, game_id: str) -> GameIndexes:
+        """Índices para lectura: un juego sin partidas no se registra"""
+        return self.games.get(game_id) or GameIndexes(game_id)
+    
+    def _load_indexes(self) -> int:
+        """Carga rankings y estadísticas por juego desde SQLite (bloqueante: en un thread)"""
+        conn = sqlite3.connect(self.db.db_path)
+        try:
+            conn.execute("BEGIN")  # Una sola instantánea: la marca de agua cuadra con lo cargado
+            high_water = conn.execute("SELECT COALESCE(MAX(id), 0) FROM game_scores").fetchone()[0]
+            players: Dict[str, List[tuple]] = {}
+            for row in conn.execute(
+                "SELECT game_id, player_name, best_score, best_level, best_timestamp, games_played FROM game_players"
+            ):
+                players.setdefault(row[0], []).append(row[1:])
+            today = WindowedLeaderboards.today()
+            since = week_start(today).isoformat()
+            for game_id, game_players in players.items():
+                indexes = self.game(game_id)
+                for player_name, score, level, timestamp, _ in game_players:
+                    indexes.leaderboard.submit(player_name, score, level, timestamp)
+                # Cada lectura usa el índice compuesto (game_id, ...): solo las filas del juego
+                scores = (row[0] for row in conn.execute(
+                    "SELECT score FROM game_scores WHERE game_id = ?", (game_id,)
+                ))
+                indexes.stats.load(scores, ((row[0], row[4]) for row in game_players))
+                indexes.windows.load(conn.execute(
+                    "SELECT player_name, score, level, timestamp FROM game_scores"
+                    " WHERE game_id = ? AND timestamp >= ?",
+                    (game_id, since)
+                ), today)
+            self._high_water = high_water
+        finally:
+            conn.close()
+        return sum(len(game_players) for game_players in players.values())
+    
+    async def warm(self) -> None:
+        """Carga rankings y estadísticas desde SQLite (una sola vez)"""
+        if self._warmed:
+            return
+        async with self._warm_lock:
+            if self._warmed:
+                return
+            loaded = await asyncio.to_thread(self._load_indexes)
+            self._warmed = True
+            self._synced_at = time.monotonic()
+            logger.info(f"Game indexes warmed: {len(self.games)} games, {loaded} players")
+    
+    def _apply(self, rows: List[tuple]) -> None:
+        """Aplica partidas (game_id, player_name, score, level, timestamp) a los índices"""
+        by_game: Dict[str, List[tuple]] = {}
+        for game_id, *values in rows:
+            by_game.setdefault(game_id, []).append(values)
+        for game_id, game_rows in by_game.items():
+            self.game(game_id).submit_many(game_rows)
+    
+    def _catch_up(self, conn: sqlite3.Connection) -> int:
+        """Aplica lo escrito por otros workers (bloqueante: en un thread, con _index_lock)"""
+        rows = conn.execute(SCORES_AFTER, (self._high_water,)).fetchall()
+        if rows:
+            self._apply([row[1:] for row in rows])
+            self._high_water = rows[-1][0]
+        return len(rows)
+    
+    def _refresh(self) -> int:
+        with self._index_lock:
+            conn = sqlite3.connect(self.db.db_path)
+            try:
+                return self._catch_up(conn)
+            finally:
+                conn.close()
+    
+    async def sync(self) -> None:
+        """Índices al día con SQLite (como mucho una consulta por intervalo)"""
+        await self.warm()
+        now = time.monotonic()
+        if now - self._synced_at < settings.leaderboard_sync_interval:
+            return
+        self._synced_at = now
+        try:
+            applied = await asyncio.to_thread(self._refresh)
+        except sqlite3.Error as e:
+            logger.warning(f"Game index sync failed: {e}")  # Se sirve lo que hay; se reintenta en el siguiente
+            return
+        if applied:
+            metrics.increment("games.sync.applied", applied)
+    
+    def _write_scores(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        """Escribe partidas y las aplica a los índices junto con las de otros workers (bloqueante: en un thread)"""
+        with self._index_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                missed = conn.execute(SCORES_AFTER, (self._high_water,)).fetchall()
+                conn.executemany(INSERT_SCORE, rows)
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                conn.executemany(UPSERT_PLAYER, [_upsert_params(*row) for row in rows])
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._apply([row[1:] for row in missed] + rows)
+            self._high_water = last_id
+    
+    def _save_score(self, row: tuple) -> None:
+        conn = sqlite3.connect(self.db.db_path)
+        install_sqlite_deadline(conn)
+        try:
+            self._write_scores(conn, [row])
+        finally:
+            conn.close()
+    
+    @profiled()
     async def save_score(self, score: GameScore) -> bool:
         """Guarda puntuación"""
         try:
-            query = """
-            INSERT INTO game_scores (player_name, score, level, timestamp)
-            VALUES (?, ?, ?, ?)
-            """
-            await self.db.execute_insert(query, (
-                score.player_name,
-                score.score,
-                score.level,
-                score.timestamp.isoformat()
+            await self.warm()  # Las partidas nuevas no deben contarse dos veces
+            await asyncio.to_thread(self._save_score, (
+                score.game_id, score.player_name, score.score, score.level, score.timestamp.isoformat()
             ))
             
-            logger.info(f"Game score saved: {score.player_name} - {score.score}")
+            logger.info(f"Game score saved: {score.game_id}/{score.player_name} - {score.score}")
             return True
             
         except Exception as e:
             logger.error(f"Error saving game score: {e}")
             return False
     
-    async def get_leaderboard(self, limit: int = 10) -> List[GameScore]:
-        """Obtiene tabla de líderes"""
+    def _write_chunk(self, conn: sqlite3.Connection, chunk: List[tuple], report: IngestReport) -> None:
+        """Valida un bloque y lo escribe en una transacción + índices en memoria (bloqueante: en un thread)"""
+        rows = []
+        for row, value in chunk:
+            score, error = parse_score(value)
+            if error is not None:
+                report.reject(row, error)
+            else:
+                rows.append((score.game_id, score.player_name, score.score, score.level, score.timestamp.isoformat()))
+        if not rows:
+            return
+        self._write_scores(conn, rows)
+        report.inserted += len(rows)
+        report.chunks += 1
+    
+    async def ingest_scores(self, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """Ingesta masiva (NDJSON o array JSON) en transacciones por bloques"""
+        await self.warm()
+        report = IngestReport(settings.bulk_ingest_max_errors)
+        pending: List[tuple] = []
+        conn = sqlite3.connect(self.db.db_path, check_same_thread=False)
+        install_sqlite_deadline(conn)
+        
+        async def flush() -> None:
+            # Validación, SQL e índices fuera del event loop; aquí solo se decodifica JSON
+            batch = pending[:]
+            pending.clear()
+            await asyncio.to_thread(self._write_chunk, conn, batch, report)
+        
         try:
-            query = """
-            SELECT * FROM game_scores 
-            ORDER BY score DESC, timestamp ASC 
-            LIMIT ?
-            """
-            results = await self.db.execute_query(query, (limit,))
-            
+            async for row, value, error in iter_rows(chunks):
+                if row > settings.bulk_ingest_max_rows:
+                    raise IngestError(f"Batch exceeds {settings.bulk_ingest_max_rows} rows")
+                report.received += 1
+                if error is not None:
+                    report.reject(row, error)
+                    continue
+                pending.append((row, value))
+                if len(pending) >= settings.bulk_ingest_chunk_size:
+                    await flush()
+            if pending:
+                await flush()
+        except IngestError as e:
+            report.fatal = str(e)
+            if pending:
+                await flush()  # Las filas válidas ya leídas se conservan
+        except sqlite3.Error as e:
+            logger.error(f"Bulk ingestion aborted after {report.inserted} rows: {e}")
+            report.fatal = f"Database error after {report.inserted} rows: {e}"
+        finally:
+            conn.close()
+        
+        summary = report.summary()
+        logger.info(
+            f"Bulk ingestion: {report.inserted} inserted, {report.rejected} rejected",
+            extra_data={key: value for key, value in summary.items() if key != "errors"}
+        )
+        return summary
+    
+    def board(self, window: str = "all", game_id: str = DEFAULT_GAME) -> Leaderboard:
+        """Tabla de la ventana del juego"""
+        return self._lookup(game_id).board(window)
+    
+    @profiled()
+    async def get_leaderboard(self, limit: int = 10, offset: int = 0, window: str = "all",
+                              game_id: str = DEFAULT_GAME) -> List[GameScore]:
+        """Obtiene tabla de líderes (mejor marca por jugador)"""
+        try:
+            await self.sync()
             return [
                 GameScore(
-                    player_name=row['player_name'],
-                    score=row['score'],
-                    level=row['level'],
-                    timestamp=datetime.fromisoformat(row['timestamp'])
+                    game_id=game_id,
+                    player_name=entry['player_name'],
+                    score=entry['score'],
+                    level=entry['level'],
+                    timestamp=datetime.fromisoformat(entry['timestamp'])
                 )
-                for row in results
+                for entry in self.board(window, game_id).top(limit, offset)
             ]
             
         except Exception as e:
             logger.error(f"Error getting leaderboard: {e}")
             return []
+    
+    async def get_player_rank(self, player_name: str, window: str = "all",
+                              game_id: str = DEFAULT_GAME) -> Optional[Dict[str, Any]]:
+        """Posición del jugador en la tabla (None si no ha jugado)"""
+        await self.sync()
+        return self.board(window, game_id).rank(player_name)
+    
+    async def get_neighbours(self, rank: int, radius: int = 5, window: str = "all",
+                             game_id: str = DEFAULT_GAME) -> List[Dict[str, Any]]:
+        """Jugadores alrededor de una posición"""
+        await self.sync()
+        return self.board(window, game_id).around(rank, radius)
+    
+    def total_players(self, window: str = "all", game_id: str = DEFAULT_GAME) -> int:
+        return len(self.board(window, game_id))
+    
+    async def feed(self, window: str = "all", game_id: str = DEFAULT_GAME) -> LeaderboardFeed:
+        """Feed en vivo del top-K de la ventana (KeyError si el juego no tiene partidas)"""
+        await self.sync()
+        return self.games[game_id].feeds[window]
+    
+    async def export_scores(self, fmt: str = "csv", game_id: Optional[str] = None,
+                            since: Optional[datetime] = None, until: Optional[datetime] = None,
+                            compress: bool = False) -> AsyncIterator[bytes]:
+        """Export de game_scores por streaming (memoria constante)"""
+        await self.warm()
+        filters = []
+        if game_id is not None:
+            filters.append(("game_id = ?", game_id))
+        if since is not None:
+            filters.append(("timestamp >= ?", since.isoformat()))
+        if until is not None:
+            filters.append(("timestamp < ?", until.isoformat()))
+        async for chunk in export_rows(self.db.db_path, "game_scores", fmt, filters,
+                                       settings.export_batch_size, compress):
+            yield chunk
+    
+    async def get_games(self) -> List[Dict[str, Any]]:
+        """Juegos con partidas registradas"""
+        await self.sync()
+        return [
+            {
+                "game_id": game_id,
+                "players": len(indexes.leaderboard),
+                "total_games": indexes.stats.total_games
+            }
+            for game_id, indexes in sorted(self.games.items())
+        ]
+    
+    async def get_stats(self, game_id: str = DEFAULT_GAME) -> Dict[str, Any]:
+        """Estadísticas del juego mantenidas incrementalmente (O(1) respecto al histórico)"""
+        await self.sync()
+        indexes = self._lookup(game_id)
+        stats = indexes.stats.snapshot()
+        top = indexes.leaderboard.top(1)
+        stats["game_id"] = game_id
+        stats["highest_score"] = top[0] if top else None
+        stats["top_players"] = [
+            {**player, "best_score": indexes.leaderboard.best_score(player["player_name"])}
+            for player in indexes.stats.most_active(5)
+        ]
+        return stats
+    
+    @profiled()
+    async def get_player_stats(self, player_name: str, game_id: str = DEFAULT_GAME) -> Optional[Dict[str, Any]]:
+        """Agregado del jugador (una fila por clave primaria)"""
+        rows = await self.db.execute_query(
+            "SELECT * FROM game_players WHERE game_id = ? AND player_name = ?", (game_id, player_name)
+        )
+        return rows[0] if rows else None
+    
+    @profiled()
+    async def get_player_scores(self, player_name: str, limit: int = 20,
+                                before: Optional[tuple] = None,
+                                game_id: str = DEFAULT_GAME) -> List[Dict[str, Any]]:
+        """Historial del jugador, más reciente primero (keyset sobre timestamp, id)"""
+        query = """
+        SELECT id, player_name, score, level, timestamp FROM game_scores
+        WHERE game_id = ? AND player_name = ? COLLATE NOCASE
+        """
+        params: tuple = (game_id, player_name)
+        if before is not None:
+            query += " AND (timestamp, id) < (?, ?)"
+            params += tuple(before)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        return await self.db.execute_query(query, params + (limit,))
 
 # ===== PORTFOLIO SERVICE =====
 
@@ -295,6 +940,7 @@ class PortfolioService:
     def __init__(self):
         self.db = DatabaseService()
     
+    @profiled()
     async def get_projects(self, featured_only: bool = False) -> List[PortfolioProject]:
         """Obtiene proyectos del portfolio"""
         try:
@@ -335,6 +981,7 @@ class HealthService:
         self.db = DatabaseService()
         self.start_time = datetime.utcnow()
     
+    @profiled()
     async def get_health_status(self) -> HealthStatus:
         """Obtiene estado de salud del sistema"""
         try:
@@ -439,7 +1086,7 @@ def get_database_service() -> DatabaseService:
 # Export
 __all__ = [
     "DatabaseService", "AuthService", "ContactService", 
-    "GameService", "PortfolioService", "HealthService",
+    "GameService", "GameIndexes", "PortfolioService", "HealthService",
     "ServiceFactory",
     "get_auth_service", "get_contact_service", "get_game_service",
     "get_portfolio_service", "get_health_service", "get_database_service"
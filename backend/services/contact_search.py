@@ -0,0 +1,92 @@
+"""
+🔎 DATACRYPT LABS - CONTACT FULL-TEXT SEARCH
+Índice FTS5 de contenido externo sobre contact_messages y traducción de consultas
+Filosofía Mejora Continua: Buscar en el índice, no en el navegador
+
+- contact_messages_fts no duplica el texto (content='contact_messages'):
+  guarda solo el índice invertido; los triggers lo mantienen sincronizado
+  en la misma transacción que cada INSERT/UPDATE/DELETE.
+- Índices de prefijo de 2 y 3 caracteres: 'jua*' no recorre todo el
+  vocabulario.
+- Ranking bm25 con pesos nombre > email > mensaje (configurado en el índice).
+- La entrada del usuario nunca llega cruda a MATCH: cada término se cita
+  como frase (un email se busca como frase 'bob example com') y solo el
+  '*' final se interpreta como prefijo.
+"""
+
+import re
+from typing import Optional, Tuple
+
+SEARCH_FIELDS = ("name", "email", "message")
+SEARCH_ORDERS = ("relevance", "recent")
+MAX_TERMS = 16
+HIGHLIGHT = ("«", "»")
+
+CONTACT_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS contact_messages_fts USING fts5(
+    name, email, message,
+    content='contact_messages', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS contact_messages_fts_insert AFTER INSERT ON contact_messages BEGIN
+    INSERT INTO contact_messages_fts (rowid, name, email, message)
+    VALUES (new.id, new.name, new.email, new.message);
+END;
+CREATE TRIGGER IF NOT EXISTS contact_messages_fts_delete AFTER DELETE ON contact_messages BEGIN
+    INSERT INTO contact_messages_fts (contact_messages_fts, rowid, name, email, message)
+    VALUES ('delete', old.id, old.name, old.email, old.message);
+END;
+CREATE TRIGGER IF NOT EXISTS contact_messages_fts_update AFTER UPDATE ON contact_messages BEGIN
+    INSERT INTO contact_messages_fts (contact_messages_fts, rowid, name, email, message)
+    VALUES ('delete', old.id, old.name, old.email, old.message);
+    INSERT INTO contact_messages_fts (rowid, name, email, message)
+    VALUES (new.id, new.name, new.email, new.message);
+END;
+INSERT INTO contact_messages_fts (contact_messages_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)');
+"""
+
+# Reconstrucción para bases de datos con mensajes anteriores al índice
+CONTACT_FTS_REBUILD = "INSERT INTO contact_messages_fts (contact_messages_fts) VALUES ('rebuild')"
+
+SEARCH_QUERY = f"""
+SELECT m.id, m.name, m.email, m.timestamp,
+    highlight(contact_messages_fts, 0, '{HIGHLIGHT[0]}', '{HIGHLIGHT[1]}') AS name_highlight,
+    highlight(contact_messages_fts, 1, '{HIGHLIGHT[0]}', '{HIGHLIGHT[1]}') AS email_highlight,
+    snippet(contact_messages_fts, 2, '{HIGHLIGHT[0]}', '{HIGHLIGHT[1]}', '…', 16) AS snippet,
+    contact_messages_fts.rank AS score
+FROM contact_messages_fts
+JOIN contact_messages m ON m.id = contact_messages_fts.rowid
+WHERE contact_messages_fts MATCH ?
+"""
+
+def build_match_query(text: str, field: Optional[str] = None, prefix: bool = False) -> Optional[str]:
+    """Consulta FTS5 segura: términos en AND, '*' final = prefijo
+
+    prefix=True trata el último término como prefijo (búsqueda mientras se
+    escribe). Devuelve None si no queda ningún término buscable.
+    """
+    terms = [term for term in text.split() if re.search(r"\w", term)][:MAX_TERMS]
+    if not terms:
+        return None
+    column = f"{field} : " if field else ""
+    phrases = []
+    for position, term in enumerate(terms):
+        star = term.endswith("*") or (prefix and position == len(terms) - 1)
+        phrase = term.rstrip("*").replace('"', '""')
+        phrases.append(f'{column}"{phrase}"' + ("*" if star else ""))
+    return " AND ".join(phrases)
+
+def encode_cursor(order: str, score: float, row_id: int) -> str:
+    return f"{row_id}" if order == "recent" else f"{score!r}|{row_id}"
+
+def decode_cursor(order: str, cursor: str) -> Tuple[Optional[float], int]:
+    """(score, id) de un cursor; ValueError si está mal formado"""
+    if order == "recent":
+        return None, int(cursor)
+    score, _, row_id = cursor.partition("|")
+    return float(score), int(row_id)
+
+__all__ = [
+    "CONTACT_FTS_SCHEMA", "CONTACT_FTS_REBUILD", "SEARCH_QUERY", "SEARCH_FIELDS",
+    "SEARCH_ORDERS", "build_match_query", "encode_cursor", "decode_cursor"
+]
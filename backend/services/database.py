@@ -12,6 +12,7 @@ from contextlib import asynccontextmanager
 
 from backend.config.settings import get_settings
 from backend.utils.logger import get_logger
+from backend.utils.deadline import install_sqlite_deadline
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -30,6 +31,7 @@ class DatabaseService:
         try:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row
+            install_sqlite_deadline(conn)
             logger.debug("📡 Conexión a base de datos establecida")
             yield conn
         except Exception as e:
@@ -0,0 +1,106 @@
+"""
+🧹 DATACRYPT LABS - CONTACT DEDUPLICATION
+Rechazo barato de envíos de contacto repetidos (bots que reenvían el mismo payload)
+Filosofía Mejora Continua: Descartar en memoria antes de validar o tocar SQLite
+
+- Huella: sha256 del email normalizado + mensaje normalizado (casefold y
+  espacios colapsados), truncada a 16 bytes.
+- Primera línea: conjunto de huellas recientes en memoria con dos
+  generaciones que rotan cada `window` segundos (o al llenarse): una huella
+  se recuerda entre window y 2·window. Es exacto: sin falsos positivos que
+  rechacen a un usuario legítimo (a diferencia de un filtro Bloom).
+- Respaldo: contact_fingerprints (clave primaria = huella) se actualiza en
+  la misma transacción que el INSERT del mensaje; cubre varios workers y
+  reinicios. Si la huella existe dentro de la ventana no se guarda nada.
+- Solo se recuerda una huella después de guardar: un envío que falla (422,
+  500) se puede reintentar.
+"""
+
+import hashlib
+import time
+from typing import Any, Dict, Optional, Set
+
+from backend.utils.metrics import metrics
+
+FINGERPRINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contact_fingerprints (
+    fingerprint BLOB PRIMARY KEY,
+    last_seen TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_contact_fingerprints_last_seen ON contact_fingerprints(last_seen);
+"""
+
+# Sin filas afectadas = la huella ya se vio dentro de la ventana (last_seen >= corte)
+CLAIM_FINGERPRINT = """
+INSERT INTO contact_fingerprints (fingerprint, last_seen) VALUES (?, ?)
+ON CONFLICT(fingerprint) DO UPDATE SET last_seen = excluded.last_seen
+WHERE contact_fingerprints.last_seen < ?
+"""
+PRUNE_FINGERPRINTS = "DELETE FROM contact_fingerprints WHERE last_seen < ?"
+
+class DuplicateMessageError(Exception):
+    """El mismo email + mensaje ya se recibió dentro de la ventana"""
+
+def fingerprint(email: str, message: str) -> bytes:
+    """Huella de email + mensaje normalizados"""
+    normalized = f"{email.strip().casefold()}\x00{' '.join(message.casefold().split())}"
+    return hashlib.sha256(normalized.encode("utf-8")).digest()[:16]
+
+class RecentFingerprints:
+    """Huellas recientes en dos generaciones que rotan (memoria acotada)"""
+
+    def __init__(self, window: float = 3600.0, max_entries: int = 50_000):
+        self.window = window
+        self.max_entries = max_entries
+        self._current: Set[bytes] = set()
+        self._previous: Set[bytes] = set()
+        self._rotated_at = time.monotonic()
+        self.rotations = 0
+
+    def _rotate(self, now: float) -> None:
+        if now - self._rotated_at >= 2 * self.window:
+            self._previous = set()  # Ambas generaciones caducadas
+        else:
+            self._previous = self._current
+        self._current = set()
+        self._rotated_at = now
+        self.rotations += 1
+
+    def _maybe_rotate(self, now: Optional[float]) -> None:
+        now = time.monotonic() if now is None else now
+        if now - self._rotated_at >= self.window or len(self._current) >= self.max_entries:
+            self._rotate(now)
+
+    def check(self, value: bytes, now: Optional[float] = None) -> bool:
+        """True si la huella se vio recientemente (cuenta en las métricas)"""
+        self._maybe_rotate(now)
+        metrics.increment("contact.dedupe.checks")
+        if value in self._current or value in self._previous:
+            metrics.increment("contact.dedupe.memory_hits")
+            return True
+        return False
+
+    def remember(self, value: bytes, now: Optional[float] = None) -> None:
+        self._maybe_rotate(now)
+        self._current.add(value)
+
+    def stats(self) -> Dict[str, Any]:
+        counters = metrics.snapshot("contact.dedupe.")["counters"]
+        checks = counters.get("contact.dedupe.checks", 0)
+        memory_hits = counters.get("contact.dedupe.memory_hits", 0)
+        db_hits = counters.get("contact.dedupe.db_hits", 0)
+        return {
+            "checks": checks,
+            "memory_hits": memory_hits,
+            "db_hits": db_hits,
+            "hit_rate": round((memory_hits + db_hits) / checks, 4) if checks else 0.0,
+            "memory_hit_rate": round(memory_hits / checks, 4) if checks else 0.0,
+            "entries": len(self._current) + len(self._previous),
+            "window_seconds": self.window,
+            "rotations": self.rotations
+        }
+
+__all__ = [
+    "RecentFingerprints", "DuplicateMessageError", "fingerprint",
+    "FINGERPRINT_SCHEMA", "CLAIM_FINGERPRINT", "PRUNE_FINGERPRINTS"
+]
@@ -0,0 +1,110 @@
+"""
+📤 DATACRYPT LABS - STREAMING EXPORT
+Exportación de tablas completas en CSV o NDJSON por streaming
+Filosofía Mejora Continua: Memoria constante sea cual sea el tamaño de la tabla
+
+- Lectura keyset por id (WHERE id > ? ORDER BY id LIMIT n): cada bloque es
+  una lectura corta, así un cliente lento no mantiene abierta una
+  transacción de lectura que bloquee a los escritores (journal rollback).
+- Cada bloque se lee, se serializa y (si aplica) se comprime en un worker
+  thread; en memoria nunca hay más de un bloque.
+- gzip opcional: el stream se comprime según se genera (fichero .gz válido).
+- CSV: los textos que empiezan por = + - @ (o tab/CR) llevan un ' delante
+  para que una hoja de cálculo no los evalúe como fórmula (CSV injection).
+"""
+
+import asyncio
+import csv
+import io
+import json
+import sqlite3
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from backend.web.compression import StreamCompressor
+
+EXPORT_FORMATS = ("csv", "ndjson")
+MEDIA_TYPES = {
+    "csv": "text/csv",  # Starlette añade charset=utf-8
+    "ndjson": "application/x-ndjson",
+    "gzip": "application/gzip"
+}
+
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Tabla y columnas exportables (nunca se interpolan valores del usuario)
+EXPORT_TABLES: Dict[str, Tuple[str, ...]] = {
+    "contact_messages": ("id", "name", "email", "message", "timestamp", "ip_address", "user_agent"),
+    "game_scores": ("id", "game_id", "player_name", "score", "level", "timestamp")
+}
+
+def _batch_query(table: str, filters: Sequence[str]) -> str:
+    columns = ", ".join(EXPORT_TABLES[table])
+    where = " AND ".join(("id > ?", *filters))
+    return f"SELECT {columns} FROM {table} WHERE {where} ORDER BY id LIMIT ?"
+
+def _csv_cell(value: object) -> object:
+    """Neutraliza un texto que una hoja de cálculo interpretaría como fórmula"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _encode(rows: List[tuple], columns: Tuple[str, ...], fmt: str, header: bool) -> bytes:
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows
+        ).encode("utf-8")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+async def export_rows(db_path: str, table: str, fmt: str = "csv",
+                      filters: Sequence[Tuple[str, object]] = (),
+                      batch_size: int = 1000, compress: bool = False) -> AsyncIterator[bytes]:
+    """Bytes del export, un bloque de filas cada vez
+
+    filters son pares (condición SQL con '?', valor) fijados por el servicio.
+    """
+    columns = EXPORT_TABLES[table]
+    query = _batch_query(table, [condition for condition, _ in filters])
+    values = tuple(value for _, value in filters)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    compressor = StreamCompressor("gzip") if compress else None
+
+    def read(after: int) -> Tuple[List[tuple], bytes]:
+        rows = conn.execute(query, (after, *values, batch_size)).fetchall()
+        data = _encode(rows, columns, fmt, header=after == 0 and fmt == "csv")
+        return rows, compressor.compress(data) if compressor and data else data
+
+    try:
+        last_id = 0
+        while True:
+            rows, data = await asyncio.to_thread(read, last_id)
+            if data:
+                yield data
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1][0]
+        if compressor:
+            yield compressor.finish()
+    finally:
+        conn.close()
+
+def export_filename(name: str, fmt: str, compress: bool, now: Optional[datetime] = None) -> str:
+    stamp = (now or datetime.utcnow()).strftime("%Y%m%dT%H%M%SZ")
+    return f"{name}-{stamp}.{fmt}" + (".gz" if compress else "")
+
+def export_headers(filename: str) -> Dict[str, str]:
+    return {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no"
+    }
+
+__all__ = [
+    "export_rows", "export_filename", "export_headers",
+    "EXPORT_FORMATS", "EXPORT_TABLES", "MEDIA_TYPES"
+]
@@ -0,0 +1,187 @@
+"""
+📈 DATACRYPT LABS - INCREMENTAL GAME STATISTICS
+Estadísticas de juego mantenidas en cada inserción y leídas en O(1)
+Filosofía Mejora Continua: Calcular al escribir, no al leer
+
+- Sumas y contadores acumulados, histograma de rangos fijo.
+- Cuantiles con un sketch logarítmico (estilo DDSketch): error relativo
+  acotado, memoria O(log(max/min)) y combinable sumando cubos, así que
+  cubre todo el histórico sin guardar las puntuaciones.
+- Partidas por jugador: distribución por tramos y ranking de actividad con
+  los jugadores agrupados por número de partidas (O(1) por partida; leer el
+  top recorre solo los recuentos distintos, que son O(sqrt(partidas))).
+"""
+
+import heapq
+import math
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.services.leaderboard import player_key
+
+# Tramos de puntuación: (etiqueta, límite inferior)
+SCORE_BUCKETS = (("0-99", 0), ("100-499", 100), ("500-999", 500), ("1000-4999", 1000), ("5000+", 5000))
+# Tramos de partidas por jugador: (etiqueta, mínimo, máximo)
+GAME_COUNT_BUCKETS = (("1 game", 1, 1), ("2-5 games", 2, 5), ("6-10 games", 6, 10), ("11+ games", 11, None))
+PERCENTILES = (0.25, 0.5, 0.75, 0.9, 0.99)
+
+def score_bucket(score: int) -> str:
+    label = SCORE_BUCKETS[0][0]
+    for name, lower in SCORE_BUCKETS:
+        if score >= lower:
+            label = name
+    return label
+
+def game_count_bucket(games: int) -> Optional[str]:
+    for name, lower, upper in GAME_COUNT_BUCKETS:
+        if games >= lower and (upper is None or games <= upper):
+            return name
+    return None
+
+class QuantileSketch:
+    """Sketch de cuantiles con error relativo `accuracy` (valores >= 0)"""
+
+    def __init__(self, accuracy: float = 0.01):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    @classmethod
+    def from_buckets(cls, buckets: Dict[int, int], zeros: int = 0, accuracy: float = 0.01) -> "QuantileSketch":
+        """Reconstruye un sketch persistido (cubos guardados con key())"""
+        sketch = cls(accuracy)
+        sketch.buckets = dict(buckets)
+        sketch.zeros = zeros
+        sketch.count = zeros + sum(sketch.buckets.values())
+        return sketch
+
+    def key(self, value: float) -> int:
+        """Índice del cubo de un valor > 0"""
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        if value <= 0:
+            self.zeros += count
+            return
+        index = self.key(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Combina otro sketch con la misma precisión"""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.count += other.count
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Punto medio del cubo: error relativo <= accuracy
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class GameStats:
+    """Agregador de estadísticas de partidas (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total_games = 0
+        self.score_sum = 0
+        self.score_distribution = {name: 0 for name, _ in SCORE_BUCKETS}
+        self.sketch = QuantileSketch()
+        self.games_by_player: Dict[str, Tuple[str, int]] = {}
+        self.player_distribution = {name: 0 for name, _, _ in GAME_COUNT_BUCKETS}
+        self._by_games: Dict[int, Set[str]] = {}
+
+    def _add_score(self, score: int) -> None:
+        self.total_games += 1
+        self.score_sum += score
+        self.score_distribution[score_bucket(score)] += 1
+        self.sketch.add(score)
+
+    def _add_games(self, player_name: str, games: int) -> None:
+        key = player_key(player_name)
+        previous = self.games_by_player.get(key)
+        before = 0
+        if previous is not None:
+            before = previous[1]
+            players = self._by_games[before]
+            players.discard(key)
+            if not players:
+                del self._by_games[before]
+            self.player_distribution[game_count_bucket(before)] -= 1
+        after = before + games
+        self.games_by_player[key] = (previous[0] if previous else player_name, after)
+        self._by_games.setdefault(after, set()).add(key)
+        self.player_distribution[game_count_bucket(after)] += 1
+
+    def record(self, player_name: str, score: int) -> None:
+        """Una partida nueva"""
+        with self._lock:
+            self._add_score(score)
+            self._add_games(player_name, 1)
+
+    def record_many(self, games: Iterable[Tuple[str, int]]) -> None:
+        """Varias partidas (ingesta masiva): una actualización de ranking por jugador"""
+        with self._lock:
+            per_player: Dict[str, List[Any]] = {}
+            for player_name, score in games:
+                self._add_score(score)
+                counted = per_player.get(player_key(player_name))
+                if counted is None:
+                    per_player[player_key(player_name)] = [player_name, 1]
+                else:
+                    counted[1] += 1
+            for player_name, games_played in per_player.values():
+                self._add_games(player_name, games_played)
+
+    def load(self, scores: Iterable[int], players: Iterable[Tuple[str, int]]) -> None:
+        """Carga inicial: todas las puntuaciones y las partidas por jugador"""
+        with self._lock:
+            for score in scores:
+                self._add_score(score)
+            for player_name, games in players:
+                self._add_games(player_name, games)
+
+    def most_active(self, limit: int = 5) -> List[Dict[str, Any]]:
+        with self._lock:
+            players = []
+            for games in sorted(self._by_games, reverse=True):
+                if len(players) >= limit:
+                    break
+                for key in heapq.nsmallest(limit - len(players), self._by_games[games]):
+                    players.append({"player_name": self.games_by_player[key][0], "total_games": games})
+            return players
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total_games": self.total_games,
+                "unique_players": len(self.games_by_player),
+                "average_score": round(self.score_sum / self.total_games, 2) if self.total_games else 0,
+                "median_score": self._rounded(self.sketch.quantile(0.5)),
+                "percentiles": {
+                    f"p{int(q * 100)}": self._rounded(self.sketch.quantile(q)) for q in PERCENTILES
+                },
+                "score_distribution": dict(self.score_distribution),
+                "player_distribution": dict(self.player_distribution)
+            }
+
+    @staticmethod
+    def _rounded(value: Optional[float]) -> Optional[float]:
+        return round(value, 2) if value is not None else None
+
+__all__ = ["GameStats", "QuantileSketch", "SCORE_BUCKETS", "GAME_COUNT_BUCKETS"]
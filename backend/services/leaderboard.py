@@ -0,0 +1,304 @@
+"""
+🏆 DATACRYPT LABS - RANKED LEADERBOARD INDEX
+Índice en memoria de la mejor puntuación por jugador con consultas de rango O(log n)
+Filosofía Mejora Continua: No ordenar la tabla entera en cada petición
+
+Skip list indexable: cada enlace guarda cuántas posiciones salta, así que
+además de insertar/borrar en O(log n) se obtiene la posición de una clave
+y el elemento en la posición R en O(log n). Orden: puntuación descendente
+y, a igualdad, quien la consiguió antes (igual que ORDER BY score DESC,
+timestamp ASC).
+
+Ventanas (día y semana ISO, UTC): una tabla por día y una por semana que
+es la fusión de sus días (mejor marca por jugador). Cerrar una ventana es
+soltar su tabla: O(1), sin barrer filas.
+"""
+
+import random
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+MAX_LEVEL = 24  # ~2^24 jugadores con altura esperada O(log n)
+
+# Mayúsculas ASCII -> minúsculas: misma semántica que COLLATE NOCASE de SQLite
+_NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def player_key(player_name: str) -> str:
+    """Clave de jugador insensible a mayúsculas (como COLLATE NOCASE)"""
+    return player_name.translate(_NOCASE)
+
+class BestScore(NamedTuple):
+    """Mejor puntuación de un jugador (timestamp en ISO 8601)"""
+    player_name: str
+    score: int
+    level: int
+    timestamp: str
+
+RankKey = Tuple[int, str, str]
+
+class _Node:
+    __slots__ = ("key", "value", "next", "width")
+
+    def __init__(self, key: Optional[RankKey], value: Any, level: int):
+        self.key = key
+        self.value = value
+        self.next: List[Optional["_Node"]] = [None] * level
+        self.width = [1] * level
+
+class RankedIndex:
+    """Skip list indexable: insert/remove/rank/at en O(log n) esperado"""
+
+    def __init__(self):
+        self._head = _Node(None, None, MAX_LEVEL)
+        self._tail = _Node(None, None, MAX_LEVEL)
+        self._head.next = [self._tail] * MAX_LEVEL
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _random_level() -> int:
+        level = 1
+        while level < MAX_LEVEL and random.getrandbits(1):
+            level += 1
+        return level
+
+    def insert(self, key: RankKey, value: Any) -> int:
+        """Inserta y devuelve la posición (0 = primero)"""
+        tail = self._tail
+        chain: List[_Node] = [self._head] * MAX_LEVEL
+        steps_at = [0] * MAX_LEVEL
+        node, steps = self._head, 0
+        for level in range(MAX_LEVEL - 1, -1, -1):
+            following = node.next[level]
+            while following is not tail and following.key < key:
+                steps += node.width[level]
+                node = following
+                following = node.next[level]
+            chain[level] = node
+            steps_at[level] = steps
+
+        height = self._random_level()
+        new = _Node(key, value, height)
+        for level in range(height):
+            previous = chain[level]
+            skipped = steps - steps_at[level]
+            new.next[level] = previous.next[level]
+            new.width[level] = previous.width[level] - skipped
+            previous.next[level] = new
+            previous.width[level] = skipped + 1
+        for level in range(height, MAX_LEVEL):
+            chain[level].width[level] += 1
+        self._size += 1
+        return steps
+
+    def remove(self, key: RankKey) -> None:
+        tail = self._tail
+        chain: List[_Node] = [self._head] * MAX_LEVEL
+        node = self._head
+        for level in range(MAX_LEVEL - 1, -1, -1):
+            following = node.next[level]
+            while following is not tail and following.key < key:
+                node = following
+                following = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is tail or target.key != key:
+            raise KeyError(key)
+        for level in range(MAX_LEVEL):
+            previous = chain[level]
+            if previous.next[level] is target:
+                previous.width[level] += target.width[level] - 1
+                previous.next[level] = target.next[level]
+            else:
+                previous.width[level] -= 1
+        self._size -= 1
+
+    def index(self, key: RankKey) -> int:
+        """Posición de la clave (KeyError si no está)"""
+        tail = self._tail
+        node, steps = self._head, 0
+        for level in range(MAX_LEVEL - 1, -1, -1):
+            following = node.next[level]
+            while following is not tail and following.key < key:
+                steps += node.width[level]
+                node = following
+                following = node.next[level]
+        following = node.next[0]
+        if following is tail or following.key != key:
+            raise KeyError(key)
+        return steps
+
+    def iter_from(self, position: int) -> Iterator[Tuple[RankKey, Any]]:
+        """Recorre desde la posición dada (llegar a ella es O(log n))"""
+        if position < 0 or position >= self._size:
+            return
+        node, remaining = self._head, position + 1
+        for level in range(MAX_LEVEL - 1, -1, -1):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        tail = self._tail
+        while node is not tail:
+            yield node.key, node.value
+            node = node.next[0]
+
+class Leaderboard:
+    """Mejor puntuación por jugador sobre un RankedIndex (thread-safe)"""
+
+    def __init__(self):
+        self._index = RankedIndex()
+        self._best: Dict[str, Tuple[RankKey, BestScore]] = {}
+        self._lock = threading.Lock()
+        self.version = 0  # Sube con cada cambio: detectar cambios sin recorrer
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def submit(self, player_name: str, score: int, level: int, timestamp: str) -> bool:
+        """Registra una partida; True si cambia la mejor marca del jugador"""
+        key_name = player_key(player_name)
+        key = (-score, timestamp, key_name)
+        with self._lock:
+            current = self._best.get(key_name)
+            if current is not None:
+                if current[0] <= key:
+                    return False
+                self._index.remove(current[0])
+            entry = BestScore(player_name, score, level, timestamp)
+            self._index.insert(key, entry)
+            self._best[key_name] = (key, entry)
+            self.version += 1
+            return True
+
+    def entries(self) -> List[BestScore]:
+        """Mejores marcas en orden de ranking (para fusionar tablas)"""
+        with self._lock:
+            return [entry for _, entry in self._index.iter_from(0)]
+
+    def best_score(self, player_name: str) -> Optional[int]:
+        """Mejor marca del jugador en O(1)"""
+        current = self._best.get(player_key(player_name))
+        return current[1].score if current is not None else None
+
+    def top(self, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+        """Posiciones offset+1 .. offset+limit"""
+        with self._lock:
+            return self._slice(offset, limit)
+
+    def rank(self, player_name: str) -> Optional[Dict[str, Any]]:
+        """Posición (1 = primero) y mejor marca del jugador"""
+        with self._lock:
+            current = self._best.get(player_key(player_name))
+            if current is None:
+                return None
+            position = self._index.index(current[0])
+            return self._entry(position, current[1])
+
+    def around(self, rank: int, radius: int = 5) -> List[Dict[str, Any]]:
+        """Vecinos de la posición `rank` (1-based), radius por cada lado"""
+        with self._lock:
+            start = max(0, rank - 1 - radius)
+            return self._slice(start, rank - 1 + radius + 1 - start)
+
+    def _slice(self, start: int, count: int) -> List[Dict[str, Any]]:
+        entries = []
+        for position, (_, entry) in enumerate(self._index.iter_from(start), start):
+            if len(entries) >= count:
+                break
+            entries.append(self._entry(position, entry))
+        return entries
+
+    @staticmethod
+    def _entry(position: int, entry: BestScore) -> Dict[str, Any]:
+        return {"rank": position + 1, **entry._asdict()}
+
+WINDOWS = ("all", "day", "week")
+
+def week_of(day: date) -> Tuple[int, int]:
+    """(año ISO, semana ISO)"""
+    iso = day.isocalendar()
+    return iso[0], iso[1]
+
+def week_start(day: date) -> date:
+    """Lunes de la semana ISO del día"""
+    return day - timedelta(days=day.weekday())
+
+class WindowedLeaderboards:
+    """Tablas de la semana ISO en curso: una por día y la semana fusionada"""
+
+    def __init__(self):
+        self._days: Dict[date, Leaderboard] = {}
+        self._week: Optional[Tuple[int, int]] = None
+        self._week_board = Leaderboard()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def today() -> date:
+        return datetime.utcnow().date()
+
+    def _roll(self, today: date) -> None:
+        """Al cambiar de semana se sueltan la semana y sus días"""
+        current = week_of(today)
+        if current != self._week:
+            self._week = current
+            self._days = {}
+            self._week_board = Leaderboard()
+
+    def submit(self, player_name: str, score: int, level: int, timestamp: str,
+               today: Optional[date] = None) -> bool:
+        """Registra la partida en su día y su semana si caen en la semana en curso"""
+        day = date.fromisoformat(timestamp[:10])
+        today = today or self.today()
+        with self._lock:
+            self._roll(today)
+            if week_of(day) != self._week:
+                return False
+            board = self._days.get(day)
+            if board is None:
+                board = self._days[day] = Leaderboard()
+            week_board = self._week_board
+        board.submit(player_name, score, level, timestamp)
+        return week_board.submit(player_name, score, level, timestamp)
+
+    def load(self, rows, today: Optional[date] = None) -> None:
+        """Carga inicial: reparte por días y construye la semana fusionando los días"""
+        today = today or self.today()
+        with self._lock:
+            self._roll(today)
+            for player_name, score, level, timestamp in rows:
+                day = date.fromisoformat(timestamp[:10])
+                if week_of(day) != self._week:
+                    continue
+                board = self._days.get(day)
+                if board is None:
+                    board = self._days[day] = Leaderboard()
+                board.submit(player_name, score, level, timestamp)
+            for board in self._days.values():
+                for entry in board.entries():
+                    self._week_board.submit(*entry)
+
+    def board(self, window: str, today: Optional[date] = None) -> Leaderboard:
+        """Tabla de la ventana en curso ('day' o 'week')"""
+        today = today or self.today()
+        with self._lock:
+            self._roll(today)
+            if window == "week":
+                return self._week_board
+            return self._days.get(today) or Leaderboard()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "week": "%d-W%02d" % self._week if self._week else None,
+                "days": {day.isoformat(): len(board) for day, board in sorted(self._days.items())},
+                "week_players": len(self._week_board)
+            }
+
+__all__ = [
+    "Leaderboard", "RankedIndex", "BestScore", "WindowedLeaderboards",
+    "player_key", "week_of", "week_start", "WINDOWS"
+]
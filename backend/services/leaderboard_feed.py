@@ -0,0 +1,138 @@
+"""
+📣 DATACRYPT LABS - LIVE LEADERBOARD FEED
+Top-K de la tabla por Server-Sent Events: snapshot inicial y después diffs
+Filosofía Mejora Continua: Calcular una vez por tick, repartir a todos
+
+- Un productor por ventana (all/day/week) que vive mientras tenga
+  suscriptores. Cada tick mira la versión de la tabla: si no cambió no hace
+  nada; si cambió lee el top-K una vez (O(log n + K)) y lo compara con el
+  anterior.
+- Los diffs son {clave de jugador: entrada}: solo las entradas cuya
+  posición o marca cambió; quien sale del top-K va con rank None.
+- Las ráfagas de save_score entre dos ticks se funden en un único frame.
+  Reutiliza el buzón de backend.web.live: un cliente lento recibe el estado
+  neto fusionado y, si no drena, se le desconecta (reconecta con snapshot).
+- `refresh` (opcional) se espera antes de cada tick: la tabla se pone al
+  día con lo escrito por otros workers antes de leer el top-K.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set
+
+from backend.services.leaderboard import Leaderboard, player_key
+from backend.web.live import Subscriber, format_event
+
+class LeaderboardFeed:
+    """Productor único del top-K de una tabla con fan-out a N suscriptores"""
+
+    def __init__(self, source: Callable[[], Leaderboard], window: str = "all", size: int = 10,
+                 interval: float = 1.0, max_missed: int = 30, heartbeat: float = 15.0,
+                 refresh: Optional[Callable[[], Awaitable[None]]] = None):
+        self.source = source
+        self.refresh = refresh
+        self.window = window
+        self.size = size
+        self.interval = interval
+        self.max_missed = max_missed
+        self.heartbeat = heartbeat
+        self.subscribers: Set[Subscriber] = set()
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.ticks = 0
+        self.computations = 0
+        self.frames = 0
+        self._seen: Optional[tuple] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def compute(self) -> Dict[str, Any]:
+        """Diff del top-K respecto al tick anterior (vacío si la tabla no cambió)"""
+        board = self.source()
+        marker = (id(board), board.version)
+        if marker == self._seen:
+            return {}
+        self._seen = marker
+        self.computations += 1
+        top = {player_key(entry["player_name"]): entry for entry in board.top(self.size)}
+        delta: Dict[str, Any] = {key: entry for key, entry in top.items() if self.state.get(key) != entry}
+        for key in self.state.keys() - top.keys():
+            delta[key] = {"player_name": self.state[key]["player_name"], "rank": None}
+        self.state = top
+        return delta
+
+    def tick(self) -> None:
+        """Un cálculo y, si hay cambios, un frame para todos los suscriptores"""
+        self.ticks += 1
+        delta = self.compute()
+        if not delta:
+            return
+        self.frames += 1
+        for subscriber in list(self.subscribers):
+            subscriber.offer(delta, self.max_missed)
+            if subscriber.closed:
+                self.subscribers.discard(subscriber)
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber()
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._produce())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+        subscriber.close()
+
+    async def _produce(self) -> None:
+        """Bucle del productor: vive mientras haya suscriptores"""
+        while self.subscribers:
+            if self.refresh is not None:
+                await self.refresh()
+            self.tick()
+            await asyncio.sleep(self.interval)
+        self.state = {}  # Sin suscriptores el estado queda obsoleto
+        self._seen = None
+        self._task = None
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Eventos SSE: snapshot del top-K y después diffs"""
+        subscriber = self.subscribe()
+        try:
+            if self._seen is None:
+                self.tick()
+            subscriber.take()  # El snapshot ya incluye lo pendiente
+            yield format_event("snapshot", {
+                "window": self.window,
+                "size": self.size,
+                "entries": sorted(self.state.values(), key=lambda entry: entry["rank"])
+            })
+            while not subscriber.closed:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscriber.closed:
+                    break
+                changes = subscriber.take()
+                yield format_event("diff", {
+                    "window": self.window,
+                    "updated": sorted(
+                        (entry for entry in changes.values() if entry["rank"] is not None),
+                        key=lambda entry: entry["rank"]
+                    ),
+                    "removed": [entry["player_name"] for entry in changes.values() if entry["rank"] is None]
+                })
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "subscribers": len(self.subscribers),
+            "ticks": self.ticks,
+            "computations": self.computations,
+            "frames": self.frames,
+            "interval": self.interval,
+            "producer_running": self._task is not None and not self._task.done()
+        }
+
+__all__ = ["LeaderboardFeed"]
@@ -15,6 +15,8 @@ from datetime import datetime
 
 from backend.config.settings import get_settings
 from backend.utils.logger import get_logger
+from backend.utils.profiler import profiled
+from backend.utils.memory import register_cache
 from backend.models import MLModelType, MLPredictionRequest, MLTrainingRequest
 
 settings = get_settings()
@@ -26,8 +28,11 @@ class MLService:
     def __init__(self):
         self.models = {}
         self.model_metadata = {}
+        register_cache("ml.models", lambda: self.models)
+        register_cache("ml.model_metadata", lambda: self.model_metadata)
         logger.info("🤖 MLService inicializado")
     
+    @profiled()
     async def train_model(self, request: MLTrainingRequest) -> Dict[str, Any]:
         """Entrenar un modelo de ML"""
         try:
@@ -89,6 +94,7 @@ class MLService:
             logger.error(f"❌ Error entrenando modelo: {e}")
             raise
     
+    @profiled()
     async def predict(self, request: MLPredictionRequest) -> Dict[str, Any]:
         """Hacer predicciones con modelo entrenado"""
         try:
@@ -130,6 +136,7 @@ class MLService:
         """Listar todos los modelos disponibles"""
         return list(self.model_metadata.values())
     
+    @profiled()
     async def analyze_data(self, data: List[List[float]]) -> Dict[str, Any]:
         """Análisis estadístico de datos"""
         try:
@@ -0,0 +1,84 @@
+"""
+📮 DATACRYPT LABS - NOTIFICATION OUTBOX
+Tabla outbox de notificaciones escrita en la misma transacción que el mensaje
+Filosofía Mejora Continua: El request guarda, un dispatcher en segundo plano avisa
+
+- La fila de notification_outbox se inserta junto al mensaje de contacto:
+  si el mensaje se guarda, su notificación también (y viceversa). Ninguna
+  llamada SMTP/webhook añade latencia al request.
+- Estados: pending -> sending -> delivered | pending (reintento con
+  next_attempt_at) | failed (agotó los intentos).
+- Reclamar es un UPDATE ... RETURNING con lease: varios workers pueden
+  despachar sin entregar dos veces, y una fila 'sending' de un worker caído
+  vuelve a estar disponible cuando vence su lease.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+OUTBOX_STATUSES = ("pending", "sending", "delivered", "failed")
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    next_attempt_at TEXT NOT NULL,
+    claimed_until TEXT,
+    delivered_at TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_notification_outbox_due ON notification_outbox(status, next_attempt_at);
+"""
+
+ENQUEUE_NOTIFICATION = """
+INSERT INTO notification_outbox (kind, payload, created_at, next_attempt_at) VALUES (?, ?, ?, ?)
+"""
+
+# Pendientes vencidas y 'sending' con lease caducado, en orden de llegada
+CLAIM_NOTIFICATIONS = """
+UPDATE notification_outbox SET status = 'sending', claimed_until = ?
+WHERE id IN (
+    SELECT id FROM notification_outbox
+    WHERE (status = 'pending' AND next_attempt_at <= ?)
+       OR (status = 'sending' AND claimed_until <= ?)
+    ORDER BY id LIMIT ?
+)
+RETURNING id, kind, payload, attempts, created_at
+"""
+
+MARK_DELIVERED = """
+UPDATE notification_outbox
+SET status = 'delivered', attempts = attempts + 1, delivered_at = ?, claimed_until = NULL, last_error = NULL
+WHERE id = ?
+"""
+
+MARK_RETRY = """
+UPDATE notification_outbox
+SET status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END,
+    attempts = attempts + 1, next_attempt_at = ?, claimed_until = NULL, last_error = ?
+WHERE id = ?
+"""
+
+OUTBOX_COUNTS = "SELECT status, COUNT(*) AS count FROM notification_outbox GROUP BY status"
+
+def contact_notification(message_id: int, name: str, email: str, message: str, timestamp: str) -> tuple:
+    """Parámetros de ENQUEUE_NOTIFICATION para un mensaje de contacto nuevo"""
+    now = datetime.utcnow().isoformat()
+    payload: Dict[str, Any] = {
+        "message_id": message_id,
+        "name": name,
+        "email": email,
+        "message": message,
+        "timestamp": timestamp
+    }
+    return ("contact_message", json.dumps(payload, ensure_ascii=False), now, now)
+
+__all__ = [
+    "OUTBOX_SCHEMA", "OUTBOX_STATUSES", "ENQUEUE_NOTIFICATION", "CLAIM_NOTIFICATIONS",
+    "MARK_DELIVERED", "MARK_RETRY", "OUTBOX_COUNTS", "contact_notification"
+]
@@ -0,0 +1,177 @@
+"""
+📥 DATACRYPT LABS - BULK SCORE INGESTION
+Lectura incremental de lotes de puntuaciones en NDJSON o array JSON
+Filosofía Mejora Continua: Un commit por bloque, no por partida
+
+- El body se decodifica según llega: nunca se materializa la lista entera,
+  la memoria depende del tamaño de bloque, no del lote.
+- NDJSON: una fila por línea; una línea con JSON inválido es un error de esa
+  fila y se sigue con la siguiente.
+- Array JSON: se decodifica elemento a elemento con raw_decode. Un error de
+  sintaxis dentro del array es fatal (no hay forma fiable de resincronizar);
+  las filas anteriores ya escritas se conservan.
+- Cada fila se valida con el modelo GameScore; los errores se devuelven por
+  número de fila (1-based) hasta un máximo, con recuento total.
+"""
+
+import codecs
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from backend.models import GameScore
+
+MAX_ROW_CHARS = 64 * 1024  # Una fila más larga que esto es un body malformado
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+Row = Tuple[int, Any, Optional[str]]  # (número de fila, valor, error)
+
+class IngestError(ValueError):
+    """Error fatal del lote: el resto del body no se puede leer"""
+
+async def iter_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    """Filas del body (NDJSON o array JSON, detectado por el primer carácter)"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    mode: Optional[str] = None
+    row = 0
+    position = 0
+    expect_value = True
+    closed = False
+
+    async def more() -> bool:
+        nonlocal buffer, position
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            try:
+                text = decoder.decode(chunk)
+            except UnicodeDecodeError as e:
+                raise IngestError(f"Body is not valid UTF-8 after row {row}: {e.reason}")
+            buffer = buffer[position:] + text
+            position = 0
+            return True
+        buffer = buffer[position:] + decoder.decode(b"", final=True)
+        position = 0
+        return False
+
+    eof = not await more()
+    while mode is None:
+        stripped = buffer.lstrip(_WHITESPACE)
+        if stripped:
+            mode = "array" if stripped[0] == "[" else "ndjson"
+            position = len(buffer) - len(stripped) + (1 if mode == "array" else 0)
+        elif eof:
+            return
+        else:
+            eof = not await more()
+
+    if mode == "ndjson":
+        while True:
+            end = buffer.find("\n", position)
+            if end < 0:
+                if len(buffer) - position > MAX_ROW_CHARS:
+                    raise IngestError(f"Row {row + 1} exceeds {MAX_ROW_CHARS} characters")
+                if eof:
+                    end = len(buffer)
+                    if end <= position:
+                        return
+                else:
+                    eof = not await more()
+                    continue
+            line = buffer[position:end].strip(_WHITESPACE)
+            position = end + 1
+            if not line:
+                continue
+            row += 1
+            try:
+                yield row, json.loads(line), None
+            except ValueError as e:
+                yield row, None, f"Invalid JSON: {e}"
+
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                if closed:
+                    return
+                raise IngestError(f"Unterminated JSON array after row {row}")
+            eof = not await more()
+            continue
+        char = buffer[position]
+        if closed:
+            raise IngestError(f"Unexpected data after the JSON array at row {row}")
+        if char == "]" and (not expect_value or row == 0):
+            closed = True
+            position += 1
+            continue
+        if not expect_value:
+            if char != ",":
+                raise IngestError(f"Expected ',' or ']' after row {row}")
+            expect_value = True
+            position += 1
+            continue
+        try:
+            value, end = _decoder.raw_decode(buffer, position)
+        except ValueError as e:
+            if eof or len(buffer) - position > MAX_ROW_CHARS:
+                raise IngestError(f"Invalid JSON at row {row + 1}: {e}")
+            eof = not await more()
+            continue
+        if end == len(buffer) and not eof:
+            eof = not await more()  # Un número puede continuar en el siguiente bloque
+            continue
+        position = end
+        expect_value = False
+        row += 1
+        yield row, value, None
+
+def parse_score(value: Any) -> Tuple[Optional[GameScore], Optional[str]]:
+    """Valida una fila con GameScore; devuelve (puntuación, error)"""
+    if not isinstance(value, dict):
+        return None, "Row must be a JSON object"
+    try:
+        return GameScore.model_validate(value), None
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in e.errors()
+        )
+
+class IngestReport:
+    """Resumen del lote con los primeros errores por fila"""
+
+    def __init__(self, max_errors: int = 100):
+        self.max_errors = max_errors
+        self.received = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.chunks = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.fatal: Optional[str] = None
+        self.started = time.perf_counter()
+
+    def reject(self, row: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": error})
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "rejected": self.rejected,
+            "chunks": self.chunks,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.rejected > len(self.errors),
+            "fatal_error": self.fatal,
+            "duration_ms": round(elapsed * 1000, 2),
+            "rows_per_second": round(self.inserted / elapsed) if elapsed > 0 else None
+        }
+
+__all__ = ["iter_rows", "parse_score", "IngestReport", "IngestError", "MAX_ROW_CHARS"]
@@ -4,8 +4,13 @@ Utilidades compartidas del sistema
 """
 
 from .logger import logger, api_logger, auth_logger, ml_logger, db_logger, security_logger, get_logger, log_performance
+from .metrics import metrics, MetricsRegistry
+from .profiler import profiler, profiled, FunctionProfiler
+from .memory import memory_profiler, register_cache
 
 __all__ = [
     "logger", "api_logger", "auth_logger", "ml_logger", 
-    "db_logger", "security_logger", "get_logger", "log_performance"
+    "db_logger", "security_logger", "get_logger", "log_performance",
+    "metrics", "MetricsRegistry", "profiler", "profiled", "FunctionProfiler",
+    "memory_profiler", "register_cache"
 ]
\ No newline at end of file
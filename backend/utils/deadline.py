@@ -0,0 +1,54 @@
+"""
+⏱️ DATACRYPT LABS - REQUEST DEADLINES
+Deadline por request propagado con contextvars
+Filosofía Mejora Continua: Ningún handler corre indefinidamente
+"""
+
+import contextvars
+import sqlite3
+import time
+from typing import Optional
+
+class Deadline:
+    """Deadline monotónico de un request (mutable para poder levantarlo)"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Segundos restantes (negativo si ya expiró)"""
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        """Indica si el deadline ya pasó"""
+        return time.monotonic() >= self.expires_at
+
+    def lift(self) -> None:
+        """Levanta el deadline (p.ej. cuando la respuesta ya empezó)"""
+        self.expires_at = float("inf")
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "datacrypt_request_deadline", default=None
+)
+
+def set_deadline(deadline: Optional[Deadline]) -> contextvars.Token:
+    """Activa un deadline en el contexto actual"""
+    return _current_deadline.set(deadline)
+
+def reset_deadline(token: contextvars.Token) -> None:
+    """Restaura el deadline anterior"""
+    _current_deadline.reset(token)
+
+def install_sqlite_deadline(conn: sqlite3.Connection, n_instructions: int = 1000) -> None:
+    """Interrumpe queries SQLite cuando expira el deadline del request
+
+    El progress handler corre dentro de la VM de SQLite; devolver un valor
+    distinto de cero aborta la sentencia con OperationalError('interrupted').
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return
+    conn.set_progress_handler(lambda: 1 if deadline.expired() else 0, n_instructions)
+
+__all__ = ["Deadline", "set_deadline", "reset_deadline", "install_sqlite_deadline"]
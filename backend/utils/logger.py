@@ -42,6 +42,14 @@ class StructuredFormatter(logging.Formatter):
             
         return json.dumps(log_data, ensure_ascii=False)
 
+class RequestIdFilter(logging.Filter):
+    """Garantiza el atributo request_id ("-" si el log no lo trae)"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = "-"
+        return True
+
 class DataCryptLogger:
     """Logger centralizado para DataCrypt Labs"""
     
@@ -88,11 +96,13 @@ class DataCryptLogger:
             if settings.is_production:
                 file_handler.setFormatter(StructuredFormatter())
             else:
+                # request_id en el fichero para el índice de logs (backend/web/logs)
                 file_format = logging.Formatter(
-                    "%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(funcName)s:%(lineno)d - %(message)s",
+                    "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(module)s:%(funcName)s:%(lineno)d - %(message)s",
                     datefmt="%Y-%m-%d %H:%M:%S"
                 )
                 file_handler.setFormatter(file_format)
+                file_handler.addFilter(RequestIdFilter())
             
             self.logger.addHandler(file_handler)
             
@@ -145,76 +155,51 @@ def get_logger(name: str) -> DataCryptLogger:
 
 # Performance logging decorator
 def log_performance(logger_instance: DataCryptLogger = logger):
-    """Decorator para medir performance de funciones"""
+    """Decorator para medir performance de funciones
+
+    Los tiempos se agregan en el profiler en memoria (backend.utils.profiler);
+    solo los fallos generan una línea de log.
+    """
     def decorator(func):
-        import time
         import functools
-        
+        from .profiler import profiler
+
+        timed = profiler.wrap(func, func.__qualname__)
+
+        def log_failure(e: Exception):
+            logger_instance.error(
+                f"Function {func.__name__} failed",
+                extra_data={
+                    "function": func.__name__,
+                    "status": "error",
+                    "error": str(e)
+                },
+                exc_info=True
+            )
+
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
             try:
-                result = await func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                logger_instance.info(
-                    f"Function {func.__name__} completed",
-                    extra_data={
-                        "function": func.__name__,
-                        "execution_time_ms": round(execution_time * 1000, 2),
-                        "status": "success"
-                    }
-                )
-                return result
+                return await timed(*args, **kwargs)
             except Exception as e:
-                execution_time = time.time() - start_time
-                logger_instance.error(
-                    f"Function {func.__name__} failed",
-                    extra_data={
-                        "function": func.__name__,
-                        "execution_time_ms": round(execution_time * 1000, 2),
-                        "status": "error",
-                        "error": str(e)
-                    },
-                    exc_info=True
-                )
+                log_failure(e)
                 raise
-        
+
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
             try:
-                result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                logger_instance.info(
-                    f"Function {func.__name__} completed",
-                    extra_data={
-                        "function": func.__name__,
-                        "execution_time_ms": round(execution_time * 1000, 2),
-                        "status": "success"
-                    }
-                )
-                return result
+                return timed(*args, **kwargs)
             except Exception as e:
-                execution_time = time.time() - start_time
-                logger_instance.error(
-                    f"Function {func.__name__} failed",
-                    extra_data={
-                        "function": func.__name__,
-                        "execution_time_ms": round(execution_time * 1000, 2),
-                        "status": "error",
-                        "error": str(e)
-                    },
-                    exc_info=True
-                )
+                log_failure(e)
                 raise
-        
+
         # Detectar si la función es async
         import asyncio
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
         else:
             return sync_wrapper
-    
+
     return decorator
 
 # Export para importación fácil
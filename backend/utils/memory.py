@@ -0,0 +1,193 @@
+"""
+🧠 DATACRYPT LABS - MEMORY INTROSPECTION
+tracemalloc bajo demanda, snapshots con nombre y tamaño de las cachés del proceso
+Filosofía Mejora Continua: Demostrar la fuga antes de arreglarla
+
+- Apagado por defecto: tracemalloc solo se activa desde el admin (su coste
+  es por asignación mientras traza). En reposo el módulo es un dict de
+  getters de cachés.
+- Snapshots con nombre (acotados) y diffs top-N agrupados por fichero o
+  línea, excluyendo el propio tracemalloc y el import system.
+- Recuento de objetos por tipo (gc.get_objects, bajo demanda).
+- Registro de cachés en proceso: cada componente registra un getter y el
+  informe da entradas y tamaño aproximado (contenedor + claves + valores).
+"""
+
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_SNAPSHOTS = 10
+GROUP_BY = ("lineno", "filename", "traceback")
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+def approximate_size(obj: Any) -> int:
+    """Tamaño del contenedor + claves + valores (+ elementos de valores list/tuple/set)"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        items = list(obj.items())
+        for key, value in items:
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+            if isinstance(value, (list, tuple, set, frozenset)):
+                size += sum(sys.getsizeof(item) for item in value)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in list(obj))
+    return size
+
+class MemoryProfiler:
+    """Control de tracemalloc + registro de cachés en proceso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.caches: Dict[str, Callable[[], Any]] = {}
+
+    # ===== TRACEMALLOC =====
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        """Activa tracemalloc (frames > 1 permite agrupar por traceback)"""
+        if not self.tracing:
+            tracemalloc.start(max(1, min(frames, 25)))
+
+    def stop(self) -> None:
+        """Desactiva tracemalloc y libera sus trazas y snapshots"""
+        with self._lock:
+            self.snapshots.clear()
+        if self.tracing:
+            tracemalloc.stop()
+
+    def take_snapshot(self, name: str) -> Dict[str, Any]:
+        """Snapshot con nombre (se descartan los más antiguos)"""
+        if not self.tracing:
+            raise ValueError("tracemalloc is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+        entry = {
+            "name": name,
+            "taken_at": time.time(),
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "snapshot": snapshot
+        }
+        with self._lock:
+            self.snapshots.pop(name, None)
+            self.snapshots[name] = entry
+            while len(self.snapshots) > MAX_SNAPSHOTS:
+                self.snapshots.popitem(last=False)
+        return self._describe(entry)
+
+    def diff(self, base: str, target: Optional[str] = None, limit: int = 20,
+             group_by: str = "lineno") -> List[Dict[str, Any]]:
+        """Top-N de diferencias entre dos snapshots (target=None: estado actual)"""
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        with self._lock:
+            if base not in self.snapshots:
+                raise KeyError(base)
+            if target is not None and target not in self.snapshots:
+                raise KeyError(target)
+            old = self.snapshots[base]["snapshot"]
+            new = self.snapshots[target]["snapshot"] if target is not None else None
+        if new is None:
+            if not self.tracing:
+                raise ValueError("tracemalloc is not running")
+            new = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        return [
+            {
+                "location": self._location(stat.traceback, group_by),
+                "size_diff_kb": round(stat.size_diff / 1024, 2),
+                "count_diff": stat.count_diff,
+                "size_kb": round(stat.size / 1024, 2),
+                "count": stat.count
+            }
+            for stat in new.compare_to(old, group_by)[:limit]
+        ]
+
+    def top(self, limit: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+        """Top-N de memoria trazada ahora mismo"""
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        if not self.tracing:
+            raise ValueError("tracemalloc is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        return [
+            {
+                "location": self._location(stat.traceback, group_by),
+                "size_kb": round(stat.size / 1024, 2),
+                "count": stat.count
+            }
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+    @staticmethod
+    def _location(traceback: tracemalloc.Traceback, group_by: str) -> str:
+        frame = traceback[0]
+        if group_by == "filename":
+            return frame.filename
+        if group_by == "traceback":
+            return " <- ".join(f"{f.filename}:{f.lineno}" for f in traceback)
+        return f"{frame.filename}:{frame.lineno}"
+
+    @staticmethod
+    def _describe(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in entry.items() if key != "snapshot"}
+
+    # ===== OBJECTS & CACHES =====
+
+    @staticmethod
+    def object_counts(limit: int = 30) -> List[Dict[str, Any]]:
+        """Objetos vivos por tipo (recorre todo el heap gc: solo bajo demanda)"""
+        counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+        return [{"type": name, "count": count} for name, count in counts.most_common(limit)]
+
+    def register_cache(self, name: str, getter: Callable[[], Any]) -> None:
+        """Registra una caché; getter devuelve el contenedor actual"""
+        self.caches[name] = getter
+
+    def cache_sizes(self) -> Dict[str, Dict[str, Any]]:
+        report = {}
+        for name, getter in list(self.caches.items()):
+            try:
+                container = getter()
+                report[name] = {
+                    "entries": len(container),
+                    "approx_kb": round(approximate_size(container) / 1024, 2)
+                }
+            except Exception as e:
+                report[name] = {"error": str(e)}
+        return report
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        with self._lock:
+            snapshots = [self._describe(entry) for entry in self.snapshots.values()]
+        return {
+            "tracing": self.tracing,
+            "traceback_frames": tracemalloc.get_traceback_limit() if self.tracing else None,
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "snapshots": snapshots,
+            "caches": self.cache_sizes()
+        }
+
+# Instancia global (tracemalloc apagado hasta que el admin lo active)
+memory_profiler = MemoryProfiler()
+
+def register_cache(name: str, getter: Callable[[], Any]) -> None:
+    """Atajo: registra una caché en el perfilador de memoria global"""
+    memory_profiler.register_cache(name, getter)
+
+__all__ = ["MemoryProfiler", "memory_profiler", "register_cache", "approximate_size"]
@@ -0,0 +1,55 @@
+"""
+📈 DATACRYPT LABS - METRICS REGISTRY
+Registro en memoria de contadores y gauges del proceso
+Filosofía Mejora Continua: Medir antes de optimizar
+"""
+
+import threading
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+class MetricsRegistry:
+    """Registro thread-safe de contadores y gauges"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Number] = {}
+        self._gauges: Dict[str, Number] = {}
+
+    def increment(self, name: str, value: Number = 1) -> None:
+        """Incrementa un contador"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: Number) -> None:
+        """Fija el valor actual de un gauge"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str, default: Number = 0) -> Number:
+        """Obtiene el valor de un contador o gauge"""
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name]
+            return self._gauges.get(name, default)
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Dict[str, Number]]:
+        """Copia consistente de las métricas (opcionalmente filtradas por prefijo)"""
+        with self._lock:
+            return {
+                "counters": {k: v for k, v in self._counters.items() if k.startswith(prefix)},
+                "gauges": {k: v for k, v in self._gauges.items() if k.startswith(prefix)}
+            }
+
+    def reset(self, prefix: str = "") -> None:
+        """Reinicia las métricas que empiezan por el prefijo"""
+        with self._lock:
+            for store in (self._counters, self._gauges):
+                for key in [k for k in store if k.startswith(prefix)]:
+                    del store[key]
+
+# Instancia global de métricas
+metrics = MetricsRegistry()
+
+__all__ = ["MetricsRegistry", "metrics"]
@@ -0,0 +1,195 @@
+"""
+⏱️ DATACRYPT LABS - FUNCTION PROFILER
+Registro en memoria de tiempos por función: llamadas, tiempo total/propio y cuantiles
+Filosofía Mejora Continua: Distribuciones en lugar de una línea de log por llamada
+
+- Sin I/O en el camino caliente: cada llamada solo actualiza contadores.
+- Tiempo propio (self) = tiempo total menos el de las funciones perfiladas
+  anidadas; la pila vive en un contextvar, así que funciona igual en
+  corutinas y en threads. Con hijos concurrentes (gather) es aproximado.
+- Muestreo: la decisión se toma en la llamada raíz y la heredan las
+  anidadas, para que total y self sean coherentes dentro de un muestreo.
+- Cuantiles p50/p90/p99 sobre un reservoir acotado por función.
+- Activable y con tasa de muestreo ajustables en caliente.
+"""
+
+import asyncio
+import contextvars
+import functools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+RESERVOIR_SIZE = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+class FunctionStats:
+    """Acumulados de una función perfilada"""
+
+    __slots__ = ("name", "calls", "sampled", "errors", "total", "self_time", "min", "max", "reservoir")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.sampled = 0
+        self.errors = 0
+        self.total = 0.0
+        self.self_time = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.reservoir: List[float] = []
+
+    def record(self, elapsed: float, self_time: float) -> None:
+        self.sampled += 1
+        self.total += elapsed
+        self.self_time += self_time
+        self.min = min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+        # Reservoir sampling (algoritmo R): muestra uniforme de tamaño fijo
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(elapsed)
+        else:
+            slot = random.randrange(self.sampled)
+            if slot < RESERVOIR_SIZE:
+                self.reservoir[slot] = elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.reservoir)
+        quantiles = {
+            f"p{int(q * 100)}_ms": round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+            for q in QUANTILES
+        } if ordered else {f"p{int(q * 100)}_ms": None for q in QUANTILES}
+        return {
+            "function": self.name,
+            "calls": self.calls,
+            "sampled": self.sampled,
+            "errors": self.errors,
+            "total_ms": round(self.total * 1000, 3),
+            "self_ms": round(self.self_time * 1000, 3),
+            "mean_ms": round(self.total / self.sampled * 1000, 3) if self.sampled else None,
+            "min_ms": round(self.min * 1000, 3) if self.sampled else None,
+            "max_ms": round(self.max * 1000, 3) if self.sampled else None,
+            **quantiles
+        }
+
+class _Frame:
+    """Llamada perfilada en curso (nodo de la pila del contexto)"""
+
+    __slots__ = ("sampled", "start", "child")
+
+    def __init__(self, sampled: bool):
+        self.sampled = sampled
+        self.start = time.perf_counter() if sampled else 0.0
+        self.child = 0.0
+
+_current_frame: contextvars.ContextVar[Optional[_Frame]] = contextvars.ContextVar("profiler_frame", default=None)
+
+class FunctionProfiler:
+    """Registro thread-safe de estadísticas por función"""
+
+    def __init__(self, enabled: bool = True, sample_rate: float = 1.0):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, FunctionStats] = {}
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None) -> None:
+        """Cambia estado y tasa de muestreo en caliente"""
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError("sample_rate must be between 0 and 1")
+            self.sample_rate = sample_rate
+        if enabled is not None:
+            self.enabled = enabled
+
+    def _enter(self) -> Tuple[_Frame, contextvars.Token]:
+        parent = _current_frame.get()
+        if parent is None:
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        else:
+            sampled = parent.sampled
+        frame = _Frame(sampled)
+        return frame, _current_frame.set(frame)
+
+    def _exit(self, name: str, frame: _Frame, token: contextvars.Token, failed: bool) -> None:
+        _current_frame.reset(token)
+        elapsed = 0.0
+        if frame.sampled:
+            elapsed = time.perf_counter() - frame.start
+            parent = _current_frame.get()
+            if parent is not None:
+                parent.child += elapsed
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = FunctionStats(name)
+            stats.calls += 1
+            if failed:
+                stats.errors += 1
+            if frame.sampled:
+                stats.record(elapsed, max(0.0, elapsed - frame.child))
+
+    def wrap(self, func: Callable, name: Optional[str] = None) -> Callable:
+        """Envuelve una función sync o async; desactivado cuesta un if"""
+        name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return await func(*args, **kwargs)
+                frame, token = self._enter()
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._exit(name, frame, token, failed)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            frame, token = self._enter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self._exit(name, frame, token, failed)
+        return sync_wrapper
+
+    def snapshot(self, sort: str = "total_ms", limit: Optional[int] = None) -> Dict[str, Any]:
+        """Estadísticas ordenadas (total_ms, self_ms, calls, p99_ms...)"""
+        with self._lock:
+            functions = [stats.to_dict() for stats in self._stats.values()]
+        functions.sort(key=lambda entry: entry.get(sort) or 0, reverse=True)
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "since": self.started_at,
+            "functions": functions[:limit] if limit else functions
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+# Instancia global del profiler
+profiler = FunctionProfiler(settings.profiler_enabled, settings.profiler_sample_rate)
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator: registra la función en el profiler global"""
+    def decorator(func: Callable) -> Callable:
+        return profiler.wrap(func, name)
+    return decorator
+
+__all__ = ["FunctionProfiler", "FunctionStats", "profiler", "profiled"]
@@ -0,0 +1,21 @@
+"""
+🌐 DATACRYPT LABS - WEB DELIVERY
+Utilidades HTTP compartidas por main_admin.py y el backend modular
+Filosofía Mejora Continua: Servir menos bytes, más rápido
+
+Este paquete no importa backend.config: main_admin.py lo usa sin cargar
+la configuración del sistema modular.
+"""
+
+from .compression import CompressionMiddleware, compress_bytes, negotiate_encoding
+from .static import PrecompressedStaticFiles, AssetStaticFiles, precompress_directory
+from .assets import AssetBuilder, build_assets
+from .documents import DocumentResponse, DocumentStore
+from .templates import TemplateCache
+
+__all__ = [
+    "CompressionMiddleware", "compress_bytes", "negotiate_encoding",
+    "PrecompressedStaticFiles", "AssetStaticFiles", "precompress_directory",
+    "AssetBuilder", "build_assets", "DocumentResponse", "DocumentStore",
+    "TemplateCache"
+]
@@ -0,0 +1,347 @@
+"""
+🏗️ DATACRYPT LABS - STATIC ASSET BUILD
+Minificación, bundling y nombres con hash de contenido para CSS/JS
+Filosofía Mejora Continua: Cachear para siempre lo que nunca cambia
+
+Uso como paso de build:
+    python -m backend.web.assets [raíz] [directorio_salida]
+
+Genera en <salida>/ una copia de cada página HTML con las referencias
+reescritas, los assets en <salida>/assets/build/<nombre>.<hash>.<ext> y
+<salida>/asset-manifest.json. La salida se sirve superpuesta a la raíz
+(ver AssetStaticFiles), así imágenes y PDFs siguen resolviéndose igual.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .static import HASH_LENGTH, HASHED_NAME_RE, SKIP_DIRS
+
+BUILD_DIR_NAME = "build"
+ASSETS_SUBDIR = "assets/build"
+MANIFEST_NAME = "asset-manifest.json"
+
+_LINK_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_SCRIPT_RE = re.compile(r"<script\b([^>]*)>\s*</script>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([a-zA-Z_:][-a-zA-Z0-9_:.]*)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?""")
+_GAP_RE = re.compile(r"^(?:\s|<!--.*?-->)*$", re.DOTALL)
+_CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+# ===== MINIFICACIÓN =====
+
+def _split_strings(source: str) -> List[Tuple[bool, str]]:
+    """Separa un fuente CSS en (es_string, texto) respetando escapes"""
+    parts, i, n, start = [], 0, len(source), 0
+    while i < n:
+        char = source[i]
+        if char in "\"'":
+            if start < i:
+                parts.append((False, source[start:i]))
+            j = i + 1
+            while j < n and source[j] != char and source[j] != "\n":
+                j += 2 if source[j] == "\\" else 1
+            parts.append((True, source[i:j + 1]))
+            i = start = j + 1
+        elif source.startswith("/*", i):
+            if start < i:
+                parts.append((False, source[start:i]))
+            end = source.find("*/", i + 2)
+            i = start = n if end < 0 else end + 2
+            parts.append((False, " "))
+        else:
+            i += 1
+    if start < n:
+        parts.append((False, source[start:]))
+    return parts
+
+def minify_css(css: str) -> str:
+    """Elimina comentarios y espacios redundantes (los strings no se tocan)"""
+    parts: List[Tuple[bool, str]] = []
+    for is_string, text in _split_strings(css):
+        if parts and not is_string and not parts[-1][0]:
+            parts[-1] = (False, parts[-1][1] + text)
+        else:
+            parts.append((is_string, text))
+    out = []
+    for is_string, text in parts:
+        if is_string:
+            out.append(text)
+            continue
+        text = re.sub(r"\s+", " ", text)
+        text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+        text = re.sub(r":\s+", ":", text)
+        out.append(text)
+    return re.sub(r";}", "}", "".join(out)).strip()
+
+def minify_js(js: str) -> str:
+    """Minificación conservadora de JavaScript
+
+    Solo elimina indentación, líneas vacías y comentarios que ocupan líneas
+    completas. Se conservan los saltos de línea (ASI) y el contenido de los
+    template literals multilínea se deja intacto.
+    """
+    out = []
+    in_template = False
+    in_block_comment = False
+    for line in js.splitlines():
+        stripped = line.strip()
+        if in_template:
+            out.append(line)
+        elif in_block_comment:
+            if "*/" in stripped:
+                in_block_comment = False
+                rest = stripped.split("*/", 1)[1].strip()
+                if rest:
+                    out.append(rest)
+            continue
+        elif not stripped or stripped.startswith("//"):
+            continue
+        elif stripped.startswith("/*"):
+            if "*/" not in stripped[2:]:
+                in_block_comment = True
+                continue
+            rest = stripped.split("*/", 1)[1].strip()
+            if rest:
+                out.append(rest)
+            continue
+        else:
+            out.append(stripped)
+        in_template = _ends_in_template(line, in_template)
+    return "\n".join(out) + "\n"
+
+def _ends_in_template(line: str, in_template: bool) -> bool:
+    """Indica si al final de la línea seguimos dentro de un template literal"""
+    quote = None
+    i, n = 0, len(line)
+    while i < n:
+        char = line[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_template:
+            if char == "`":
+                in_template = False
+        elif quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "`":
+            in_template = True
+        elif line.startswith("//", i):
+            break
+        i += 1
+    return in_template
+
+# ===== HTML =====
+
+def _attributes(tag: str) -> Dict[str, str]:
+    """Atributos de un tag de apertura (nombres en minúscula)"""
+    body = re.sub(r"^<\w+|/?>$", "", tag.strip())
+    attrs = {}
+    for match in _ATTR_RE.finditer(body):
+        value = next((g for g in match.groups()[1:] if g is not None), "")
+        attrs[match.group(1).lower()] = value
+    return attrs
+
+def _is_local(url: str) -> bool:
+    """Referencias servidas por nosotros (no CDN, no data:, no absolutas)"""
+    return bool(url) and not re.match(r"^(?:[a-z][a-z0-9+.-]*:|//|/|#)", url, re.IGNORECASE)
+
+class _AssetRef:
+    """Una referencia <link>/<script> encontrada en una página"""
+
+    def __init__(self, kind: str, match: re.Match, url: str, bundleable: bool):
+        self.kind = kind
+        self.start, self.end = match.span()
+        self.tag = match.group(0)
+        self.url = url
+        self.bundleable = bundleable
+        self.source: Optional[str] = None
+
+def _find_refs(html: str) -> List[_AssetRef]:
+    """Encuentra hojas de estilo y scripts locales en orden de documento"""
+    refs = []
+    for match in _LINK_RE.finditer(html):
+        attrs = _attributes(match.group(0))
+        if attrs.get("rel", "").lower() == "stylesheet" and _is_local(attrs.get("href", "")):
+            extra = set(attrs) - {"rel", "href", "type"}
+            refs.append(_AssetRef("css", match, attrs["href"], bundleable=not extra))
+    for match in _SCRIPT_RE.finditer(html):
+        attrs = _attributes("<script" + match.group(1) + ">")
+        if _is_local(attrs.get("src", "")):
+            script_type = attrs.get("type", "text/javascript").lower()
+            if script_type not in ("text/javascript", "application/javascript"):
+                continue
+            extra = set(attrs) - {"src", "type"}
+            refs.append(_AssetRef("js", match, attrs["src"], bundleable=not extra))
+    return sorted(refs, key=lambda ref: ref.start)
+
+# ===== BUILD =====
+
+class AssetBuilder:
+    """Construye los assets con hash de una raíz de sitio estático"""
+
+    def __init__(self, root: Union[str, Path], output_dir: Optional[Union[str, Path]] = None):
+        self.root = Path(root).resolve()
+        self.output_dir = Path(output_dir).resolve() if output_dir else self.root / BUILD_DIR_NAME
+        self.assets_dir = self.output_dir / ASSETS_SUBDIR
+        self._minified: Dict[str, str] = {}
+        self.manifest: Dict[str, Dict] = {"files": {}, "bundles": {}, "pages": []}
+
+    def build(self) -> Dict[str, Dict]:
+        """Ejecuta el build completo y escribe el manifest"""
+        previous = self._load_manifest()
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        for page in self._pages():
+            self._build_page(page)
+        self._prune(previous)
+        manifest_path = self.output_dir / MANIFEST_NAME
+        tmp = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, manifest_path)
+        return self.manifest
+
+    def _pages(self) -> List[Path]:
+        """Páginas HTML de la raíz (excluye la propia salida)"""
+        pages = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            current = Path(dirpath)
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in SKIP_DIRS and not d.startswith(".") and (current / d) != self.output_dir
+            ]
+            pages.extend(current / f for f in filenames if f.endswith(".html"))
+        return sorted(pages)
+
+    def _build_page(self, page: Path) -> None:
+        """Reescribe una página agrupando tags consecutivos en bundles"""
+        html = page.read_text(encoding="utf-8")
+        page_rel = page.relative_to(self.root).as_posix()
+        page_dir = posixpath.dirname(page_rel)
+
+        runs: List[List[_AssetRef]] = []
+        for ref in _find_refs(html):
+            source = self._resolve(page_dir, ref.url)
+            if source is None:
+                continue  # Referencia rota: se deja tal cual
+            ref.source = source
+            previous = runs[-1][-1] if runs else None
+            if (
+                previous is not None and ref.bundleable and previous.bundleable
+                and ref.kind == previous.kind
+                and _GAP_RE.match(html[previous.end:ref.start])
+            ):
+                runs[-1].append(ref)
+            else:
+                runs.append([ref])
+
+        # Reemplazar de atrás hacia adelante para no invalidar offsets
+        for run in reversed(runs):
+            built = self._emit(run)
+            target = posixpath.relpath(built, page_dir or ".")
+            first = run[0]
+            new_tag = first.tag.replace(first.url, target, 1)
+            for ref in reversed(run[1:]):
+                html = html[:ref.start] + html[ref.end:]
+            html = html[:first.start] + new_tag + html[first.end:]
+
+        output_page = self.output_dir / page_rel
+        output_page.parent.mkdir(parents=True, exist_ok=True)
+        output_page.write_text(html, encoding="utf-8")
+        self.manifest["pages"].append(page_rel)
+
+    def _resolve(self, page_dir: str, url: str) -> Optional[str]:
+        """Ruta relativa a la raíz del asset referenciado (None si no existe)"""
+        path = url.split("?", 1)[0].split("#", 1)[0]
+        rel = posixpath.normpath(posixpath.join(page_dir, path))
+        if rel.startswith("..") or not (self.root / rel).is_file():
+            return None
+        return rel
+
+    def _emit(self, run: List[_AssetRef]) -> str:
+        """Escribe el asset (o bundle) con hash y devuelve su ruta relativa"""
+        kind = run[0].kind
+        sources = [ref.source for ref in run]
+        separator = "\n" if kind == "css" else "\n;\n"
+        content = separator.join(self._minify(source, kind) for source in sources)
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+        stem = Path(sources[0]).stem
+        name = f"{stem}.{digest}.{kind}" if len(sources) == 1 else f"{stem}.bundle.{digest}.{kind}"
+        rel = f"{ASSETS_SUBDIR}/{name}"
+        target = self.output_dir / rel
+        if not target.exists():
+            target.write_text(content, encoding="utf-8")
+        if len(sources) == 1:
+            self.manifest["files"][sources[0]] = rel
+        else:
+            self.manifest["bundles"][rel] = sources
+        return rel
+
+    def _minify(self, source: str, kind: str) -> str:
+        """Minifica un fichero (memoizado entre páginas)"""
+        key = f"{kind}:{source}"
+        if key not in self._minified:
+            text = (self.root / source).read_text(encoding="utf-8")
+            if kind == "css":
+                text = minify_css(self._rebase_css_urls(text, posixpath.dirname(source)))
+            else:
+                text = minify_js(text)
+            self._minified[key] = text
+        return self._minified[key]
+
+    @staticmethod
+    def _rebase_css_urls(css: str, source_dir: str) -> str:
+        """Reescribe url() relativos para que sigan válidos desde assets/build"""
+        def rebase(match: re.Match) -> str:
+            quote, url = match.groups()
+            if not _is_local(url):
+                return match.group(0)
+            resolved = posixpath.normpath(posixpath.join(source_dir, url))
+            return f"url({quote}{posixpath.relpath(resolved, ASSETS_SUBDIR)}{quote})"
+        return _CSS_URL_RE.sub(rebase, css)
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """Manifest del build anterior (vacío si no existe)"""
+        try:
+            return json.loads((self.output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _prune(self, previous: Dict[str, Dict]) -> None:
+        """Conserva solo los assets del build actual y del anterior
+
+        Mantener la generación anterior permite que las páginas cacheadas
+        por los clientes sigan encontrando sus assets durante el despliegue.
+        """
+        keep = set(self.manifest["files"].values()) | set(self.manifest["bundles"])
+        keep |= set(previous.get("files", {}).values()) | set(previous.get("bundles", {}))
+        for path in self.assets_dir.iterdir():
+            rel = f"{ASSETS_SUBDIR}/{path.name}"
+            base = rel[:-3] if rel.endswith((".br", ".gz")) else rel
+            if base not in keep:
+                path.unlink()
+
+def build_assets(root: Union[str, Path], output_dir: Optional[Union[str, Path]] = None) -> Dict[str, Dict]:
+    """Atajo: construye los assets de root y devuelve el manifest"""
+    return AssetBuilder(root, output_dir).build()
+
+__all__ = [
+    "AssetBuilder", "build_assets", "minify_css", "minify_js",
+    "BUILD_DIR_NAME", "HASHED_NAME_RE", "MANIFEST_NAME"
+]
+
+if __name__ == "__main__":
+    site_root = sys.argv[1] if len(sys.argv) > 1 else "."
+    out = sys.argv[2] if len(sys.argv) > 2 else None
+    result = build_assets(site_root, out)
+    print(
+        f"🏗️ Build de assets: {len(result['pages'])} páginas, "
+        f"{len(result['files'])} ficheros, {len(result['bundles'])} bundles"
+    )
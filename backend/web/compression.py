@@ -0,0 +1,192 @@
+"""
+🗜️ DATACRYPT LABS - RESPONSE COMPRESSION
+Middleware ASGI de compresión gzip/brotli negociada por Accept-Encoding
+Filosofía Mejora Continua: Menos bytes en la red sin bloquear el event loop
+"""
+
+import gzip
+import zlib
+from typing import Iterable, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # Opcional: pip install brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+# Tipos que vale la pena comprimir (las imágenes/PDF ya vienen comprimidos)
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "application/manifest+json", "image/svg+xml", "text/"
+)
+# Los streams de eventos necesitan cada frame entregado sin buffer
+EXCLUDED_TYPES = ("text/event-stream",)
+
+def available_encodings() -> Tuple[str, ...]:
+    """Encodings soportados en este proceso, en orden de preferencia"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def negotiate_encoding(accept_encoding: str, supported: Optional[Iterable[str]] = None) -> Optional[str]:
+    """Elige el mejor encoding según Accept-Encoding (respeta q-values)"""
+    supported = tuple(supported or available_encodings())
+    best, best_q = None, 0.0
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        candidates = supported if token == "*" else (token,)
+        for candidate in candidates:
+            if candidate not in supported or q <= 0:
+                continue
+            # A igual q gana el de mayor preferencia en `supported`
+            if q > best_q or (q == best_q and best is not None and supported.index(candidate) < supported.index(best)):
+                best, best_q = candidate, q
+    return best
+
+def is_compressible(content_type: str) -> bool:
+    """Indica si el content-type merece compresión"""
+    content_type = content_type.lower()
+    if any(content_type.startswith(t) for t in EXCLUDED_TYPES):
+        return False
+    return any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+def compress_bytes(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compresión one-shot de un body completo"""
+    if encoding == "br":
+        return brotli.compress(data, quality=5 if level is None else level)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+class StreamCompressor:
+    """Compresor incremental con flush por chunk para respuestas en streaming"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=4)
+        else:
+            self._gz = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._br.finish()
+        return self._gz.flush()
+
+class CompressionMiddleware:
+    """Comprime respuestas con br/gzip según Accept-Encoding
+
+    - Solo tipos comprimibles, sin Content-Encoding previo y por encima
+      de minimum_size (las respuestas pequeñas no compensan).
+    - Los bodies completos de offload_size o más se comprimen en un
+      worker thread para no bloquear el event loop.
+    - Las respuestas en streaming se comprimen chunk a chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+        compressor: Optional[StreamCompressor] = None
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start_message, passthrough, compressor
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type", ""))
+                    or scope.get("method") == "HEAD"
+                )
+                if passthrough:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                # Chunks siguientes de una respuesta en streaming
+                chunk = compressor.compress(body) if body else b""
+                if not more_body:
+                    chunk += compressor.finish()
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+
+            if not more_body:
+                if len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                level = self.levels[encoding]
+                if len(body) >= self.offload_size:
+                    body = await anyio.to_thread.run_sync(compress_bytes, body, encoding, level)
+                else:
+                    body = compress_bytes(body, encoding, level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            # Primer chunk de una respuesta en streaming
+            compressor = StreamCompressor(encoding)
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressor.compress(body), "more_body": True})
+
+        await self.app(scope, receive, compressing_send)
+
+__all__ = [
+    "CompressionMiddleware", "StreamCompressor", "available_encodings",
+    "negotiate_encoding", "is_compressible", "compress_bytes"
+]
@@ -0,0 +1,287 @@
+"""
+📄 DATACRYPT LABS - LARGE DOCUMENT DELIVERY
+Respuestas con Range/If-Range, ETag fuerte y envío zero-copy para PDFs
+Filosofía Mejora Continua: El visor solo descarga las páginas que muestra
+
+Envío zero-copy: si el servidor ASGI anuncia la extensión
+"http.response.zerocopysend" se le entrega el descriptor de fichero para
+que haga sendfile(2) en el kernel; con "http.response.pathsend" se le
+entrega la ruta. Uvicorn no implementa ninguna de las dos: ahí se hace
+fallback a lecturas por bloques en un worker thread.
+
+Miniaturas de primera página: PyMuPDF (pymupdf) si está instalado y, si
+no, el binario pdftoppm de poppler. Sin ninguno, thumbnails no disponibles.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import stat
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+try:
+    import pymupdf  # Opcional: pip install pymupdf
+except ImportError:  # pragma: no cover - depende del entorno
+    pymupdf = None
+
+CHUNK_SIZE = 256 * 1024
+DOCUMENT_DIRS = ("Certificaciones",)
+THUMBNAIL_WIDTHS = (240, 480)
+THUMBNAIL_VERSION = "1"
+
+def strong_etag(stat_result: os.stat_result) -> str:
+    """ETag fuerte derivado de mtime (ns) y tamaño"""
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parsea un único rango 'bytes=a-b' / 'bytes=a-' / 'bytes=-n'
+
+    Devuelve (inicio, fin inclusivo), None si el header no aplica (se sirve
+    el fichero completo) o lanza ValueError si el rango no es satisfacible.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None  # Unidades desconocidas o multi-rango: respuesta completa
+    start_text, _, end_text = spec.strip().partition("-")
+    if not re.fullmatch(r"\d*", start_text) or not re.fullmatch(r"\d*", end_text) or not (start_text or end_text):
+        return None  # Sintaxis inválida: se ignora el header (RFC 9110)
+    if not start_text:
+        suffix = int(end_text)
+        if suffix == 0 or size == 0:
+            raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+        return max(0, size - suffix), size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size or end < start:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, min(end, size - 1)
+
+class DocumentResponse(Response):
+    """FileResponse con Range/If-Range, validadores fuertes y zero-copy"""
+
+    def __init__(self, path: Union[str, Path], stat_result: os.stat_result, media_type: str = "application/pdf",
+                 headers: Optional[Dict[str, str]] = None):
+        self.path = str(path)
+        self.stat_result = stat_result
+        self.media_type = media_type
+        self.etag = strong_etag(stat_result)
+        self.last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        self.background = None
+        self.init_headers({
+            "accept-ranges": "bytes",
+            "etag": self.etag,
+            "last-modified": self.last_modified,
+            **(headers or {})
+        })
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        size = self.stat_result.st_size
+        headers = MutableHeaders(raw=list(self.raw_headers))
+
+        if self._not_modified(request_headers):
+            await self._send_headers(send, 304, headers)
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        status_code, start, end = 200, 0, size - 1
+        range_header = request_headers.get("range")
+        if range_header and self._if_range_matches(request_headers.get("if-range")):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                headers["content-range"] = f"bytes */{size}"
+                headers["content-length"] = "0"
+                await self._send_headers(send, 416, headers)
+                await send({"type": "http.response.body", "body": b""})
+                return
+            if byte_range is not None:
+                status_code, (start, end) = 206, byte_range
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+        count = end - start + 1 if size else 0
+        headers["content-length"] = str(count)
+        await self._send_headers(send, status_code, headers)
+
+        if scope["method"] == "HEAD" or count == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            await self._send_zerocopy(send, start, count)
+        elif "http.response.pathsend" in extensions and status_code == 200:
+            await send({"type": "http.response.pathsend", "path": self.path})
+        else:
+            await self._send_chunks(send, start, count)
+
+    def _not_modified(self, request_headers: Headers) -> bool:
+        """Evalúa If-None-Match (prioritario) e If-Modified-Since"""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(self.stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _if_range_matches(self, if_range: Optional[str]) -> bool:
+        """If-Range: el rango solo aplica si el validador sigue vigente"""
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == self.etag  # Comparación fuerte
+        try:
+            return int(self.stat_result.st_mtime) <= parsedate_to_datetime(if_range).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    async def _send_headers(send: Send, status_code: int, headers: MutableHeaders) -> None:
+        await send({"type": "http.response.start", "status": status_code, "headers": headers.raw})
+
+    async def _send_zerocopy(self, send: Send, start: int, count: int) -> None:
+        """Delegar sendfile(2) al servidor ASGI con el descriptor abierto"""
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        with file:
+            await send({
+                "type": "http.response.zerocopysend",
+                "file": file,
+                "offset": start,
+                "count": count
+            })
+
+    async def _send_chunks(self, send: Send, start: int, count: int) -> None:
+        """Fallback: lecturas por bloques fuera del event loop"""
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(start)
+            remaining = count
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # El fichero se truncó mientras se enviaba: cerrar el body igualmente
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+# ===== THUMBNAILS =====
+
+def thumbnail_backend() -> Optional[str]:
+    """Backend disponible para rasterizar PDFs"""
+    if pymupdf is not None:
+        return "pymupdf"
+    if shutil.which("pdftoppm"):
+        return "pdftoppm"
+    return None
+
+def render_first_page(source: str, target: str, width: int) -> int:
+    """Rasteriza la primera página a PNG con el ancho dado (corre en el pool)"""
+    tmp = f"{target}.{os.getpid()}.tmp"
+    if pymupdf is not None:
+        with pymupdf.open(source) as document:
+            page = document[0]
+            zoom = width / page.rect.width
+            pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            pixmap.save(tmp, output="png")
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            prefix = os.path.join(workdir, "page")
+            subprocess.run(
+                ["pdftoppm", "-png", "-singlefile", "-f", "1", "-l", "1", "-scale-to-x", str(width),
+                 "-scale-to-y", "-1", source, prefix],
+                check=True, capture_output=True, timeout=60
+            )
+            shutil.move(prefix + ".png", tmp)
+    os.replace(tmp, target)
+    return os.path.getsize(target)
+
+class DocumentStore:
+    """Documentos servibles bajo una raíz + caché de miniaturas"""
+
+    def __init__(self, root: Union[str, Path], cache_dir: Union[str, Path],
+                 document_dirs: Tuple[str, ...] = DOCUMENT_DIRS, max_workers: int = 1):
+        self.root = Path(root).resolve()
+        self.cache_dir = Path(cache_dir).resolve()
+        self.document_dirs = [(self.root / d).resolve() for d in document_dirs]
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[Path, asyncio.Future] = {}
+
+    def resolve(self, rel_path: str) -> Optional[Tuple[Path, os.stat_result]]:
+        """Ruta + stat de un PDF dentro de los directorios permitidos"""
+        candidate = (self.root / rel_path).resolve()
+        if not any(base in candidate.parents for base in self.document_dirs):
+            return None
+        if candidate.suffix.lower() != ".pdf":
+            return None
+        try:
+            stat_result = candidate.stat()
+        except OSError:
+            return None
+        return (candidate, stat_result) if stat.S_ISREG(stat_result.st_mode) else None
+
+    def list_documents(self) -> List[Dict[str, Union[str, int]]]:
+        """Catálogo de PDFs para la galería de certificaciones"""
+        documents = []
+        for base in self.document_dirs:
+            if not base.is_dir():
+                continue
+            for path in sorted(base.glob("*.pdf")):
+                stat_result = path.stat()
+                documents.append({
+                    "name": path.stem,
+                    "path": path.relative_to(self.root).as_posix(),
+                    "size": stat_result.st_size,
+                    "etag": strong_etag(stat_result)
+                })
+        return documents
+
+    async def thumbnail(self, path: Path, stat_result: os.stat_result, width: int) -> Path:
+        """Miniatura de la primera página, cacheada por ETag del PDF"""
+        key = hashlib.sha256(f"{path}:{strong_etag(stat_result)}".encode("utf-8")).hexdigest()[:16]
+        target = self.cache_dir / f"{key}-w{width}-v{THUMBNAIL_VERSION}.png"
+        if target.exists():
+            return target
+        pending = self._inflight.get(target)
+        if pending is None:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            loop = asyncio.get_running_loop()
+            pending = asyncio.ensure_future(
+                loop.run_in_executor(self._pool, render_first_page, str(path), str(target), width)
+            )
+            self._inflight[target] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(target, None))
+        await asyncio.shield(pending)
+        return target
+
+    def shutdown(self) -> None:
+        """Libera el process pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+__all__ = [
+    "DocumentResponse", "DocumentStore", "parse_range", "strong_etag",
+    "thumbnail_backend", "render_first_page", "THUMBNAIL_WIDTHS"
+]
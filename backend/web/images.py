@@ -0,0 +1,208 @@
+"""
+🖼️ DATACRYPT LABS - RESPONSIVE IMAGES
+Variantes WebP/AVIF/JPEG por ancho con caché en disco por hash de contenido
+Filosofía Mejora Continua: Cada dispositivo recibe solo los píxeles que usa
+
+Uso como paso de build (precalienta la misma caché que usa el endpoint):
+    python -m backend.web.images [raíz] [directorio_caché]
+
+Pillow es opcional: sin él, ImagePipeline.available es False y el endpoint
+sirve el original.
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from PIL import Image, ImageOps, features  # Opcional: pip install Pillow
+except ImportError:  # pragma: no cover - depende del entorno
+    Image = None
+
+# Anchos permitidos: acotan el número de variantes que puede generar un cliente
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+# Formato -> (extensión, media type, calidad)
+FORMATS: Dict[str, Tuple[str, str, int]] = {
+    "avif": (".avif", "image/avif", 50),
+    "webp": (".webp", "image/webp", 78),
+    "jpeg": (".jpg", "image/jpeg", 82),
+}
+# Directorios con la media del portfolio
+MEDIA_DIRS = ("Material visual",)
+PIPELINE_VERSION = "1"
+
+def supported_formats() -> Tuple[str, ...]:
+    """Formatos que el Pillow instalado puede codificar (preferencia: avif > webp > jpeg)"""
+    if Image is None:
+        return ()
+    return tuple(
+        fmt for fmt in ("avif", "webp", "jpeg")
+        if fmt == "jpeg" or features.check(fmt)
+    )
+
+def negotiate_format(accept: str, supported: Iterable[str]) -> str:
+    """Elige el formato según el header Accept del navegador"""
+    accept = accept.lower()
+    for fmt in supported:
+        if fmt != "jpeg" and FORMATS[fmt][1] in accept:
+            return fmt
+    return "jpeg"
+
+def snap_width(width: int, widths: Iterable[int] = VARIANT_WIDTHS) -> int:
+    """Ancho permitido más pequeño que cubre el pedido (o el mayor disponible)"""
+    widths = sorted(widths)
+    for candidate in widths:
+        if candidate >= width:
+            return candidate
+    return widths[-1]
+
+def render_variant(source: str, target: str, width: int, fmt: str, quality: int) -> int:
+    """Decodifica, redimensiona y codifica una variante (corre en el process pool)
+
+    Nunca amplía: si el original es más estrecho se conserva su ancho.
+    Escribe de forma atómica y devuelve el tamaño en bytes.
+    """
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        options = {"quality": quality}
+        if fmt == "jpeg":
+            options.update(optimize=True, progressive=True)
+        elif fmt == "webp":
+            options["method"] = 4
+        tmp = f"{target}.{os.getpid()}.tmp"
+        image.save(tmp, format=fmt.upper(), **options)
+    os.replace(tmp, target)
+    return os.path.getsize(target)
+
+class ImagePipeline:
+    """Genera y cachea variantes de imágenes bajo una raíz"""
+
+    def __init__(self, root: Union[str, Path], cache_dir: Union[str, Path], max_workers: Optional[int] = None):
+        self.root = Path(root).resolve()
+        self.cache_dir = Path(cache_dir).resolve()
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.formats = supported_formats()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._inflight: Dict[Path, asyncio.Future] = {}
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def resolve_source(self, rel_path: str) -> Optional[Path]:
+        """Ruta de la imagen original dentro de la raíz (None si no es válida)"""
+        candidate = (self.root / rel_path).resolve()
+        if self.root not in candidate.parents or not candidate.is_file():
+            return None
+        if candidate.suffix.lower() not in SOURCE_EXTENSIONS:
+            return None
+        return candidate
+
+    def source_digest(self, source: Path) -> str:
+        """Hash de contenido del original, memoizado por (mtime, tamaño)"""
+        stat = source.stat()
+        cached = self._digests.get(str(source))
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()[:16]
+        self._digests[str(source)] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def variant_path(self, digest: str, width: int, fmt: str) -> Path:
+        """Clave de caché: hash del original + parámetros de codificación"""
+        extension, _, quality = FORMATS[fmt]
+        return self.cache_dir / digest[:2] / f"{digest}-w{width}-q{quality}-v{PIPELINE_VERSION}{extension}"
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def get_variant(self, source: Path, width: int, fmt: str) -> Path:
+        """Devuelve la variante cacheada, generándola en el pool si falta
+
+        Peticiones concurrentes de la misma variante comparten un único job.
+        """
+        loop = asyncio.get_running_loop()
+        digest = await loop.run_in_executor(None, self.source_digest, source)
+        target = self.variant_path(digest, width, fmt)
+        if target.exists():
+            return target
+
+        pending = self._inflight.get(target)
+        if pending is None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            pending = asyncio.ensure_future(loop.run_in_executor(
+                self._executor(), render_variant,
+                str(source), str(target), width, fmt, FORMATS[fmt][2]
+            ))
+            self._inflight[target] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(target, None))
+        await asyncio.shield(pending)
+        return target
+
+    def iter_media(self, media_dirs: Iterable[str] = MEDIA_DIRS) -> List[Path]:
+        """Imágenes originales bajo los directorios de media"""
+        sources = []
+        for media_dir in media_dirs:
+            base = self.root / media_dir
+            if base.is_dir():
+                sources.extend(
+                    p for p in sorted(base.rglob("*"))
+                    if p.is_file() and p.suffix.lower() in SOURCE_EXTENSIONS
+                )
+        return sources
+
+    def build_all(self, widths: Iterable[int] = VARIANT_WIDTHS) -> Dict[str, int]:
+        """Genera offline todas las variantes (paso de build, bloqueante)"""
+        stats = {"sources": 0, "written": 0, "cached": 0}
+        jobs = []
+        for source in self.iter_media():
+            stats["sources"] += 1
+            digest = self.source_digest(source)
+            for width in widths:
+                for fmt in self.formats:
+                    target = self.variant_path(digest, width, fmt)
+                    if target.exists():
+                        stats["cached"] += 1
+                        continue
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    jobs.append((str(source), str(target), width, fmt, FORMATS[fmt][2]))
+        if jobs:
+            pool = self._executor()
+            for _ in pool.map(render_variant, *zip(*jobs)):
+                stats["written"] += 1
+        return stats
+
+    def shutdown(self) -> None:
+        """Libera el process pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+__all__ = [
+    "ImagePipeline", "VARIANT_WIDTHS", "FORMATS", "render_variant",
+    "supported_formats", "negotiate_format", "snap_width"
+]
+
+if __name__ == "__main__":
+    site_root = sys.argv[1] if len(sys.argv) > 1 else "."
+    cache = sys.argv[2] if len(sys.argv) > 2 else os.path.join(site_root, "data", "cache", "images")
+    pipeline = ImagePipeline(site_root, cache)
+    if not pipeline.available:
+        sys.exit("⚠️ Pillow no está instalado: pip install Pillow")
+    try:
+        print(f"🖼️ Variantes de imágenes ({', '.join(pipeline.formats)}): {pipeline.build_all()}")
+    finally:
+        pipeline.shutdown()
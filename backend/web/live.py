@@ -0,0 +1,163 @@
+"""
+📡 DATACRYPT LABS - LIVE METRICS STREAM
+Métricas del admin por Server-Sent Events desde un único productor compartido
+Filosofía Mejora Continua: Medir una vez, repartir a todos los paneles
+
+- Un solo task muestrea (psutil en un worker thread) mientras haya al menos
+  un suscriptor; sin paneles abiertos no hay muestreo.
+- Cada tick produce un lote con solo las métricas que cambiaron (delta).
+- Backpressure: cada suscriptor tiene un buzón que fusiona deltas; un
+  cliente lento recibe un único lote con el estado neto y nunca acumula
+  cola. Si no drena en max_missed ticks se le desconecta (el navegador
+  reconecta solo y recibe un snapshot completo).
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+
+import anyio
+import psutil
+
+Sample = Dict[str, object]
+
+class Subscriber:
+    """Buzón de un panel: deltas fusionados pendientes de enviar"""
+
+    def __init__(self):
+        self.pending: Sample = {}
+        self.ready = asyncio.Event()
+        self.missed = 0
+        self.closed = False
+
+    def offer(self, delta: Sample, max_missed: int) -> None:
+        """Fusiona el delta; corta al suscriptor si lleva demasiados ticks sin drenar"""
+        if self.pending:
+            self.missed += 1
+            if self.missed > max_missed:
+                self.close()
+                return
+        self.pending.update(delta)
+        self.ready.set()
+
+    def take(self) -> Sample:
+        batch, self.pending = self.pending, {}
+        self.missed = 0
+        self.ready.clear()
+        return batch
+
+    def close(self) -> None:
+        self.closed = True
+        self.ready.set()
+
+class MetricsBroadcaster:
+    """Productor único de métricas con fan-out a N suscriptores"""
+
+    def __init__(self, interval: float = 2.0, max_missed: int = 15, heartbeat: float = 15.0):
+        self.interval = interval
+        self.max_missed = max_missed
+        self.heartbeat = heartbeat
+        self.sources: Dict[str, Callable[[], Sample]] = {}
+        self.subscribers: Set[Subscriber] = set()
+        self.state: Sample = {}
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def add_source(self, name: str, sampler: Callable[[], Sample]) -> None:
+        """Registra una fuente; sus claves se publican como '<name>.<clave>'"""
+        self.sources[name] = sampler
+
+    def collect(self) -> Sample:
+        """Muestrea todas las fuentes (bloqueante, corre en un worker thread)"""
+        sample: Sample = {}
+        for name, sampler in self.sources.items():
+            try:
+                values = sampler()
+            except Exception as e:
+                values = {"error": str(e)}
+            for key, value in values.items():
+                sample[f"{name}.{key}"] = value
+        return sample
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber()
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._produce())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+        subscriber.close()
+
+    async def _produce(self) -> None:
+        """Bucle del productor: vive mientras haya suscriptores"""
+        while self.subscribers:
+            sample = await anyio.to_thread.run_sync(self.collect)
+            self.samples += 1
+            delta = {key: value for key, value in sample.items() if self.state.get(key) != value}
+            self.state = sample
+            if delta:
+                for subscriber in list(self.subscribers):
+                    subscriber.offer(delta, self.max_missed)
+                    if subscriber.closed:
+                        self.subscribers.discard(subscriber)
+            await asyncio.sleep(self.interval)
+        self.state = {}  # El próximo panel arranca con un snapshot fresco
+        self._task = None
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Eventos SSE: snapshot inicial y después lotes de deltas"""
+        subscriber = self.subscribe()
+        try:
+            if not self.state:
+                self.state = await anyio.to_thread.run_sync(self.collect)
+            snapshot = dict(self.state)
+            subscriber.take()  # El snapshot ya incluye lo pendiente
+            yield format_event("snapshot", snapshot)
+            while not subscriber.closed:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscriber.closed:
+                    break
+                yield format_event("delta", subscriber.take())
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "subscribers": len(self.subscribers),
+            "samples": self.samples,
+            "interval": self.interval,
+            "producer_running": self._task is not None and not self._task.done()
+        }
+
+def format_event(event: str, data: Sample) -> str:
+    """Frame SSE con el payload JSON en una sola línea"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+def sample_system() -> Sample:
+    """CPU, memoria y disco (cpu_percent sin intervalo: medido desde el tick anterior)"""
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage("/")
+    return {
+        "cpu_percent": round(psutil.cpu_percent(interval=None), 1),
+        "memory_percent": round(memory.percent, 1),
+        "memory_available_gb": round(memory.available / 1024 ** 3, 1),
+        "disk_percent": round(disk.percent, 1),
+        "disk_free_gb": round(disk.free / 1024 ** 3, 1)
+    }
+
+# Productor compartido por todos los paneles del proceso
+live_metrics = MetricsBroadcaster()
+live_metrics.add_source("system", sample_system)
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+__all__ = [
+    "MetricsBroadcaster", "Subscriber", "live_metrics", "sample_system",
+    "format_event", "SSE_HEADERS"
+]
@@ -0,0 +1,535 @@
+"""
+📋 DATACRYPT LABS - INDEXED LOG STORE
+Indexador incremental de los logs rotativos en un SQLite local
+Filosofía Mejora Continua: Consultar logs sin releer megas en cada request
+
+- sync() lee solo los bytes nuevos desde el último offset conocido y sigue
+  la rotación de RotatingFileHandler por inodo (el fichero activo pasa a
+  ser .1: se termina de leer allí y se empieza el nuevo desde 0).
+- Los registros se indexan por tiempo, nivel, request_id y logger; las
+  consultas filtradas paginan por keyset (id descendente).
+- tail() hace reverse-seek desde el final del fichero activo: lee bloques
+  hacia atrás hasta juntar las líneas pedidas, sin tocar el resto.
+- LogFollower es el "tail -F": un único poller por fichero reparte los
+  registros nuevos entre los clientes, cada uno con su filtro y un buffer
+  acotado (si un cliente no drena se descartan los más antiguos).
+
+Entiende los dos formatos de backend/utils/logger: texto (desarrollo) y
+JSON (producción). Las líneas sin cabecera (tracebacks) se anexan al
+registro anterior.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple, Union
+
+import anyio
+
+# Mismo valor por defecto que settings.log_file (backend/config)
+DEFAULT_LOG_FILE = "./data/logs/datacrypt_api.log"
+LEVELS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+# "<fecha> <hora> - <logger> - <LEVEL> - [<request_id>] - <módulo:función:línea> - <mensaje>"
+# (request_id y ubicación son opcionales: formatos antiguos y de consola)
+TEXT_LINE_RE = re.compile(
+    r"^(?P<date>\d{4}-\d{2}-\d{2})[ T](?P<time>\d{2}:\d{2}:\d{2})(?:[.,]\d+)? - (?P<logger>\S+) - "
+    r"(?P<level>[A-Z]+) - (?:\[(?P<request_id>[^\]]*)\] - )?(?:(?P<location>[\w.<>]+:[\w.<>]+:\d+) - )?"
+    r"(?P<message>.*)$"
+)
+READ_CHUNK = 1024 * 1024  # También la longitud máxima indexada de una línea
+TRUNCATED_MARK = b" [truncated]"
+TAIL_BLOCK = 8192
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_records (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    level TEXT NOT NULL,
+    levelno INTEGER NOT NULL,
+    logger TEXT NOT NULL,
+    request_id TEXT,
+    location TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_log_records_ts ON log_records(ts);
+CREATE INDEX IF NOT EXISTS idx_log_records_level ON log_records(levelno, id);
+CREATE INDEX IF NOT EXISTS idx_log_records_logger ON log_records(logger, id);
+CREATE INDEX IF NOT EXISTS idx_log_records_request ON log_records(request_id) WHERE request_id IS NOT NULL;
+CREATE TABLE IF NOT EXISTS log_cursor (
+    path TEXT PRIMARY KEY,
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    last_id INTEGER
+);
+"""
+
+def parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Registro a partir de una línea de log (None si es continuación)"""
+    line = line.rstrip("\r\n")
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return None
+        message = str(data.get("message", ""))
+        if data.get("exception"):
+            message += "\n" + data["exception"]
+        level = str(data.get("level", "INFO")).upper()
+        return {
+            "ts": str(data.get("timestamp", "")).rstrip("Z")[:26],
+            "level": level,
+            "levelno": LEVELS.get(level, 0),
+            "logger": data.get("logger", ""),
+            "request_id": data.get("request_id"),
+            "location": f"{data.get('module', '')}:{data.get('function', '')}:{data.get('line', '')}",
+            "message": message
+        }
+    match = TEXT_LINE_RE.match(line)
+    if match is None:
+        return None
+    request_id = match.group("request_id")
+    return {
+        "ts": f"{match.group('date')}T{match.group('time')}",
+        "level": match.group("level"),
+        "levelno": LEVELS.get(match.group("level"), 0),
+        "logger": match.group("logger"),
+        "request_id": request_id if request_id and request_id != "-" else None,
+        "location": match.group("location"),
+        "message": match.group("message")
+    }
+
+def group_records(lines: List[str]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Agrupa líneas en registros: (continuaciones iniciales huérfanas, registros)"""
+    orphans: List[str] = []
+    records: List[Dict[str, Any]] = []
+    for line in lines:
+        record = parse_line(line)
+        if record is not None:
+            records.append(record)
+        elif records:
+            records[-1]["message"] += "\n" + line.rstrip("\r\n")
+        elif line.strip():
+            orphans.append(line.rstrip("\r\n"))
+    return orphans, records
+
+def read_tail_lines(path: Union[str, Path], count: int) -> List[str]:
+    """Últimas `count` líneas leyendo bloques desde el final (reverse-seek)"""
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        buffer = b""
+        while position > 0 and buffer.count(b"\n") <= count:
+            step = min(TAIL_BLOCK, position)
+            position -= step
+            file.seek(position)
+            buffer = file.read(step) + buffer
+    lines = buffer.decode("utf-8", errors="replace").splitlines()
+    return lines[-count:] if count else []
+
+class LogStore:
+    """Índice SQLite de los ficheros de log rotativos de un RotatingFileHandler"""
+
+    def __init__(self, log_file: Union[str, Path], db_path: Optional[Union[str, Path]] = None,
+                 max_records: int = 500_000):
+        self.log_file = Path(log_file)
+        self.db_path = Path(db_path) if db_path else self.log_file.parent / "log_index.db"
+        self.max_records = max_records
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def rotated_files(self) -> List[Path]:
+        """Backups existentes de más antiguo a más reciente (.N ... .1)"""
+        backups = []
+        for candidate in self.log_file.parent.glob(self.log_file.name + ".*"):
+            suffix = candidate.name[len(self.log_file.name) + 1:]
+            if suffix.isdigit():
+                backups.append((int(suffix), candidate))
+        return [path for _, path in sorted(backups, reverse=True)]
+
+    # ===== INDEXACIÓN INCREMENTAL =====
+
+    def sync(self) -> int:
+        """Indexa lo escrito desde la última llamada; devuelve registros nuevos"""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("SELECT * FROM log_cursor WHERE path = ?", (str(self.log_file),)).fetchone()
+            try:
+                active = self.log_file.stat()
+            except FileNotFoundError:
+                return 0
+
+            added = 0
+            if cursor is None:
+                # Primera vez: backups antiguos completos y después el activo
+                last_id = None
+                for backup in self.rotated_files():
+                    count, last_id, _ = self._ingest(conn, backup, 0, last_id)
+                    added += count
+                offset = 0
+            elif (cursor["device"], cursor["inode"]) != (active.st_dev, active.st_ino):
+                # Rotó: terminar el fichero anterior (ahora es un backup) desde su
+                # offset y leer completos los backups más nuevos que él
+                last_id, offset = cursor["last_id"], 0
+                backups = self.rotated_files()
+                start = 0  # Si ya no existe salió por backupCount: todos los backups son más nuevos
+                for index, backup in enumerate(backups):
+                    stat_result = backup.stat()
+                    if (stat_result.st_dev, stat_result.st_ino) == (cursor["device"], cursor["inode"]):
+                        count, last_id, _ = self._ingest(conn, backup, cursor["offset"], last_id)
+                        added += count
+                        start = index + 1
+                for backup in backups[start:]:
+                    count, last_id, _ = self._ingest(conn, backup, 0, last_id)
+                    added += count
+            else:
+                last_id, offset = cursor["last_id"], cursor["offset"]
+                if active.st_size < offset:
+                    offset = 0  # Truncado in situ
+
+            count, last_id, offset = self._ingest(conn, self.log_file, offset, last_id)
+            added += count
+            conn.execute(
+                "INSERT OR REPLACE INTO log_cursor (path, device, inode, offset, last_id) VALUES (?, ?, ?, ?, ?)",
+                (str(self.log_file), active.st_dev, active.st_ino, offset, last_id)
+            )
+            if added:
+                self._prune(conn)
+            conn.commit()
+            return added
+
+    def _ingest(self, conn: sqlite3.Connection, path: Path, offset: int,
+                last_id: Optional[int]) -> Tuple[int, Optional[int], int]:
+        """Lee por bloques desde offset hasta la última línea completa
+
+        Una línea de más de READ_CHUNK bytes se indexa truncada y el resto se
+        descarta hasta su salto de línea (el offset siempre avanza).
+        """
+        added = 0
+        skipping = False
+        with open(path, "rb") as file:
+            file.seek(offset)
+            while True:
+                chunk = file.read(READ_CHUNK)
+                if not chunk:
+                    break
+                if skipping:
+                    newline = chunk.find(b"\n")
+                    offset += len(chunk) if newline < 0 else newline + 1
+                    skipping = newline < 0
+                    file.seek(offset)
+                    continue
+                end = chunk.rfind(b"\n")
+                if end >= 0:
+                    consumed, data = end + 1, chunk[:end + 1]
+                elif len(chunk) == READ_CHUNK:
+                    consumed, data, skipping = len(chunk), chunk + TRUNCATED_MARK, True
+                else:
+                    break  # Línea a medio escribir: se relee en el próximo sync
+                offset += consumed
+                file.seek(offset)
+                lines = data.decode("utf-8", errors="replace").splitlines()
+                orphans, records = group_records(lines)
+                if orphans and last_id is not None:
+                    conn.execute(
+                        "UPDATE log_records SET message = message || ? WHERE id = ?",
+                        ("\n" + "\n".join(orphans), last_id)
+                    )
+                for record in records:
+                    last_id = conn.execute(
+                        "INSERT INTO log_records (ts, level, levelno, logger, request_id, location, message) "
+                        "VALUES (:ts, :level, :levelno, :logger, :request_id, :location, :message)",
+                        record
+                    ).lastrowid
+                added += len(records)
+        return added, last_id, offset
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Retención: conserva como mucho max_records registros"""
+        row = conn.execute("SELECT MAX(id) FROM log_records").fetchone()
+        if row[0] and row[0] > self.max_records:
+            conn.execute("DELETE FROM log_records WHERE id <= ?", (row[0] - self.max_records,))
+
+    # ===== CONSULTAS =====
+
+    def query(
+        self,
+        level: Optional[str] = None,
+        logger: Optional[str] = None,
+        request_id: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        before_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Registros más recientes primero; next_cursor pagina hacia atrás"""
+        self.sync()
+        clauses, params = [], []
+        if level:
+            clauses.append("levelno >= ?")
+            params.append(LEVELS.get(level.upper(), 0))
+        if logger:
+            clauses.append("(logger = ? OR logger LIKE ? ESCAPE '\\')")
+            params.extend([logger, logger.replace("%", r"\%").replace("_", r"\_") + ".%"])
+        if request_id:
+            clauses.append("request_id = ?")
+            params.append(request_id)
+        if since:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until:
+            clauses.append("ts < ?")
+            params.append(until)
+        if search:
+            clauses.append("message LIKE ?")
+            params.append(f"%{search}%")
+        if before_id:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = max(1, min(limit, 500))
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT * FROM log_records {where} ORDER BY id DESC LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+        records = [dict(row) for row in rows[:limit]]
+        return {
+            "records": records,
+            "next_cursor": records[-1]["id"] if len(rows) > limit else None
+        }
+
+    def tail(self, count: int = 100) -> List[Dict[str, Any]]:
+        """Últimos registros leídos con reverse-seek (sin pasar por el índice)"""
+        records: List[Dict[str, Any]] = []
+        for path in [self.log_file] + list(reversed(self.rotated_files())):
+            if len(records) >= count:
+                break
+            try:
+                lines = read_tail_lines(path, count * 4)
+            except FileNotFoundError:
+                continue
+            _, chunk_records = group_records(lines)
+            records = chunk_records[-(count - len(records)):] + records
+        return records[-count:]
+
+    def stats(self) -> Dict[str, Any]:
+        """Tamaño del índice y conteo por nivel"""
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute("SELECT COUNT(*) FROM log_records").fetchone()[0]
+            levels = {
+                row["level"]: row["n"]
+                for row in conn.execute("SELECT level, COUNT(*) AS n FROM log_records GROUP BY level")
+            }
+        return {"records": total, "levels": levels, "files": [self.log_file.name] + [p.name for p in self.rotated_files()]}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# ===== FOLLOW MODE =====
+
+class LogFilter:
+    """Filtro de servidor: nivel mínimo, subárbol de logger y request_id"""
+
+    def __init__(self, level: Optional[str] = None, logger: Optional[str] = None, request_id: Optional[str] = None):
+        self.levelno = LEVELS.get(level.upper(), 0) if level else 0
+        self.logger = logger
+        self.request_id = request_id
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        if record["levelno"] < self.levelno:
+            return False
+        if self.logger and record["logger"] != self.logger and not record["logger"].startswith(self.logger + "."):
+            return False
+        return not self.request_id or record["request_id"] == self.request_id
+
+class LogSubscriber:
+    """Cliente en follow: buffer acotado de registros que pasan su filtro"""
+
+    def __init__(self, log_filter: LogFilter, buffer_size: int):
+        self.filter = log_filter
+        self.buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self.dropped = 0
+        self.ready = asyncio.Event()
+
+    def offer(self, records: List[Dict[str, Any]]) -> None:
+        matched = [record for record in records if self.filter.matches(record)]
+        if not matched:
+            return
+        overflow = len(self.buffer) + len(matched) - self.buffer.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self.buffer.extend(matched)
+        self.ready.set()
+
+    def drain(self) -> Tuple[List[Dict[str, Any]], int]:
+        records, dropped = list(self.buffer), self.dropped
+        self.buffer.clear()
+        self.dropped = 0
+        self.ready.clear()
+        return records, dropped
+
+class LogFollower:
+    """tail -F compartido del fichero activo con fan-out filtrado
+
+    Mantiene el descriptor abierto: tras una rotación por rename termina de
+    leer el fichero viejo y después abre el nuevo desde el principio. Si el
+    fichero se trunca en el sitio vuelve al inicio.
+    """
+
+    def __init__(self, log_file: Union[str, Path], interval: float = 0.5, buffer_size: int = 500,
+                 heartbeat: float = 15.0):
+        self.log_file = Path(log_file)
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat
+        self.subscribers: Set[LogSubscriber] = set()
+        self._file = None
+        self._identity: Optional[Tuple[int, int]] = None
+        self._seen = False  # Tras el primer open, los ficheros nuevos se leen desde 0
+        self._partial = b""
+        self._pending: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _open(self, from_start: bool) -> bool:
+        try:
+            file = open(self.log_file, "rb")
+        except FileNotFoundError:
+            return False
+        stat_result = os.fstat(file.fileno())
+        if not from_start:
+            file.seek(0, os.SEEK_END)
+        self._file, self._identity, self._partial = file, (stat_result.st_dev, stat_result.st_ino), b""
+        self._seen = True
+        return True
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file, self._identity = None, None
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Registros completos escritos desde el último poll (bloqueante, en un thread)"""
+        if self._file is None and not self._open(from_start=self._seen):
+            return []
+        data = self._file.read()
+        try:
+            current = self.log_file.stat()
+            rotated = (current.st_dev, current.st_ino) != self._identity
+            truncated = not rotated and current.st_size < self._file.tell()
+        except FileNotFoundError:
+            rotated, truncated = True, False
+        if rotated:
+            # El viejo ya está drenado: seguir con el nuevo desde el inicio
+            self._close()
+            if self._open(from_start=True):
+                data += self._file.read()
+        elif truncated:
+            self._file.seek(0)
+            self._partial = b""
+            data += self._file.read()
+
+        buffer = self._partial + data
+        end = buffer.rfind(b"\n")
+        if end < 0:
+            self._partial = buffer
+            lines: List[str] = []
+        else:
+            self._partial = buffer[end + 1:]
+            lines = buffer[:end + 1].decode("utf-8", errors="replace").splitlines()
+
+        orphans, records = group_records(lines)
+        ready: List[Dict[str, Any]] = []
+        if self._pending is not None:
+            if orphans:
+                self._pending["message"] += "\n" + "\n".join(orphans)
+            if records or not lines:
+                # Llegó otra cabecera o un poll sin datos: el registro está completo
+                ready.append(self._pending)
+                self._pending = None
+        if records:
+            # El último registro puede recibir aún líneas de traceback
+            ready.extend(records[:-1])
+            self._pending = records[-1]
+        return ready
+
+    def subscribe(self, log_filter: LogFilter) -> LogSubscriber:
+        subscriber = LogSubscriber(log_filter, self.buffer_size)
+        self.subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            # Posicionar al final ya: lo escrito desde ahora llega al suscriptor
+            if self._file is None:
+                self._open(from_start=False)
+            self._task = asyncio.create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber: LogSubscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    async def _run(self) -> None:
+        """Poller único: vive mientras haya clientes siguiendo el log"""
+        try:
+            while self.subscribers:
+                records = await anyio.to_thread.run_sync(self.poll)
+                if records:
+                    for subscriber in list(self.subscribers):
+                        subscriber.offer(records)
+                await asyncio.sleep(self.interval)
+        finally:
+            self._close()
+            self._seen = False
+            self._pending = None
+            self._task = None
+
+    async def stream(self, log_filter: LogFilter, backlog: List[Dict[str, Any]] = ()) -> AsyncIterator[str]:
+        """Eventos SSE: backlog filtrado y después registros nuevos en lotes"""
+        subscriber = self.subscribe(log_filter)
+        try:
+            initial = [record for record in backlog if log_filter.matches(record)]
+            if initial:
+                yield format_log_event("records", {"records": initial})
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                records, dropped = subscriber.drain()
+                yield format_log_event("records", {"records": records, "dropped": dropped})
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "followers": len(self.subscribers),
+            "following": str(self.log_file),
+            "poller_running": self._task is not None and not self._task.done()
+        }
+
+def format_log_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+__all__ = [
+    "LogStore", "LogFollower", "LogFilter", "parse_line", "group_records",
+    "read_tail_lines", "DEFAULT_LOG_FILE", "LEVELS"
+]
@@ -0,0 +1,200 @@
+// Funciones principales del admin
+
+// Cargar datos al inicio: métricas en vivo por SSE en lugar de polling
+document.addEventListener('DOMContentLoaded', function() {
+    connectLiveMetrics();
+});
+
+// Stream de métricas: snapshot inicial + deltas del productor compartido
+const liveMetrics = {};
+function connectLiveMetrics() {
+    const source = new EventSource('/admin/api/stream');
+    const apply = (event) => {
+        Object.assign(liveMetrics, JSON.parse(event.data));
+        const data = {
+            resources: {
+                cpu_percent: liveMetrics['system.cpu_percent'],
+                memory_percent: liveMetrics['system.memory_percent']
+            }
+        };
+        updateStatusCards(data);
+        updateQuickStats(data);
+    };
+    source.addEventListener('snapshot', apply);
+    source.addEventListener('delta', apply);
+}
+
+// Cargar datos del dashboard
+async function loadDashboardData() {
+    try {
+        const response = await fetch('/admin/api/status');
+        const data = await response.json();
+
+        if (data.status === 'healthy') {
+            updateStatusCards(data);
+            updateSystemInfo(data);
+            updateQuickStats(data);
+        }
+    } catch (error) {
+        console.error('Error cargando datos:', error);
+    }
+}
+
+// Actualizar tarjetas de estado
+function updateStatusCards(data) {
+    const serverStatus = document.getElementById('server-status');
+    const dbStatus = document.getElementById('db-status');
+    const performanceStatus = document.getElementById('performance-status');
+    const securityStatus = document.getElementById('security-status');
+
+    if (serverStatus) serverStatus.textContent = '✅ Operativo';
+    if (dbStatus) dbStatus.textContent = '✅ Conectado';
+    if (performanceStatus) performanceStatus.textContent = `CPU: ${data.resources?.cpu_percent || 0}%`;
+    if (securityStatus) securityStatus.textContent = '🔒 Activo';
+}
+
+// Actualizar estadísticas rápidas
+function updateQuickStats(data) {
+    const uptime = document.getElementById('uptime');
+    const requests = document.getElementById('requests');
+    const memory = document.getElementById('memory');
+
+    if (uptime) uptime.textContent = 'Activo';
+    if (requests) requests.textContent = '0';
+    if (memory && data.resources) {
+        memory.textContent = `${Math.round(data.resources.memory_percent)}%`;
+    }
+}
+
+// Actualizar información del sistema
+function updateSystemInfo(data) {
+    // Ya está estática en el HTML, pero se puede actualizar dinámicamente
+}
+
+// Refrescar datos
+function refreshData() {
+    loadDashboardData();
+    showNotification('Datos actualizados', 'success');
+}
+
+// Probar API
+async function testAPI() {
+    const resultDiv = document.getElementById('action-result');
+    try {
+        resultDiv.className = 'action-result';
+        resultDiv.textContent = '⏳ Probando API...';
+        resultDiv.style.display = 'block';
+
+        const response = await fetch('/admin/api/health');
+        const data = await response.json();
+
+        if (response.ok) {
+            resultDiv.className = 'action-result success';
+            resultDiv.innerHTML = `
+                <strong>✅ API funcionando correctamente</strong><br>
+                Estado: ${data.status}<br>
+                Timestamp: ${new Date().toLocaleString()}
+            `;
+        } else {
+            throw new Error('API response not OK');
+        }
+    } catch (error) {
+        resultDiv.className = 'action-result error';
+        resultDiv.innerHTML = `<strong>❌ Error:</strong> ${error.message}`;
+    }
+}
+
+// Ver logs
+async function viewLogs() {
+    try {
+        const response = await fetch('/admin/api/logs');
+        const data = await response.json();
+
+        if (data.logs && data.logs.length > 0) {
+            let logsText = 'LOGS RECIENTES:\n\n';
+            data.logs.forEach(log => {
+                logsText += `📄 ${log.file}:\n`;
+                log.lines.forEach(line => {
+                    logsText += `  ${line}\n`;
+                });
+                logsText += '\n';
+            });
+            alert(logsText);
+        } else {
+            alert('No hay logs disponibles');
+        }
+    } catch (error) {
+        alert('Error cargando logs: ' + error.message);
+    }
+}
+
+// Health check
+async function checkHealth() {
+    const resultDiv = document.getElementById('action-result');
+    try {
+        const response = await fetch('/admin/api/health');
+        const data = await response.json();
+
+        resultDiv.className = 'action-result success';
+        resultDiv.innerHTML = `
+            <strong>🏥 Health Check Completo</strong><br>
+            API: ${data.api}<br>
+            Database: ${data.database}<br>
+            Security: ${data.security}
+        `;
+        resultDiv.style.display = 'block';
+    } catch (error) {
+        resultDiv.className = 'action-result error';
+        resultDiv.textContent = '❌ Health check falló: ' + error.message;
+        resultDiv.style.display = 'block';
+    }
+}
+
+// Abrir documentación
+function openDocs() {
+    window.open('/docs', '_blank');
+}
+
+// Mostrar notificación
+function showNotification(message, type = 'info') {
+    // Crear elemento de notificación
+    const notification = document.createElement('div');
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        padding: 15px 20px;
+        border-radius: 8px;
+        color: white;
+        font-weight: 500;
+        z-index: 1000;
+        animation: slideIn 0.3s ease;
+    `;
+
+    // Colores según tipo
+    if (type === 'success') {
+        notification.style.background = '#27ae60';
+    } else if (type === 'error') {
+        notification.style.background = '#e74c3c';
+    } else {
+        notification.style.background = '#3498db';
+    }
+
+    notification.textContent = message;
+    document.body.appendChild(notification);
+
+    // Remover después de 3 segundos
+    setTimeout(() => {
+        notification.remove();
+    }, 3000);
+}
+
+// Estilos para animaciones
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes slideIn {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+`;
+document.head.appendChild(style);
@@ -0,0 +1,197 @@
+"""
+🔥 DATACRYPT LABS - ON-DEMAND STACK SAMPLER
+Profiler estadístico bajo demanda: muestrea las pilas de todos los threads
+Filosofía Mejora Continua: Perfilar producción sin adjuntar herramientas
+
+- Un thread dedicado lee sys._current_frames() cada `interval` segundos
+  durante N segundos: ve el event loop y los threads del executor sin
+  instrumentar nada (coste ~ proporcional al número de threads).
+- Resultado en formato "collapsed stacks" (flamegraph.pl, speedscope,
+  inferno) o JSON de speedscope con un perfil por thread.
+- Una única sesión por proceso: una segunda petición concurrente recibe
+  SamplerBusy.
+- Por defecto se descartan las muestras ociosas (loop en select, workers
+  esperando en la cola) para que el gráfico muestre solo trabajo real.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+# Ficheros cuyo frame hoja indica un thread esperando, no trabajando
+IDLE_LEAF_FILES = ("selectors.py", "threading.py", "queue.py")
+MAX_SECONDS = 60.0
+MIN_INTERVAL = 0.001
+FORMATS = ("collapsed", "speedscope")
+
+Frame = Tuple[str, str, int]  # (función, fichero, línea de definición)
+
+class SamplerBusy(RuntimeError):
+    """Ya hay una sesión de profiling en curso en este proceso"""
+
+class SamplingProfile:
+    """Pilas agregadas de una sesión, por thread"""
+
+    def __init__(self, interval: float, duration: float, samples: int,
+                 stacks: Dict[str, "Counter[Tuple[Frame, ...]]"]):
+        self.interval = interval
+        self.duration = duration
+        self.samples = samples
+        self.stacks = stacks
+
+    def collapsed(self) -> str:
+        """Una línea por pila: 'thread;raíz;...;hoja N'"""
+        lines = []
+        for thread, counter in self.stacks.items():
+            for stack, count in counter.most_common():
+                names = [thread] + [f"{name} ({path}:{line})" for name, path, line in stack]
+                lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> Dict[str, object]:
+        """Documento speedscope (perfil 'sampled' por thread, pesos en segundos)"""
+        frames: List[Dict[str, object]] = []
+        index: Dict[Frame, int] = {}
+        profiles = []
+        for thread, counter in self.stacks.items():
+            samples, weights = [], []
+            for stack, count in counter.most_common():
+                ids = []
+                for frame in stack:
+                    if frame not in index:
+                        index[frame] = len(frames)
+                        frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                    ids.append(index[frame])
+                samples.append(ids)
+                weights.append(round(count * self.interval, 6))
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"datacrypt-labs pid {os.getpid()} ({self.duration:.1f}s @ {self.interval * 1000:g}ms)",
+            "exporter": "datacrypt-labs",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles
+        }
+
+class StackSampler:
+    """Muestreador de pilas con guarda de una sesión por proceso"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or os.getcwd())
+        self._session = threading.Lock()
+        self.last_run: Optional[Dict[str, object]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._session.locked()
+
+    def _location(self, path: str) -> str:
+        """Rutas del proyecto relativas; las de librerías desde site-packages/lib"""
+        if path.startswith(self.root):
+            return os.path.relpath(path, self.root)
+        for marker in ("site-packages" + os.sep, "lib" + os.sep + "python"):
+            position = path.find(marker)
+            if position >= 0:
+                return path[position:]
+        return path
+
+    def sample(self, seconds: float, interval: float = 0.01, include_idle: bool = False,
+               loop_thread: Optional[int] = None) -> SamplingProfile:
+        """Muestrea durante `seconds` (bloqueante: ejecutar en un thread)"""
+        if not self._session.acquire(blocking=False):
+            raise SamplerBusy("A profiling session is already running")
+        try:
+            seconds = max(0.1, min(seconds, MAX_SECONDS))
+            interval = max(MIN_INTERVAL, interval)
+            own = threading.get_ident()
+            labels: Dict[int, str] = {}
+            stacks: Dict[str, "Counter[Tuple[Frame, ...]]"] = {}
+            locations: Dict[str, str] = {}
+            samples = 0
+            started = time.perf_counter()
+            deadline = started + seconds
+            next_tick = started
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                if now < next_tick:
+                    time.sleep(next_tick - now)
+                next_tick = max(next_tick, now) + interval
+                samples += 1
+                for ident, frame in sys._current_frames().items():
+                    if ident == own:
+                        continue
+                    if not include_idle and frame.f_code.co_filename.endswith(IDLE_LEAF_FILES):
+                        continue
+                    stack: List[Frame] = []
+                    while frame is not None:
+                        code = frame.f_code
+                        path = locations.get(code.co_filename)
+                        if path is None:
+                            path = locations[code.co_filename] = self._location(code.co_filename)
+                        stack.append((code.co_qualname, path, code.co_firstlineno))
+                        frame = frame.f_back
+                    stack.reverse()
+                    label = labels.get(ident)
+                    if label is None:
+                        label = labels[ident] = self._thread_label(ident, loop_thread)
+                    stacks.setdefault(label, Counter())[tuple(stack)] += 1
+            duration = time.perf_counter() - started
+            self.last_run = {
+                "finished_at": time.time(),
+                "duration": round(duration, 3),
+                "interval": interval,
+                "samples": samples,
+                "threads": len(stacks)
+            }
+            return SamplingProfile(interval, duration, samples, stacks)
+        finally:
+            self._session.release()
+
+    @staticmethod
+    def _thread_label(ident: int, loop_thread: Optional[int]) -> str:
+        if ident == loop_thread:
+            return "event-loop"
+        for thread in threading.enumerate():
+            if thread.ident == ident:
+                return thread.name
+        return f"thread-{ident}"
+
+    def stats(self) -> Dict[str, object]:
+        return {"running": self.running, "last_run": self.last_run}
+
+def profile_response(profile: SamplingProfile, format: str = "collapsed") -> Response:
+    """Respuesta descargable en el formato pedido"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    if format == "speedscope":
+        return JSONResponse(
+            profile.speedscope(),
+            headers={"Content-Disposition": f'attachment; filename="profile-{stamp}.speedscope.json"'}
+        )
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={"Content-Disposition": f'inline; filename="profile-{stamp}.folded"'}
+    )
+
+# Una sesión por proceso: instancia compartida
+stack_sampler = StackSampler()
+
+__all__ = [
+    "StackSampler", "SamplingProfile", "SamplerBusy", "stack_sampler",
+    "profile_response", "FORMATS", "MAX_SECONDS"
+]
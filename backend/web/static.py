@@ -0,0 +1,188 @@
+"""
+📦 DATACRYPT LABS - PRECOMPRESSED STATIC FILES
+StaticFiles que sirve variantes .br/.gz generadas una sola vez
+Filosofía Mejora Continua: Comprimir en build, no en cada request
+"""
+
+import mimetypes
+import os
+import re
+import stat
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .compression import available_encodings, compress_bytes, negotiate_encoding
+from .documents import DocumentResponse
+
+# Extensiones de texto que se precomprimen
+PRECOMPRESS_EXTENSIONS = (".css", ".js", ".html", ".svg", ".json", ".xml", ".txt", ".map")
+# Directorios que nunca forman parte del sitio servido
+SKIP_DIRS = {".git", ".github", "__pycache__", "node_modules", "venv", ".venv", "data", "backend"}
+# Documentos grandes servidos con Range/ETag fuerte (ver backend.web.documents)
+DOCUMENT_EXTENSIONS = (".pdf",)
+# Sufijo de fichero por encoding
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+# Assets con hash de contenido: <nombre>.<hash>.<ext> (ver backend.web.assets)
+HASH_LENGTH = 10
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{%d}\.(css|js)$" % HASH_LENGTH)
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles que prefiere el sibling .br/.gz aceptado por el cliente
+
+    El sibling solo se usa si existe y no es más antiguo que el original;
+    si falta se sirve el fichero normal (y el middleware de compresión
+    decide). El ETag sale del stat del sibling, distinto por encoding.
+    Los documentos (PDF) van por DocumentResponse: Range/If-Range y 206.
+    """
+
+    def file_response(
+        self,
+        full_path: Union[str, "os.PathLike[str]"],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if str(full_path).lower().endswith(DOCUMENT_EXTENSIONS) and status_code == 200:
+            return DocumentResponse(full_path, stat_result, media_type=mimetypes.guess_type(str(full_path))[0])
+        request_headers = Headers(scope=scope)
+        variant = self._find_variant(str(full_path), stat_result, request_headers.get("accept-encoding", ""))
+        if variant is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.setdefault("vary", "Accept-Encoding")
+            return response
+
+        variant_path, variant_stat, encoding = variant
+        response = FileResponse(
+            variant_path,
+            status_code=status_code,
+            stat_result=variant_stat,
+            method=scope["method"],
+            media_type=mimetypes.guess_type(str(full_path))[0] or "text/plain",
+            headers={"content-encoding": encoding, "vary": "Accept-Encoding"}
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _find_variant(
+        full_path: str, stat_result: os.stat_result, accept_encoding: str
+    ) -> Optional[Tuple[str, os.stat_result, str]]:
+        """Busca el sibling precomprimido vigente para el encoding negociado"""
+        if not accept_encoding or not full_path.endswith(PRECOMPRESS_EXTENSIONS):
+            return None
+        encodings = [e for e in available_encodings() if e in ENCODING_SUFFIXES]
+        while encodings:
+            encoding = negotiate_encoding(accept_encoding, encodings)
+            if encoding is None:
+                return None
+            variant_path = full_path + ENCODING_SUFFIXES[encoding]
+            try:
+                variant_stat = os.stat(variant_path)
+            except OSError:
+                variant_stat = None
+            if variant_stat and stat.S_ISREG(variant_stat.st_mode) and variant_stat.st_mtime >= stat_result.st_mtime:
+                return variant_path, variant_stat, encoding
+            encodings.remove(encoding)
+        return None
+
+class AssetStaticFiles(PrecompressedStaticFiles):
+    """Sirve la salida de build_assets superpuesta a la raíz del sitio
+
+    - Los ficheros de build_dir tienen prioridad (páginas reescritas y
+      assets con hash); el resto (imágenes, PDFs) sale de la raíz.
+    - Assets con hash: Cache-Control immutable de un año.
+    - Páginas HTML: no-cache, el navegador revalida con ETag/If-None-Match
+      y recibe 304 mientras no cambien.
+    """
+
+    IMMUTABLE = "public, max-age=31536000, immutable"
+    REVALIDATE = "no-cache"
+
+    def __init__(self, *args, build_dir: Optional[Union[str, Path]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.build_dir = Path(build_dir).resolve() if build_dir else None
+        if self.build_dir is not None:
+            self.all_directories = [self.build_dir] + list(self.all_directories)
+
+    def file_response(
+        self,
+        full_path: Union[str, "os.PathLike[str]"],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        full_path = str(full_path)
+        if self._is_hashed_asset(full_path):
+            response.headers["cache-control"] = self.IMMUTABLE
+        elif full_path.endswith(".html"):
+            response.headers["cache-control"] = self.REVALIDATE
+        return response
+
+    def _is_hashed_asset(self, full_path: str) -> bool:
+        """Asset generado por build_assets (nombre con hash de contenido)"""
+        return (
+            self.build_dir is not None
+            and full_path.startswith(str(self.build_dir) + os.sep)
+            and HASHED_NAME_RE.search(full_path) is not None
+        )
+
+def precompress_directory(
+    root: Union[str, Path],
+    extensions: Iterable[str] = PRECOMPRESS_EXTENSIONS,
+    min_size: int = 1024,
+    skip_dirs: Iterable[str] = SKIP_DIRS
+) -> Dict[str, int]:
+    """Genera siblings .br/.gz (nivel máximo) para los assets de texto
+
+    Es incremental: un sibling más nuevo que su original no se regenera.
+    Si la variante no ahorra bytes se elimina para no servirla.
+    """
+    root = Path(root)
+    extensions = tuple(extensions)
+    skip_dirs = set(skip_dirs)
+    max_levels = {"br": 11, "gzip": 9}
+    stats = {"files": 0, "written": 0, "up_to_date": 0, "skipped": 0, "bytes_saved": 0}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in skip_dirs and not d.startswith(".")]
+        for filename in filenames:
+            if not filename.endswith(extensions):
+                continue
+            source = Path(dirpath) / filename
+            source_stat = source.stat()
+            if source_stat.st_size < min_size:
+                stats["skipped"] += 1
+                continue
+            stats["files"] += 1
+            data = None
+            for encoding in available_encodings():
+                target = source.with_name(filename + ENCODING_SUFFIXES[encoding])
+                if target.exists() and target.stat().st_mtime >= source_stat.st_mtime:
+                    stats["up_to_date"] += 1
+                    continue
+                if data is None:
+                    data = source.read_bytes()
+                compressed = compress_bytes(data, encoding, max_levels[encoding])
+                if len(compressed) >= len(data):
+                    target.unlink(missing_ok=True)
+                    continue
+                tmp = target.with_name(target.name + ".tmp")
+                tmp.write_bytes(compressed)
+                os.replace(tmp, target)
+                stats["written"] += 1
+                stats["bytes_saved"] += len(data) - len(compressed)
+    return stats
+
+if __name__ == "__main__":
+    # Paso de build: python -m backend.web.static [directorio]
+    target_root = sys.argv[1] if len(sys.argv) > 1 else "."
+    result = precompress_directory(target_root)
+    print(f"🗜️ Precompresión de {target_root}: {result}")
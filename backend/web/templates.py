@@ -0,0 +1,152 @@
+"""
+🧩 DATACRYPT LABS - COMPILED PAGE TEMPLATES
+Plantillas HTML/CSS/JS compiladas una vez y servidas desde memoria
+Filosofía Mejora Continua: Construir la página una vez, no en cada visita
+
+Sintaxis mínima: {{ nombre }} marca un fragmento dinámico (se escapa como
+HTML). Los fragmentos constantes del proceso se pasan al registrar y quedan
+horneados en la compilación; el resto se rellena por request.
+
+Cada combinación de fragmentos se renderiza una sola vez (caché LRU) con su
+ETag y sus variantes br/gzip en memoria: los fragmentos deben ser de baja
+cardinalidad (estados, modos); los datos que cambian en cada request van
+por las APIs JSON.
+"""
+
+import hashlib
+import html
+import re
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .compression import available_encodings, compress_bytes, negotiate_encoding
+
+# Plantillas del panel admin (HTML/CSS/JS que antes vivían como literales)
+PAGES_DIR = Path(__file__).parent / "pages"
+SLOT_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+MEDIA_TYPES = {
+    ".html": "text/html",
+    ".css": "text/css",
+    ".js": "application/javascript; charset=utf-8",
+}
+# Variantes precomprimidas: nivel máximo, se pagan una vez por render
+COMPRESSION_LEVELS = {"br": 11, "gzip": 9}
+RENDER_CACHE_SIZE = 32
+
+class RenderedPage:
+    """Bytes finales de una página con su ETag y variantes comprimidas"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:20]}"'
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        self.variants: Dict[str, bytes] = {
+            encoding: compress_bytes(body, encoding, COMPRESSION_LEVELS[encoding])
+            for encoding in available_encodings()
+        }
+
+class CompiledTemplate:
+    """Plantilla partida en segmentos de bytes fijos + nombres de fragmentos"""
+
+    def __init__(self, name: str, source: str, media_type: str, constants: Optional[Dict[str, object]] = None):
+        self.name = name
+        self.media_type = media_type
+        constants = constants or {}
+        self.segments: List[bytes] = []
+        self.slots: List[str] = []
+        position = 0
+        pending = ""
+        for match in SLOT_RE.finditer(source):
+            pending += source[position:match.start()]
+            position = match.end()
+            slot = match.group(1)
+            if slot in constants:
+                pending += html.escape(str(constants[slot]))
+                continue
+            self.segments.append(pending.encode("utf-8"))
+            self.slots.append(slot)
+            pending = ""
+        self.segments.append((pending + source[position:]).encode("utf-8"))
+        self._rendered: "OrderedDict[Tuple[str, ...], RenderedPage]" = OrderedDict()
+        self._lock = Lock()
+
+    def render(self, values: Optional[Dict[str, object]] = None) -> RenderedPage:
+        """Página para estos fragmentos (memoizada, LRU acotada)"""
+        values = values or {}
+        missing = [slot for slot in self.slots if slot not in values]
+        if missing:
+            raise KeyError(f"Template {self.name} missing fragments: {missing}")
+        key = tuple(html.escape(str(values[slot])) for slot in self.slots)
+        with self._lock:
+            page = self._rendered.get(key)
+            if page is not None:
+                self._rendered.move_to_end(key)
+                return page
+
+        parts = [self.segments[0]]
+        for fragment, segment in zip(key, self.segments[1:]):
+            parts.append(fragment.encode("utf-8"))
+            parts.append(segment)
+        page = RenderedPage(b"".join(parts))
+
+        with self._lock:
+            self._rendered[key] = page
+            if len(self._rendered) > RENDER_CACHE_SIZE:
+                self._rendered.popitem(last=False)
+        return page
+
+class TemplateCache:
+    """Registro de plantillas de un directorio, compiladas al registrarlas"""
+
+    def __init__(self, directory: Union[str, Path] = PAGES_DIR, cache_control: str = "no-cache"):
+        self.directory = Path(directory)
+        self.cache_control = cache_control
+        self.templates: Dict[str, CompiledTemplate] = {}
+
+    def register(self, name: str, media_type: Optional[str] = None, **constants) -> CompiledTemplate:
+        """Compila la plantilla (constants se hornean en la compilación)"""
+        path = self.directory / name
+        template = CompiledTemplate(
+            name,
+            path.read_text(encoding="utf-8"),
+            media_type or MEDIA_TYPES.get(path.suffix, "text/plain"),
+            constants
+        )
+        if not template.slots:
+            template.render()  # Páginas estáticas: bytes y variantes listos desde el arranque
+        self.templates[name] = template
+        return template
+
+    def response(self, name: str, request: Request, **values) -> Response:
+        """Respuesta con ETag/Last-Modified, 304 y la variante br/gzip aceptada"""
+        template = self.templates[name]
+        page = template.render(values)
+        headers = {
+            "ETag": page.etag,
+            "Last-Modified": page.last_modified,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        request_headers: Headers = request.headers
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            if page.etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+                return Response(status_code=304, headers=headers)
+        elif request_headers.get("if-modified-since") == page.last_modified:
+            return Response(status_code=304, headers=headers)
+
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""), page.variants)
+        if encoding is None:
+            return Response(page.body, media_type=template.media_type, headers=headers)
+        headers["Content-Encoding"] = encoding
+        return Response(page.variants[encoding], media_type=template.media_type, headers=headers)
+
+__all__ = ["TemplateCache", "CompiledTemplate", "RenderedPage", "PAGES_DIR"]
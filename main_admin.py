@@ -5,8 +5,7 @@ Sistema completo con backend + administración
 
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 import uvicorn
 from pathlib import Path
@@ -14,6 +13,17 @@ import os
 from datetime import datetime
 import psutil
 import secrets
+import asyncio
+import threading
+from typing import Optional
+
+from backend.web import CompressionMiddleware, AssetStaticFiles, build_assets, precompress_directory
+from backend.web.images import ImagePipeline, VARIANT_WIDTHS, FORMATS, negotiate_format, snap_width
+from backend.web.documents import DocumentStore, THUMBNAIL_WIDTHS, thumbnail_backend
+from backend.web.templates import TemplateCache
+from backend.web.live import live_metrics, SSE_HEADERS
+from backend.web.logs import LogStore, LogFollower, LogFilter, DEFAULT_LOG_FILE
+from backend.web.sampling import stack_sampler, profile_response, SamplerBusy, FORMATS as PROFILE_FORMATS
 
 # Crear instancia de FastAPI
 app = FastAPI(
@@ -34,6 +44,13 @@ app.add_middleware(
     allow_headers=["Accept", "Authorization", "Content-Type"],  # Headers específicos
 )
 
+# Compresión br/gzip negociada para respuestas dinámicas
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    offload_size=int(os.getenv("COMPRESSION_OFFLOAD_SIZE", str(64 * 1024))),
+)
+
 # Seguridad básica para admin
 security = HTTPBasic()
 
@@ -54,9 +71,102 @@ def verify_admin_credentials(credentials: HTTPBasicCredentials = Depends(securit
         )
     return credentials.username
 
-# Servir archivos estáticos del frontend
+# Servir archivos estáticos del frontend: build con hash superpuesto a la raíz
+# (assets inmutables + variantes .br/.gz precomprimidas)
 static_path = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=static_path), name="static")
+build_path = static_path / "build"
+app.mount("/static", AssetStaticFiles(directory=static_path, build_dir=build_path), name="static")
+
+def prepare_static_assets():
+    """Build de assets con hash y precompresión (bloqueante, corre en un thread)"""
+    if os.getenv("BUILD_ASSETS", "true").lower() == "true":
+        manifest = build_assets(static_path, build_path)
+        print(f"🏗️ Assets con hash: {len(manifest['files'])} ficheros, {len(manifest['bundles'])} bundles")
+    if os.getenv("PRECOMPRESS_STATIC", "true").lower() == "true":
+        result = precompress_directory(static_path)
+        print(f"🗜️ Estáticos precomprimidos: {result}")
+
+@app.on_event("startup")
+async def prepare_static_assets_on_startup():
+    """🏗️ Generar assets con hash y variantes .br/.gz una sola vez al arrancar"""
+    await asyncio.to_thread(prepare_static_assets)
+
+# ==========================================
+# IMÁGENES RESPONSIVE
+# ==========================================
+
+# Variantes por ancho/formato cacheadas en disco; el trabajo de Pillow
+# corre en un process pool para no bloquear la API
+image_pipeline = ImagePipeline(
+    static_path,
+    os.getenv("IMAGE_CACHE_DIR", str(static_path / "data" / "cache" / "images")),
+    max_workers=int(os.getenv("IMAGE_WORKERS", "0")) or None
+)
+
+@app.get("/media/{image_path:path}")
+async def responsive_image(image_path: str, request: Request, w: int = 960, fmt: Optional[str] = None):
+    """🖼️ Imagen redimensionada (w = ancho deseado, fmt = avif|webp|jpeg o según Accept)"""
+    source = image_pipeline.resolve_source(image_path)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Imagen no encontrada")
+    
+    cache_headers = {"Cache-Control": "public, max-age=604800", "Vary": "Accept"}
+    if not image_pipeline.available:
+        return FileResponse(source, headers=cache_headers)
+    
+    if fmt is None:
+        fmt = negotiate_format(request.headers.get("accept", ""), image_pipeline.formats)
+    elif fmt not in image_pipeline.formats:
+        raise HTTPException(status_code=400, detail=f"Formato no soportado. Opciones: {list(image_pipeline.formats)}")
+    
+    width = snap_width(max(1, w))
+    variant = await image_pipeline.get_variant(source, width, fmt)
+    return FileResponse(variant, media_type=FORMATS[fmt][1], headers=cache_headers)
+
+@app.get("/api/media/widths")
+async def responsive_image_widths():
+    """📐 Anchos y formatos disponibles para construir srcset"""
+    return {"widths": list(VARIANT_WIDTHS), "formats": list(image_pipeline.formats)}
+
+@app.on_event("shutdown")
+async def shutdown_image_pipeline():
+    """Liberar el process pool de imágenes"""
+    image_pipeline.shutdown()
+
+# ==========================================
+# DOCUMENTOS (CERTIFICACIONES)
+# ==========================================
+
+# Los PDFs bajo /static/Certificaciones ya salen con Range/ETag fuerte;
+# aquí viven el catálogo y las miniaturas de primera página cacheadas
+document_store = DocumentStore(
+    static_path,
+    os.getenv("THUMBNAIL_CACHE_DIR", str(static_path / "data" / "cache" / "thumbnails"))
+)
+
+@app.get("/thumbnails/{document_path:path}")
+async def document_thumbnail(document_path: str, w: int = THUMBNAIL_WIDTHS[0]):
+    """🖼️ Miniatura PNG de la primera página (w = ancho deseado)"""
+    resolved = document_store.resolve(document_path)
+    if resolved is None:
+        raise HTTPException(status_code=404, detail="Documento no encontrado")
+    if thumbnail_backend() is None:
+        raise HTTPException(status_code=503, detail="Miniaturas no disponibles (instalar PyMuPDF)")
+    
+    width = snap_width(max(1, w), THUMBNAIL_WIDTHS)
+    thumbnail = await document_store.thumbnail(*resolved, width)
+    return FileResponse(thumbnail, media_type="image/png", headers={"Cache-Control": "public, max-age=604800"})
+
+@app.get("/api/documents")
+async def list_documents():
+    """📚 Catálogo de certificaciones con ETag para la galería"""
+    documents = await asyncio.to_thread(document_store.list_documents)
+    return {"documents": documents, "thumbnails": thumbnail_backend() is not None}
+
+@app.on_event("shutdown")
+async def shutdown_document_store():
+    """Liberar el process pool de miniaturas"""
+    document_store.shutdown()
 
 # ==========================================
 # ENDPOINTS PRINCIPALES DEL SISTEMA
@@ -154,6 +264,26 @@ async def connect_server(admin: str = Depends(verify_admin_credentials)):
         "timestamp": datetime.now().isoformat()
     }
 
+def sample_server_state():
+    """Estado del servidor para el stream del panel"""
+    return {
+        "active": server_status["active"],
+        "mode": server_status["mode"],
+        "uptime_seconds": int((datetime.now() - server_status["start_time"]).total_seconds())
+    }
+
+live_metrics.add_source("server", sample_server_state)
+
+@app.get("/admin/api/stream")
+async def admin_metrics_stream(admin: str = Depends(verify_admin_credentials)):
+    """📡 Métricas en vivo (SSE): snapshot inicial + deltas de un productor compartido"""
+    return StreamingResponse(live_metrics.stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@app.get("/admin/api/stream/stats")
+async def admin_metrics_stream_stats(admin: str = Depends(verify_admin_credentials)):
+    """📊 Suscriptores y muestras del productor de métricas en vivo"""
+    return live_metrics.stats()
+
 @app.get("/admin/api/server/status")
 async def get_server_status(admin: str = Depends(verify_admin_credentials)):
     """📊 Obtener estado actual del servidor"""
@@ -169,567 +299,23 @@ async def get_server_status(admin: str = Depends(verify_admin_credentials)):
 # PANEL ADMINISTRATIVO
 # ==========================================
 
+# Páginas compiladas una vez al arrancar: bytes, ETag y variantes br/gzip en
+# memoria; solo el estado del servidor se rellena por request
+admin_templates = TemplateCache()
+admin_templates.register("admin/dashboard.html")
+admin_templates.register("admin/login.html")
+
 @app.get("/admin/dashboard", response_class=HTMLResponse)
-async def admin_dashboard():
+async def admin_dashboard(request: Request):
     """🎛️ Dashboard Principal del Admin"""
-    return HTMLResponse(content="""
-    <!DOCTYPE html>
-    <html lang="es" data-theme="dark">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>DataCrypt Labs - Admin Dashboard</title>
-        <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-        <style>
-            :root {
-                --primary-color: #3b82f6;
-                --secondary-color: #1e293b;
-                --accent-color: #fbbf24;
-                --bg-primary: #0f172a;
-                --bg-secondary: #1e293b;
-                --text-primary: #ffffff;
-                --text-secondary: #e5e7eb;
-            }
-            
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            
-            body {
-                font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-                background: var(--bg-primary);
-                color: var(--text-primary);
-                line-height: 1.6;
-            }
-            
-            .admin-container {
-                display: grid;
-                grid-template-columns: 250px 1fr;
-                min-height: 100vh;
-            }
-            
-            .sidebar {
-                background: var(--bg-secondary);
-                padding: 2rem 1rem;
-                border-right: 1px solid rgba(59, 130, 246, 0.1);
-            }
-            
-            .logo {
-                display: flex;
-                align-items: center;
-                gap: 0.5rem;
-                margin-bottom: 2rem;
-                font-size: 1.2rem;
-                font-weight: bold;
-                color: var(--primary-color);
-            }
-            
-            .nav-menu {
-                list-style: none;
-            }
-            
-            .nav-item {
-                margin-bottom: 0.5rem;
-            }
-            
-            .nav-link {
-                display: flex;
-                align-items: center;
-                gap: 0.75rem;
-                padding: 0.75rem 1rem;
-                color: var(--text-secondary);
-                text-decoration: none;
-                border-radius: 0.5rem;
-                transition: all 0.2s;
-            }
-            
-            .nav-link:hover, .nav-link.active {
-                background: rgba(59, 130, 246, 0.1);
-                color: var(--primary-color);
-            }
-            
-            .main-content {
-                padding: 2rem;
-                overflow-y: auto;
-            }
-            
-            .header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 2rem;
-                padding-bottom: 1rem;
-                border-bottom: 1px solid rgba(59, 130, 246, 0.1);
-            }
-            
-            .header h1 {
-                font-size: 1.5rem;
-                font-weight: 600;
-            }
-            
-            .stats-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 1.5rem;
-                margin-bottom: 2rem;
-            }
-            
-            .stat-card {
-                background: var(--bg-secondary);
-                padding: 1.5rem;
-                border-radius: 0.75rem;
-                border: 1px solid rgba(59, 130, 246, 0.1);
-            }
-            
-            .stat-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 0.75rem;
-            }
-            
-            .stat-title {
-                font-size: 0.875rem;
-                color: var(--text-secondary);
-                font-weight: 500;
-            }
-            
-            .stat-value {
-                font-size: 1.5rem;
-                font-weight: bold;
-                color: var(--primary-color);
-            }
-            
-            .stat-icon {
-                width: 2rem;
-                height: 2rem;
-                background: rgba(59, 130, 246, 0.1);
-                border-radius: 0.5rem;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: var(--primary-color);
-            }
-            
-            .section {
-                background: var(--bg-secondary);
-                border-radius: 0.75rem;
-                padding: 1.5rem;
-                margin-bottom: 1.5rem;
-                border: 1px solid rgba(59, 130, 246, 0.1);
-            }
-            
-            .section-title {
-                font-size: 1.1rem;
-                font-weight: 600;
-                margin-bottom: 1rem;
-                display: flex;
-                align-items: center;
-                gap: 0.5rem;
-            }
-            
-            .btn {
-                display: inline-flex;
-                align-items: center;
-                gap: 0.5rem;
-                padding: 0.5rem 1rem;
-                background: var(--primary-color);
-                color: white;
-                text-decoration: none;
-                border-radius: 0.5rem;
-                border: none;
-                cursor: pointer;
-                font-size: 0.875rem;
-                transition: all 0.2s;
-            }
-            
-            .btn:hover {
-                background: #2563eb;
-                transform: translateY(-1px);
-            }
-            
-            .status-indicator {
-                display: inline-flex;
-                align-items: center;
-                gap: 0.25rem;
-                font-size: 0.75rem;
-                font-weight: 500;
-            }
-            
-            .status-indicator.online {
-                color: #10b981;
-            }
-            
-            .status-dot {
-                width: 0.5rem;
-                height: 0.5rem;
-                border-radius: 50%;
-                background: currentColor;
-            }
-            
-            @media (max-width: 768px) {
-                .admin-container {
-                    grid-template-columns: 1fr;
-                }
-                .sidebar {
-                    display: none;
-                }
-            }
-        </style>
-    </head>
-    <body>
-        <div class="admin-container">
-            <nav class="sidebar">
-                <div class="logo">
-                    <i class="fas fa-shield-alt"></i>
-                    <span>DataCrypt Admin</span>
-                </div>
-                
-                <ul class="nav-menu">
-                    <li class="nav-item">
-                        <a href="#dashboard" class="nav-link active">
-                            <i class="fas fa-home"></i>
-                            Dashboard
-                        </a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="#system" class="nav-link">
-                            <i class="fas fa-server"></i>
-                            Sistema
-                        </a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="#users" class="nav-link">
-                            <i class="fas fa-users"></i>
-                            Usuarios
-                        </a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="#analytics" class="nav-link">
-                            <i class="fas fa-chart-bar"></i>
-                            Analytics
-                        </a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="#settings" class="nav-link">
-                            <i class="fas fa-cog"></i>
-                            Configuración
-                        </a>
-                    </li>
-                    <li class="nav-item">
-                        <a href="#logs" class="nav-link">
-                            <i class="fas fa-file-alt"></i>
-                            Logs
-                        </a>
-                    </li>
-                </ul>
-            </nav>
-            
-            <main class="main-content">
-                <header class="header">
-                    <h1>🎛️ Panel Administrativo</h1>
-                    <div class="status-indicator online">
-                        <span class="status-dot"></span>
-                        Sistema Operativo
-                    </div>
-                </header>
-                
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <span class="stat-title">Estado del Sistema</span>
-                            <div class="stat-icon">
-                                <i class="fas fa-check"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value">Operativo</div>
-                    </div>
-                    
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <span class="stat-title">Versión</span>
-                            <div class="stat-icon">
-                                <i class="fas fa-code-branch"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value">v3.0.0</div>
-                    </div>
-                    
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <span class="stat-title">Uptime</span>
-                            <div class="stat-icon">
-                                <i class="fas fa-clock"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value" id="uptime">--:--:--</div>
-                    </div>
-                    
-                    <div class="stat-card">
-                        <div class="stat-header">
-                            <span class="stat-title">Performance</span>
-                            <div class="stat-icon">
-                                <i class="fas fa-tachometer-alt"></i>
-                            </div>
-                        </div>
-                        <div class="stat-value">Optimizado</div>
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2 class="section-title">
-                        <i class="fas fa-server"></i>
-                        Información del Sistema
-                    </h2>
-                    <p>Sistema DataCrypt Labs v3.0 - Transformación completa implementada</p>
-                    <ul style="margin: 1rem 0; color: var(--text-secondary);">
-                        <li>✅ Sistema Unificado: Activo</li>
-                        <li>✅ CSS Modular: Implementado</li>
-                        <li>✅ JavaScript Optimizado: 4,400+ líneas eliminadas</li>
-                        <li>✅ Performance: 60-80% mejorado</li>
-                        <li>✅ Arquitectura: Limpia y escalable</li>
-                    </ul>
-                    <button class="btn" onclick="refreshSystemInfo()">
-                        <i class="fas fa-sync"></i>
-                        Actualizar Info
-                    </button>
-                </div>
-                
-                <div class="section">
-                    <h2 class="section-title">
-                        <i class="fas fa-power-off"></i>
-                        Control del Servidor
-                    </h2>
-                    <div style="display: flex; gap: 1rem; align-items: center; margin-bottom: 1rem;">
-                        <div id="server-status" class="status-indicator online">
-                            <span class="status-dot"></span>
-                            <span id="server-status-text">Online</span>
-                        </div>
-                        <span style="color: var(--text-secondary); font-size: 0.9rem;" id="server-mode">Modo: Operativo</span>
-                    </div>
-                    <div style="display: flex; gap: 1rem; flex-wrap: wrap;">
-                        <button class="btn" id="connect-btn" onclick="connectServer()" style="background: #10b981;">
-                            <i class="fas fa-play"></i>
-                            Conectar Servidor
-                        </button>
-                        <button class="btn" id="disconnect-btn" onclick="disconnectServer()" style="background: #ef4444;">
-                            <i class="fas fa-stop"></i>
-                            Desconectar Servidor
-                        </button>
-                        <button class="btn" onclick="checkServerStatus()">
-                            <i class="fas fa-info-circle"></i>
-                            Estado del Servidor
-                        </button>
-                    </div>
-                    <div id="server-response" style="margin-top: 1rem; padding: 0.75rem; background: rgba(59, 130, 246, 0.1); border-radius: 0.5rem; display: none;">
-                        <small id="server-message" style="color: var(--text-secondary);"></small>
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2 class="section-title">
-                        <i class="fas fa-chart-line"></i>
-                        Acciones Rápidas
-                    </h2>
-                    <div style="display: flex; gap: 1rem; flex-wrap: wrap;">
-                        <button class="btn" onclick="testSystemHealth()">
-                            <i class="fas fa-heartbeat"></i>
-                            Test Health
-                        </button>
-                        <button class="btn" onclick="viewLogs()">
-                            <i class="fas fa-file-alt"></i>
-                            Ver Logs
-                        </button>
-                        <button class="btn" onclick="systemStats()">
-                            <i class="fas fa-chart-bar"></i>
-                            Estadísticas
-                        </button>
-                        <a href="/api/docs" class="btn">
-                            <i class="fas fa-book"></i>
-                            API Docs
-                        </a>
-                    </div>
-                </div>
-                
-                <div class="section">
-                    <h2 class="section-title">
-                        <i class="fas fa-tools"></i>
-                        Estado de Componentes
-                    </h2>
-                    <div id="components-status">
-                        <div style="display: grid; gap: 0.5rem;">
-                            <div style="display: flex; justify-content: space-between;">
-                                <span>DataCryptUnifiedManager</span>
-                                <span style="color: #10b981;">✅ Activo</span>
-                            </div>
-                            <div style="display: flex; justify-content: space-between;">
-                                <span>ConfigurationService</span>
-                                <span style="color: #10b981;">✅ Activo</span>
-                            </div>
-                            <div style="display: flex; justify-content: space-between;">
-                                <span>CSS Modular System</span>
-                                <span style="color: #10b981;">✅ Activo</span>
-                            </div>
-                            <div style="display: flex; justify-content: space-between;">
-                                <span>Frontend Optimizado</span>
-                                <span style="color: #10b981;">✅ Activo</span>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </main>
-        </div>
-        
-        <script>
-            // Actualizar tiempo de actividad
-            let startTime = Date.now();
-            function updateUptime() {
-                const now = Date.now();
-                const diff = now - startTime;
-                const hours = Math.floor(diff / 3600000);
-                const minutes = Math.floor((diff % 3600000) / 60000);
-                const seconds = Math.floor((diff % 60000) / 1000);
-                document.getElementById('uptime').textContent = 
-                    `${hours.toString().padStart(2, '0')}:${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
-            }
-            setInterval(updateUptime, 1000);
-            
-            // Funciones de administración
-            async function testSystemHealth() {
-                try {
-                    const response = await fetch('/api/health');
-                    const data = await response.json();
-                    alert(`Sistema Health Check:\\n\\nStatus: ${data.status}\\nService: ${data.service}\\nVersion: ${data.version}\\nTimestamp: ${data.timestamp}`);
-                } catch (error) {
-                    alert('Error al obtener health check: ' + error.message);
-                }
-            }
-            
-            async function refreshSystemInfo() {
-                try {
-                    const response = await fetch('/api/system/info');
-                    const data = await response.json();
-                    alert(`Sistema Info actualizada:\\n\\nSistema: ${data.system}\\nVersión: ${data.version}\\nStatus: ${data.status}\\n\\nComponentes activos: ${Object.keys(data.components).length}`);
-                } catch (error) {
-                    alert('Error al obtener info del sistema: ' + error.message);
-                }
-            }
-            
-            function viewLogs() {
-                window.open('/admin/api/logs', '_blank');
-            }
-            
-            async function systemStats() {
-                try {
-                    const response = await fetch('/admin/api/stats');
-                    const data = await response.json();
-                    alert(`Estadísticas del Sistema:\\n\\nCPU: ${data.cpu}%\\nMemoria: ${data.memory}%\\nUptime: ${data.uptime}`);
-                } catch (error) {
-                    alert('Estadísticas no disponibles en modo demo');
-                }
-            }
-            
-            // Control del servidor
-            async function connectServer() {
-                try {
-                    const response = await fetch('/admin/api/server/connect', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' }
-                    });
-                    const data = await response.json();
-                    updateServerStatus(data);
-                    showServerResponse(data.message, 'success');
-                } catch (error) {
-                    showServerResponse('Error al conectar servidor: ' + error.message, 'error');
-                }
-            }
-            
-            async function disconnectServer() {
-                if (confirm('¿Estás seguro de que quieres desconectar el servidor? Esto activará el modo mantenimiento.')) {
-                    try {
-                        const response = await fetch('/admin/api/server/disconnect', {
-                            method: 'POST',
-                            headers: { 'Content-Type': 'application/json' }
-                        });
-                        const data = await response.json();
-                        updateServerStatus(data);
-                        showServerResponse(data.message, 'warning');
-                    } catch (error) {
-                        showServerResponse('Error al desconectar servidor: ' + error.message, 'error');
-                    }
-                }
-            }
-            
-            async function checkServerStatus() {
-                try {
-                    const response = await fetch('/admin/api/server/status');
-                    const data = await response.json();
-                    updateServerStatus(data);
-                    showServerResponse(`Estado: ${data.server_state.mode} | Uptime: ${data.uptime}`, 'info');
-                } catch (error) {
-                    showServerResponse('Error al obtener estado: ' + error.message, 'error');
-                }
-            }
-            
-            function updateServerStatus(data) {
-                const statusElement = document.getElementById('server-status');
-                const statusText = document.getElementById('server-status-text');
-                const modeText = document.getElementById('server-mode');
-                const connectBtn = document.getElementById('connect-btn');
-                const disconnectBtn = document.getElementById('disconnect-btn');
-                
-                if (data.server_state && data.server_state.active) {
-                    statusElement.className = 'status-indicator online';
-                    statusText.textContent = 'Online';
-                    modeText.textContent = 'Modo: ' + (data.server_state.mode === 'online' ? 'Operativo' : 'Mantenimiento');
-                    connectBtn.style.display = data.server_state.mode === 'maintenance' ? 'inline-flex' : 'none';
-                    disconnectBtn.style.display = data.server_state.mode === 'online' ? 'inline-flex' : 'none';
-                } else {
-                    statusElement.className = 'status-indicator';
-                    statusElement.style.color = '#ef4444';
-                    statusText.textContent = 'Desconectado';
-                    modeText.textContent = 'Modo: Mantenimiento';
-                    connectBtn.style.display = 'inline-flex';
-                    disconnectBtn.style.display = 'none';
-                }
-            }
-            
-            function showServerResponse(message, type = 'info') {
-                const responseDiv = document.getElementById('server-response');
-                const messageSpan = document.getElementById('server-message');
-                
-                messageSpan.textContent = message;
-                responseDiv.style.display = 'block';
-                
-                // Colores según el tipo
-                const colors = {
-                    success: '#10b981',
-                    error: '#ef4444', 
-                    warning: '#f59e0b',
-                    info: '#3b82f6'
-                };
-                responseDiv.style.borderLeft = `4px solid ${colors[type] || colors.info}`;
-                
-                // Auto-ocultar después de 5 segundos
-                setTimeout(() => {
-                    responseDiv.style.display = 'none';
-                }, 5000);
-            }
-            
-            // Verificar estado inicial del servidor
-            window.addEventListener('load', checkServerStatus);
-            
-            // Auto-refresh cada 30 segundos
-            setInterval(() => {
-                console.log('🔄 Auto-refresh admin dashboard');
-                checkServerStatus(); // También verificar estado del servidor
-            }, 30000);
-        </script>
-    </body>
-    </html>
-    """)
+    online = server_status["active"] and server_status["mode"] == "online"
+    return admin_templates.response(
+        "admin/dashboard.html",
+        request,
+        server_status_class="online" if server_status["active"] else "",
+        server_status_text="Online" if server_status["active"] else "Desconectado",
+        server_mode="Operativo" if online else "Mantenimiento"
+    )
 
 @app.get("/admin/api/stats")
 async def admin_stats(admin: str = Depends(verify_admin_credentials)):
@@ -776,107 +362,100 @@ async def admin_stats(admin: str = Depends(verify_admin_credentials)):
             }
         }
 
+# Índice incremental de los logs rotativos del backend (mismo LOG_FILE)
+log_store = LogStore(os.getenv("LOG_FILE", DEFAULT_LOG_FILE), os.getenv("LOG_INDEX_DB") or None)
+log_follower = LogFollower(log_store.log_file)
+
 @app.get("/admin/api/logs")
-async def admin_logs(admin: str = Depends(verify_admin_credentials)):
-    """📋 Logs del sistema para administradores"""
+async def admin_logs(
+    level: Optional[str] = None,
+    logger: Optional[str] = None,
+    request_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    q: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[int] = None,
+    admin: str = Depends(verify_admin_credentials)
+):
+    """📋 Logs del sistema filtrados y paginados (cursor = next_cursor anterior)"""
+    try:
+        result = await asyncio.to_thread(
+            log_store.query, level=level, logger=logger, request_id=request_id,
+            since=since, until=until, search=q, limit=limit, before_id=cursor
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error consultando logs: {e}")
     return {
         "status": "success",
         "timestamp": datetime.now().isoformat(),
-        "logs": [
-            {
-                "level": "INFO",
-                "timestamp": datetime.now().isoformat(),
-                "message": "🚀 Sistema DataCrypt Labs v3.0 iniciado"
-            },
-            {
-                "level": "INFO", 
-                "timestamp": datetime.now().isoformat(),
-                "message": "✅ DataCryptUnifiedManager cargado exitosamente"
-            },
-            {
-                "level": "INFO",
-                "timestamp": datetime.now().isoformat(), 
-                "message": "🎨 CSS Modular system implementado"
-            },
-            {
-                "level": "INFO",
-                "timestamp": datetime.now().isoformat(),
-                "message": "🧹 4,400+ líneas de código duplicado eliminadas"
-            },
-            {
-                "level": "SUCCESS",
-                "timestamp": datetime.now().isoformat(),
-                "message": "🎉 Transformación completa implementada exitosamente"
-            }
-        ]
+        "logs": result["records"],
+        "next_cursor": result["next_cursor"]
+    }
+
+@app.get("/admin/api/logs/tail")
+async def admin_logs_tail(lines: int = 100, admin: str = Depends(verify_admin_credentials)):
+    """📜 Últimos registros por reverse-seek del fichero activo"""
+    records = await asyncio.to_thread(log_store.tail, max(1, min(lines, 1000)))
+    return {"status": "success", "timestamp": datetime.now().isoformat(), "logs": records}
+
+@app.get("/admin/api/logs/follow")
+async def admin_logs_follow(
+    level: Optional[str] = None,
+    logger: Optional[str] = None,
+    request_id: Optional[str] = None,
+    backlog: int = 20,
+    admin: str = Depends(verify_admin_credentials)
+):
+    """📡 tail -f de los logs por SSE con filtros aplicados en el servidor"""
+    recent = await asyncio.to_thread(log_store.tail, max(0, min(backlog, 500))) if backlog > 0 else []
+    return StreamingResponse(
+        log_follower.stream(LogFilter(level, logger, request_id), recent),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@app.get("/admin/api/logs/stats")
+async def admin_logs_stats(admin: str = Depends(verify_admin_credentials)):
+    """📊 Tamaño del índice de logs por nivel"""
+    await asyncio.to_thread(log_store.sync)
+    return {
+        "status": "success",
+        "timestamp": datetime.now().isoformat(),
+        **log_store.stats(),
+        "follow": log_follower.stats()
     }
 
+@app.get("/admin/api/profile")
+async def admin_profile(
+    seconds: float = 10,
+    interval_ms: float = 10,
+    format: str = "collapsed",
+    idle: bool = False,
+    admin: str = Depends(verify_admin_credentials)
+):
+    """🔥 Muestreo de pilas durante N segundos (collapsed stacks o speedscope)"""
+    if format not in PROFILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(PROFILE_FORMATS)}")
+    if stack_sampler.running:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    try:
+        profile = await asyncio.to_thread(
+            stack_sampler.sample, seconds, interval_ms / 1000, idle, threading.get_ident()
+        )
+    except SamplerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return profile_response(profile, format)
+
+@app.get("/admin/api/profile/status")
+async def admin_profile_status(admin: str = Depends(verify_admin_credentials)):
+    """🔥 Estado del muestreador (sesión en curso y última ejecución)"""
+    return {"status": "success", "timestamp": datetime.now().isoformat(), **stack_sampler.stats()}
+
 @app.get("/admin/login", response_class=HTMLResponse)
-async def admin_login():
+async def admin_login(request: Request):
     """🔐 Página de login para admin"""
-    return HTMLResponse(content="""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>DataCrypt Labs - Admin Login</title>
-        <style>
-            body { 
-                font-family: Arial, sans-serif; 
-                background: #0f172a; 
-                color: white; 
-                display: flex; 
-                justify-content: center; 
-                align-items: center; 
-                height: 100vh; 
-                margin: 0;
-            }
-            .login-box { 
-                background: #1e293b; 
-                padding: 2rem; 
-                border-radius: 8px; 
-                text-align: center;
-                border: 1px solid #3b82f6;
-            }
-            h2 { color: #3b82f6; margin-bottom: 1rem; }
-            .credentials { 
-                background: #334155; 
-                padding: 1rem; 
-                border-radius: 4px; 
-                margin: 1rem 0;
-                border-left: 4px solid #3b82f6;
-            }
-            a { 
-                background: #3b82f6; 
-                color: white; 
-                padding: 0.75rem 1.5rem; 
-                text-decoration: none; 
-                border-radius: 4px;
-                display: inline-block;
-                margin-top: 1rem;
-            }
-            a:hover { background: #2563eb; }
-        </style>
-    </head>
-    <body>
-        <div class="login-box">
-            <h2>🎛️ DataCrypt Labs Admin</h2>
-            <p>Panel de Administración Seguro</p>
-            
-            <div class="credentials">
-                <strong>Credenciales de Prueba:</strong><br>
-                Usuario: <code>admin</code><br>
-                Password: <code>datacrypt2025</code>
-            </div>
-            
-            <a href="/admin/dashboard">🚀 Acceder al Dashboard</a>
-            
-            <p style="margin-top: 1rem; font-size: 0.9rem; color: #64748b;">
-                Sistema de administración para DataCrypt Labs v3.0
-            </p>
-        </div>
-    </body>
-    </html>
-    """)
+    return admin_templates.response("admin/login.html", request)
 
 if __name__ == "__main__":
     import os
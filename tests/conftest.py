@@ -0,0 +1,19 @@
+"""
+🧪 DATACRYPT LABS - TEST CONFIG
+Configuración común de los tests del backend modular
+Filosofía Mejora Continua: Cada ejecución con su propia base de datos
+
+- DATABASE_URL apunta a un directorio temporal antes de importar backend:
+  los servicios son singletons y abren la ruta al crearse.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+_db_dir = tempfile.mkdtemp(prefix="datacrypt-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
@@ -0,0 +1,85 @@
+"""
+🧪 Tests de la búsqueda de contacto: consultas FTS5 seguras y cursores keyset
+"""
+
+import asyncio
+
+import pytest
+
+from backend.models import ContactMessage
+from backend.services import get_contact_service
+from backend.services.contact_search import MAX_TERMS, build_match_query, decode_cursor, encode_cursor
+
+# ===== CURSORES =====
+
+@pytest.mark.parametrize("score", [-12.5, -1.2345678901234567e-06, -0.0, 0.1 + 0.2, -3.4028234663852886e38])
+def test_relevance_cursor_round_trip_is_exact(score):
+    assert decode_cursor("relevance", encode_cursor("relevance", score, 42)) == (score, 42)
+
+def test_recent_cursor_round_trip():
+    cursor = encode_cursor("recent", -7.5, 42)
+    assert cursor == "42"
+    assert decode_cursor("recent", cursor) == (None, 42)
+
+@pytest.mark.parametrize("order, cursor", [
+    ("relevance", "abc"), ("relevance", "1.5|"), ("relevance", "x|3"), ("recent", "1.5|3"), ("recent", "")
+])
+def test_malformed_cursor_raises_value_error(order, cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(order, cursor)
+
+# ===== CONSULTA =====
+
+def test_match_query_quotes_every_term():
+    assert build_match_query('juan "OR" NEAR(') == '"juan" AND """OR""" AND "NEAR("'
+    assert build_match_query("bob@example.com", field="email") == 'email : "bob@example.com"'
+
+def test_match_query_prefix():
+    assert build_match_query("jua* perez") == '"jua"* AND "perez"'
+    assert build_match_query("juan per", prefix=True) == '"juan" AND "per"*'
+
+def test_match_query_without_terms():
+    assert build_match_query("  *  -- ") is None
+    assert build_match_query(" ".join(f"t{i}" for i in range(MAX_TERMS + 5))).count(" AND ") == MAX_TERMS - 1
+
+# ===== PAGINACIÓN =====
+
+TERM = "zorblaxquux"
+
+@pytest.fixture(scope="module")
+def contact_service():
+    service = get_contact_service()
+    messages = [
+        f"{TERM} {TERM} {TERM} interesado en un proyecto",
+        f"{TERM} necesito ayuda con un proyecto de datos",
+        f"Mensaje largo sobre analítica, modelos y {TERM} con bastante texto alrededor del término",
+    ]
+    # Mensajes idénticos desde emails distintos: mismo bm25, el empate lo decide el id
+    for i in range(7):
+        message = messages[i % len(messages)]
+        asyncio.run(service.save_message(ContactMessage(
+            name=f"Search Test {i}", email=f"search{i}@example.com", message=message
+        )))
+    return service
+
+def pages(service, order, limit):
+    results, cursor = [], None
+    while True:
+        page = asyncio.run(service.search(TERM, order=order, limit=limit, cursor=cursor))
+        results.extend(row["id"] for row in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return results
+
+@pytest.mark.parametrize("order", ["relevance", "recent"])
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_cursor_pages_match_single_query(contact_service, order, limit):
+    full = asyncio.run(contact_service.search(TERM, order=order, limit=100))["results"]
+    assert len(full) == 7
+    assert pages(contact_service, order, limit) == [row["id"] for row in full]
+
+def test_relevance_order_is_score_then_id(contact_service):
+    rows = asyncio.run(contact_service.search(TERM, limit=100))["results"]
+    keys = [(row["score"], row["id"]) for row in rows]
+    assert keys == sorted(keys)
+    assert len({row["score"] for row in rows}) < len(rows)  # Hay empates que cruzar entre páginas
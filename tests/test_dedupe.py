@@ -0,0 +1,114 @@
+"""
+🧪 Tests de la deduplicación de contacto: huellas en memoria y reclamo en SQLite
+"""
+
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models import ContactMessage
+from backend.services import ContactService
+from backend.services.dedupe import (
+    CLAIM_FINGERPRINT, FINGERPRINT_SCHEMA, PRUNE_FINGERPRINTS,
+    DuplicateMessageError, RecentFingerprints, fingerprint
+)
+
+WINDOW = 60.0
+
+# ===== HUELLAS =====
+
+def test_fingerprint_normalizes_case_and_whitespace():
+    key = fingerprint("Bob@Example.com ", "Hola,   quiero\n información")
+    assert key == fingerprint("bob@example.com", "hola, quiero información")
+    assert len(key) == 16
+    assert key != fingerprint("bob@example.com", "hola, quiero otra información")
+    assert key != fingerprint("alice@example.com", "hola, quiero información")
+
+# ===== MEMORIA =====
+
+@pytest.fixture
+def recent():
+    return RecentFingerprints(window=WINDOW, max_entries=1000)
+
+def test_remembered_for_at_least_one_window(recent):
+    start = recent._rotated_at
+    recent.remember(b"a", start + 1)
+    assert recent.check(b"a", start + 1)
+    assert recent.check(b"a", start + WINDOW + 1)  # Una rotación: pasa a la generación anterior
+    assert not recent.check(b"a", start + 2 * WINDOW + 2)  # Dos rotaciones: olvidada
+    assert not recent.check(b"b", start + 2 * WINDOW + 2)
+
+def test_long_idle_forgets_both_generations(recent):
+    start = recent._rotated_at
+    recent.remember(b"a", start)
+    assert not recent.check(b"a", start + 3 * WINDOW)
+    assert recent.stats()["entries"] == 0
+
+def test_rotates_when_full():
+    recent = RecentFingerprints(window=WINDOW, max_entries=2)
+    now = recent._rotated_at
+    for value in (b"a", b"b", b"c"):
+        recent.remember(value, now)
+    assert all(recent.check(value, now) for value in (b"a", b"b", b"c"))
+    for value in (b"d", b"e"):
+        recent.remember(value, now)
+    assert not recent.check(b"a", now)  # Memoria acotada a dos generaciones
+    assert recent.check(b"e", now)
+    assert recent.stats()["entries"] <= 2 * recent.max_entries
+
+# ===== SQLITE =====
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(FINGERPRINT_SCHEMA)
+    yield conn
+    conn.close()
+
+def claim(conn, key, now):
+    cutoff = now - timedelta(seconds=WINDOW)
+    return conn.execute(CLAIM_FINGERPRINT, (key, now.isoformat(), cutoff.isoformat())).rowcount
+
+def test_claim_once_per_window(conn):
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    assert claim(conn, b"k", start) == 1
+    assert claim(conn, b"k", start + timedelta(seconds=WINDOW - 1)) == 0
+    assert claim(conn, b"other", start) == 1
+    # Un duplicado rechazado no alarga la ventana
+    assert conn.execute("SELECT last_seen FROM contact_fingerprints WHERE fingerprint = ?", (b"k",)).fetchone() == (
+        start.isoformat(),
+    )
+    later = start + timedelta(seconds=WINDOW + 1)
+    assert claim(conn, b"k", later) == 1
+
+def test_prune_keeps_fingerprints_inside_window(conn):
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    claim(conn, b"old", start)
+    claim(conn, b"new", start + timedelta(seconds=WINDOW))
+    cutoff = start + timedelta(seconds=WINDOW / 2)
+    conn.execute(PRUNE_FINGERPRINTS, (cutoff.isoformat(),))
+    assert [row[0] for row in conn.execute("SELECT fingerprint FROM contact_fingerprints")] == [b"new"]
+
+# ===== SERVICIO =====
+
+def test_duplicate_rejected_across_workers():
+    """Otro worker (memoria vacía) rechaza el duplicado gracias a la tabla de huellas"""
+    email = "dedupe-test@example.com"
+
+    def message(text):
+        return ContactMessage(name="Dedupe Test", email=email, message=text)
+
+    first, second = ContactService(), ContactService()
+    assert asyncio.run(first.save_message(message("Hola, me interesa un proyecto")))
+    assert first.is_recent_duplicate(email, "hola,  me interesa un proyecto")
+    assert not second.is_recent_duplicate(email, "hola, me interesa un proyecto")
+    with pytest.raises(DuplicateMessageError):
+        asyncio.run(second.save_message(message("HOLA, me interesa  un proyecto")))
+
+    with sqlite3.connect(first.db.db_path) as db:
+        assert db.execute("SELECT COUNT(*) FROM contact_messages WHERE email = ?", (email,)).fetchone() == (1,)
+        assert db.execute(
+            "SELECT COUNT(*) FROM notification_outbox WHERE payload LIKE ?", (f"%{email}%",)
+        ).fetchone() == (1,)
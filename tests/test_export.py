@@ -0,0 +1,53 @@
+"""
+🧪 Tests del export por streaming: escape de fórmulas en CSV y paginación keyset
+"""
+
+import asyncio
+import csv
+import io
+import json
+import sqlite3
+
+import pytest
+
+from backend.services.export import export_rows
+
+ROWS = [
+    ("default", "=HYPERLINK(\"http://evil\")", 10, 1, "2026-01-01T00:00:00"),
+    ("default", "+cmd", 20, 1, "2026-01-01T00:00:01"),
+    ("default", "-1+1", 30, 1, "2026-01-01T00:00:02"),
+    ("default", "@SUM(A1)", 40, 1, "2026-01-01T00:00:03"),
+    ("default", "\tpadded", 50, 1, "2026-01-01T00:00:04"),
+    ("default", "alice", -5, 1, "2026-01-01T00:00:05"),
+]
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "export.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE game_scores (id INTEGER PRIMARY KEY, game_id TEXT, player_name TEXT,"
+            " score INTEGER, level INTEGER, timestamp TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO game_scores (game_id, player_name, score, level, timestamp) VALUES (?, ?, ?, ?, ?)", ROWS
+        )
+    return str(path)
+
+def collect(db_path, fmt, batch_size=2):
+    async def run():
+        return b"".join([chunk async for chunk in export_rows(db_path, "game_scores", fmt, batch_size=batch_size)])
+    return asyncio.run(run()).decode("utf-8")
+
+def test_csv_escapes_formula_cells(db_path):
+    rows = list(csv.reader(io.StringIO(collect(db_path, "csv"))))
+    assert rows[0] == ["id", "game_id", "player_name", "score", "level", "timestamp"]
+    assert [row[2] for row in rows[1:]] == [
+        "'=HYPERLINK(\"http://evil\")", "'+cmd", "'-1+1", "'@SUM(A1)", "'\tpadded", "alice"
+    ]
+    assert rows[-1][3] == "-5"  # Los números negativos no son texto: sin prefijo
+
+def test_ndjson_keeps_raw_values(db_path):
+    rows = [json.loads(line) for line in collect(db_path, "ndjson").splitlines()]
+    assert [row["player_name"] for row in rows] == [row[1] for row in ROWS]
+    assert [row["id"] for row in rows] == list(range(1, len(ROWS) + 1))
@@ -0,0 +1,38 @@
+"""
+🧪 Tests de la ruta de historial de un jugador: límites de página y cursor
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+PLAYER = "history-test"
+URL = f"/api/v1/games/player/{PLAYER}/scores"
+
+@pytest.fixture(scope="module")
+def client():
+    client = TestClient(app)
+    for score in (10, 20, 30, 40, 50):
+        response = client.post("/api/v1/games/score", json={"player_name": PLAYER, "score": score, "level": 1})
+        assert response.status_code == 200
+    return client
+
+@pytest.mark.parametrize("limit", [0, -1, 101])
+def test_limit_out_of_range_is_rejected(client, limit):
+    assert client.get(URL, params={"limit": limit}).status_code == 422
+
+def test_pages_cover_the_whole_history(client):
+    scores, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(URL, params=params)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert len(data["scores"]) <= 2
+        scores.extend(score["score"] for score in data["scores"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert scores == [50, 40, 30, 20, 10]  # Más reciente primero
+    assert data["stats"]["total_games"] == 5
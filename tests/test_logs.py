@@ -0,0 +1,39 @@
+"""
+🧪 Tests del indexador de logs: líneas más largas que un bloque de lectura
+"""
+
+from backend.web import logs
+from backend.web.logs import LogStore
+
+def line(n, message):
+    return f"2026-01-01 00:00:{n:02d} - datacrypt.test - INFO - {message}\n"
+
+def messages(store):
+    return [record["message"] for record in reversed(store.query(limit=500)["records"])]
+
+def test_oversized_line_is_truncated_and_sync_continues(tmp_path, monkeypatch):
+    monkeypatch.setattr(logs, "READ_CHUNK", 64)
+    log_file = tmp_path / "app.log"
+    log_file.write_text(line(0, "first") + line(1, "x" * 500) + line(2, "after"))
+    store = LogStore(log_file, tmp_path / "index.db")
+
+    assert store.sync() == 3
+    first, oversized, after = messages(store)
+    assert (first, after) == ("first", "after")
+    assert oversized.startswith("xxx") and oversized.endswith("[truncated]")
+    assert len(oversized) < 64
+
+    with open(log_file, "a") as file:
+        file.write(line(3, "later"))
+    assert store.sync() == 1
+    assert messages(store)[-1] == "later"
+
+def test_oversized_line_at_end_of_file_does_not_stall(tmp_path, monkeypatch):
+    monkeypatch.setattr(logs, "READ_CHUNK", 64)
+    log_file = tmp_path / "app.log"
+    log_file.write_text(line(0, "y" * 200) + line(1, "next"))
+    store = LogStore(log_file, tmp_path / "index.db")
+
+    assert store.sync() == 2
+    assert messages(store)[-1] == "next"
+    assert store.sync() == 0
@@ -0,0 +1,175 @@
+"""
+🧪 Tests de OutboxDispatcher.dispatch_once contra un webhook y un SMTP locales
+"""
+
+import asyncio
+import json
+import socketserver
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from backend.core.notifications import OutboxDispatcher
+from backend.services import get_contact_service
+from backend.services.outbox import ENQUEUE_NOTIFICATION, contact_notification
+
+# ===== STUBS =====
+
+class WebhookStub:
+    """Webhook HTTP que falla las primeras `failures` peticiones"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if stub.failures:
+                    stub.failures -= 1
+                    self.send_response(503)
+                else:
+                    stub.batches.append([item["id"] for item in body["notifications"]])
+                    self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+class SmtpStub:
+    """Servidor SMTP mínimo: rechaza con 451 los correos cuyo Reply-To esté en `reject` (una vez)"""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.sessions = []
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                accepted = []
+                stub.sessions.append(accepted)
+                self.reply("220 stub")
+                data = None
+                while True:
+                    line = self.rfile.readline().decode()
+                    if not line:
+                        return
+                    if data is not None:
+                        if line.rstrip("\r\n") != ".":
+                            data.append(line)
+                            continue
+                        reply_to = next(l.split(":", 1)[1].strip() for l in data if l.startswith("Reply-To:"))
+                        if reply_to in stub.reject:
+                            stub.reject.discard(reply_to)
+                            self.reply("451 try later")
+                        else:
+                            accepted.append(reply_to)
+                            self.reply("250 ok")
+                        data = None
+                    elif line.upper().startswith("DATA"):
+                        data = []
+                        self.reply("354 go ahead")
+                    elif line.upper().startswith("QUIT"):
+                        self.reply("221 bye")
+                        return
+                    else:
+                        self.reply("250 ok")
+
+            def reply(self, text):
+                self.wfile.write(f"{text}\r\n".encode())
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+# ===== FIXTURES =====
+
+@pytest.fixture
+def outbox():
+    """Outbox vacío; devuelve una función que encola n notificaciones y sus ids"""
+    db_path = get_contact_service().db.db_path
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM notification_outbox")
+
+    def enqueue(n):
+        with sqlite3.connect(db_path) as conn:
+            return [
+                conn.execute(ENQUEUE_NOTIFICATION, contact_notification(
+                    i, f"User {i}", f"user{i}@example.com", f"hola {i}", "2026-01-01T00:00:00"
+                )).lastrowid
+                for i in range(n)
+            ]
+
+    def rows():
+        with sqlite3.connect(db_path) as conn:
+            return {
+                row[0]: {"status": row[1], "attempts": row[2], "last_error": row[3]}
+                for row in conn.execute("SELECT id, status, attempts, last_error FROM notification_outbox")
+            }
+
+    enqueue.rows = rows
+    return enqueue
+
+# ===== TESTS =====
+
+def test_webhook_retry_then_delivered(outbox):
+    webhook = WebhookStub(failures=1)
+    ids = outbox(3)
+    dispatcher = OutboxDispatcher(webhook_url=webhook.url, max_retries=3, retry_delay=0.01)
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 3
+    assert webhook.batches == [ids]  # El 503 se reintentó con el lote completo
+    rows = outbox.rows()
+    assert {row["status"] for row in rows.values()} == {"delivered"}
+    assert {row["attempts"] for row in rows.values()} == {1}
+    assert asyncio.run(dispatcher.dispatch_once()) == 0
+
+def test_partial_smtp_failure_resends_only_undelivered(outbox):
+    smtp = SmtpStub(reject={"user1@example.com"})
+    ids = outbox(3)
+    dispatcher = OutboxDispatcher(
+        smtp_host="127.0.0.1", smtp_port=smtp.port, mail_from="noreply@example.com",
+        mail_to="team@example.com", max_retries=3, retry_delay=0.01
+    )
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 3
+    # Primera sesión: user0 sale, user1 falla y se corta; el reintento no repite user0
+    assert smtp.sessions == [
+        ["user0@example.com"],
+        ["user1@example.com", "user2@example.com"]
+    ]
+    rows = outbox.rows()
+    assert [rows[row_id]["status"] for row_id in ids] == ["delivered"] * 3
+
+def test_failed_after_max_attempts(outbox):
+    webhook = WebhookStub(failures=100)
+    (row_id,) = outbox(1)
+    # retry_delay=0: la fila vuelve a estar vencida en cuanto se difiere
+    dispatcher = OutboxDispatcher(webhook_url=webhook.url, max_retries=2, retry_delay=0.0, max_attempts=2)
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 1
+    row = outbox.rows()[row_id]
+    assert (row["status"], row["attempts"]) == ("pending", 1)
+    assert "503" in row["last_error"]
+
+    assert asyncio.run(dispatcher.dispatch_once()) == 1
+    row = outbox.rows()[row_id]
+    assert (row["status"], row["attempts"]) == ("failed", 2)
+    assert webhook.batches == []
+    assert asyncio.run(dispatcher.dispatch_once()) == 0  # 'failed' no se vuelve a reclamar
+
+def test_lease_covers_worst_case_batch():
+    dispatcher = OutboxDispatcher(
+        webhook_url="http://127.0.0.1:9/hook", smtp_host="127.0.0.1", mail_to="team@example.com",
+        max_retries=3, retry_delay=1.0, lease=60.0
+    )
+    assert dispatcher.lease > dispatcher.max_batch_seconds > 60.0
+    assert OutboxDispatcher(lease=60.0).lease == 60.0  # Sin canales no hay nada que acotar
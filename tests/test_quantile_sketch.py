@@ -0,0 +1,81 @@
+"""
+🧪 Tests de QuantileSketch: error relativo acotado, fusión y persistencia por cubos
+"""
+
+import math
+import random
+
+import pytest
+
+from backend.services.game_stats import PERCENTILES, QuantileSketch
+
+QUANTILES = (0.0, 0.01, *PERCENTILES, 1.0)
+
+def exact(values, q):
+    """Mismo rango que el sketch: el valor en la posición floor(q * (n - 1))"""
+    ordered = sorted(values)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+def datasets():
+    rng = random.Random(41)
+    return {
+        "uniform_ints": [rng.randint(1, 100_000) for _ in range(20_000)],
+        "lognormal": [rng.lognormvariate(5, 2) for _ in range(20_000)],
+        "pareto": [rng.paretovariate(1.2) for _ in range(20_000)],
+        "few_distinct": [rng.choice((3, 50, 50, 1200)) for _ in range(5_000)],
+    }
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+@pytest.mark.parametrize("name", list(datasets()))
+def test_relative_error_within_accuracy(name, accuracy):
+    values = datasets()[name]
+    sketch = QuantileSketch(accuracy)
+    for value in values:
+        sketch.add(value)
+    assert sketch.count == len(values)
+    for q in QUANTILES:
+        expected = exact(values, q)
+        assert abs(sketch.quantile(q) - expected) <= accuracy * expected * (1 + 1e-9), (name, q)
+
+def test_bucket_count_is_logarithmic():
+    sketch = QuantileSketch(0.01)
+    for value in range(1, 1_000_001):
+        sketch.add(value)
+    # log_gamma(max / min) + 1 cubos, no un cubo por valor
+    assert len(sketch.buckets) <= math.ceil(math.log(1_000_000) / math.log(sketch.gamma)) + 1
+
+def test_zeros_and_empty():
+    assert QuantileSketch().quantile(0.5) is None
+    sketch = QuantileSketch()
+    for value in (0, 0, 0, 10, 20):
+        sketch.add(value)
+    assert sketch.zeros == 3
+    assert sketch.quantile(0.5) == 0.0
+    assert abs(sketch.quantile(1.0) - 20) <= 0.01 * 20
+
+def test_merge_equals_single_sketch():
+    values = datasets()["lognormal"]
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+    left.merge(right)
+    assert (left.count, left.buckets) == (whole.count, whole.buckets)
+    assert [left.quantile(q) for q in QUANTILES] == [whole.quantile(q) for q in QUANTILES]
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+def test_from_buckets_round_trip():
+    """Cubos persistidos con key() (como contact_lengths) reconstruyen el mismo sketch"""
+    values = datasets()["few_distinct"] + [0] * 10
+    sketch = QuantileSketch()
+    stored = {}
+    for value in values:
+        sketch.add(value)
+        if value > 0:
+            stored[sketch.key(value)] = stored.get(sketch.key(value), 0) + 1
+    restored = QuantileSketch.from_buckets(stored, zeros=10)
+    assert restored.count == len(values)
+    assert [restored.quantile(q) for q in QUANTILES] == [sketch.quantile(q) for q in QUANTILES]
@@ -0,0 +1,87 @@
+"""
+🧪 Tests de iter_rows: NDJSON y array JSON troceados en bloques arbitrarios
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.services.score_ingest import MAX_ROW_CHARS, IngestError, iter_rows
+
+SCORES = [
+    {"player_name": "Ana", "score": 1200, "level": 3},
+    {"player_name": "Zoë 🐍", "score": 7, "level": 1},
+    {"player_name": "bob", "score": 123456789, "level": 12},
+]
+
+def split(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+def collect(chunks):
+    """(filas, error fatal o None) de leer los bloques dados"""
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        rows = []
+        try:
+            async for row in iter_rows(source()):
+                rows.append(row)
+        except IngestError as e:
+            return rows, str(e)
+        return rows, None
+
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_ndjson_any_chunking(size):
+    body = ("\n".join(json.dumps(score, ensure_ascii=False) for score in SCORES) + "\n").encode("utf-8")
+    rows, error = collect(split(body, size))  # size=1 parte también los caracteres multibyte
+    assert error is None
+    assert rows == [(i, score, None) for i, score in enumerate(SCORES, 1)]
+
+def test_ndjson_blank_lines_bad_rows_and_no_final_newline():
+    body = b'\n{"score": 1}\r\n\nnot json\n  \n{"score": 2}'
+    rows, error = collect([body])
+    assert error is None
+    assert [(row, value) for row, value, _ in rows] == [(1, {"score": 1}), (2, None), (3, {"score": 2})]
+    assert rows[1][2].startswith("Invalid JSON")  # El error es de la fila; se sigue leyendo
+
+@pytest.mark.parametrize("size", [1, 2, 5, 64, 10_000])
+def test_array_any_chunking(size):
+    body = (" [\n" + ",\n".join(json.dumps(score, ensure_ascii=False) for score in SCORES) + "]\n").encode("utf-8")
+    rows, error = collect(split(body, size))
+    assert error is None
+    assert rows == [(i, score, None) for i, score in enumerate(SCORES, 1)]
+
+def test_array_number_split_across_chunks():
+    rows, error = collect([b"[12", b"34, 5", b"6]"])
+    assert error is None
+    assert [value for _, value, _ in rows] == [1234, 56]
+
+@pytest.mark.parametrize("body", [b"", b"  \n", b"[]", b" [ ] "])
+def test_empty_bodies(body):
+    assert collect([body]) == ([], None)
+
+@pytest.mark.parametrize("body, message", [
+    (b'[{"score": 1}, {"score": 2}', "Unterminated JSON array after row 2"),
+    (b'[{"score": 1}] {"score": 2}', "Unexpected data after the JSON array"),
+    (b'[{"score": 1} {"score": 2}]', "Expected ',' or ']' after row 1"),
+    (b'[{"score": 1},]', "Invalid JSON at row 2"),
+])
+def test_array_fatal_errors_keep_previous_rows(body, message):
+    rows, error = collect([body])
+    assert message in error
+    assert rows[0] == (1, {"score": 1}, None)
+
+def test_invalid_utf8_is_fatal():
+    rows, error = collect([b'{"score": 1}\n', b'{"player_name": "\xff"}\n'])
+    assert rows == [(1, {"score": 1}, None)]
+    assert "not valid UTF-8" in error
+
+def test_oversized_row_is_fatal():
+    rows, error = collect([b'{"score": 1}\n', b'{"player_name": "' + b"x" * (MAX_ROW_CHARS + 1)])
+    assert rows == [(1, {"score": 1}, None)]
+    assert "exceeds" in error